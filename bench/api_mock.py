@@ -0,0 +1,140 @@
+"""
+Local stand-in for the items multiget endpoint, to test and benchmark the
+'api' fetch backend offline.
+	
+	python -m bench.api_mock --port 8765
+	python -m bench.api_mock --bench 1000
+
+Point the tracker at it with `api_base_url = http://127.0.0.1:8765`.
+Prices are derived from the item id, so they are stable across runs.
+`--down` answers 503 to everything, like a MercadoLibre maintenance.
+"""
+import argparse
+import json
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from urllib.parse import parse_qs, urlsplit
+
+
+def fake_item(item_id: str) -> dict:
+	seed = zlib.crc32(item_id.encode())
+	price = 1000 + seed % 100000
+	return {
+		'id': item_id,
+		'title': f'Producto de prueba {item_id}',
+		'price': price,
+		'original_price': price * 1.2 if seed % 4 == 0 else None,
+		'currency_id': 'ARS',
+		'status': 'paused' if seed % 23 == 0 else 'active',
+		'available_quantity': seed % 7,
+		'shipping': {'free_shipping': seed % 3 == 0}
+	}
+
+
+class ItemsHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+	
+	# Se configuran desde la línea de comandos
+	latency = 0.0
+	missing_every = 10
+	down = False
+	
+	# Pedidos recibidos, con o sin error; --bench informa cuántos hizo ItemsClient
+	requests = 0
+	lock = Lock()
+	
+	def do_GET(self):
+		with self.lock:
+			ItemsHandler.requests += 1
+		
+		if self.down:
+			self.reply(503, {'message': 'service unavailable'})
+			return
+		
+		parts = urlsplit(self.path)
+		if parts.path != '/items':
+			self.reply(404, {'message': 'not_found'})
+			return
+		
+		ids = [item_id for item_id in parse_qs(parts.query).get('ids', [''])[0].split(',') if item_id]
+		if len(ids) > 20:
+			self.reply(400, {'message': 'too many ids'})
+			return
+		
+		sleep(self.latency)
+		results = []
+		for item_id in ids:
+			# Una fracción de ids no existe, para ejercitar el respaldo por scraping
+			if self.missing_every and zlib.crc32(item_id.encode()) % self.missing_every == 0:
+				results.append({'code': 404, 'body': {'message': 'item not found'}})
+			else:
+				results.append({'code': 200, 'body': fake_item(item_id)})
+		self.reply(200, results)
+	
+	def reply(self, status: int, payload):
+		body = json.dumps(payload).encode()
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+	
+	def log_message(self, format, *args):
+		pass
+
+
+def serve(port: int = 0) -> ThreadingHTTPServer:
+	"""Start the mock on a background thread; port 0 picks a free one."""
+	server = ThreadingHTTPServer(('127.0.0.1', port), ItemsHandler)
+	Thread(target=server.serve_forever, daemon=True).start()
+	return server
+
+
+def bench(count: int):
+	from tracker.api import ItemsClient
+	from tracker.cancel import CancelToken, Deadline
+	from tracker.http import HttpClient
+	
+	server = serve()
+	client = ItemsClient(HttpClient(), f'http://127.0.0.1:{server.server_port}')
+	ids = [f'MLA{1000000000 + i}' for i in range(count)]
+	
+	ItemsHandler.requests = 0
+	started = perf_counter()
+	found = client.get_items(ids, Deadline(600, CancelToken()))
+	elapsed = perf_counter() - started
+	
+	print(
+		json.dumps(
+			{
+				'items': count,
+				'resolved': len(found),
+				'requests': ItemsHandler.requests,
+				'seconds': round(elapsed, 3),
+				'items_per_second': round(count / elapsed, 1)
+			}
+		)
+	)
+	server.shutdown()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+	parser.add_argument('--port', type=int, default=8765)
+	parser.add_argument('--latency', type=float, default=0.0, help='seconds added to each request')
+	parser.add_argument('--missing-every', type=int, default=10, help='1 in N ids is not found; 0 disables')
+	parser.add_argument('--down', action='store_true', help='answer 503 to every request')
+	parser.add_argument('--bench', type=int, metavar='N', help='time N ids through ItemsClient and exit')
+	args = parser.parse_args()
+	
+	ItemsHandler.latency = args.latency
+	ItemsHandler.missing_every = args.missing_every
+	ItemsHandler.down = args.down
+	
+	if args.bench:
+		bench(args.bench)
+	else:
+		print(f'Mock del API de ítems en http://127.0.0.1:{args.port}')
+		ThreadingHTTPServer(('127.0.0.1', args.port), ItemsHandler).serve_forever()
\ No newline at end of file
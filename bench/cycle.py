@@ -0,0 +1,283 @@
+"""
+Full tracking cycles of TrackerWorker against the local fixture pages, to
+tell whether a change to the runnables or the worker makes cycles faster.
+	
+	python -m bench.cycle --urls 10 100 1000 --cycles 3 --output cycle.json
+	python -m bench.cycle --compare cycle.json
+
+Each size runs in a fresh process, in a temporary folder with its own
+products.db and settings.ini. The report, per size, includes:
+- cycles per minute (from the median cycle);
+- p50/p95 fetch latency;
+- the worker's peak RSS;
+- the most browser processes seen at once;
+- the time spent writing the store and the history.
+--compare prints the change against a previous --output.
+Peak RSS and browser counts come from `resource` and /proc, or from the
+optional `psutil` package elsewhere (Windows); without either they are null.
+The fixture options (latency, failure rates...) are those of bench.fixtures.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from statistics import median, quantiles
+from time import perf_counter
+from typing import Optional
+
+from bench.fixtures import add_arguments, configure_from, serve
+from tracker.config import load_settings
+from tracker.store import ProductStore, new_products
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Métricas donde más es mejor; en el resto, menos es mejor
+HIGHER_IS_BETTER = {'cycles_per_minute'}
+
+
+def browser_processes(root: int) -> Optional[int]:
+	"""Chrome and chromedriver processes descending from `root`; None when they cannot be listed."""
+	if not os.path.isdir('/proc'):
+		try:
+			import psutil
+		except ImportError:
+			return None
+		return sum('chrom' in process.name() for process in psutil.Process(root).children(recursive=True))
+	
+	children: dict[int, list[int]] = {}
+	names: dict[int, str] = {}
+	for entry in Path('/proc').glob('[0-9]*'):
+		try:
+			stat = entry.joinpath('stat').read_text()
+		except OSError:
+			continue
+		# El nombre va entre paréntesis y puede tener espacios
+		name = stat[stat.index('(') + 1:stat.rindex(')')]
+		parent = int(stat[stat.rindex(')') + 2:].split()[1])
+		names[int(entry.name)] = name
+		children.setdefault(parent, []).append(int(entry.name))
+	
+	count = 0
+	pending = list(children.get(root, []))
+	while pending:
+		pid = pending.pop()
+		count += 'chrom' in names.get(pid, '')
+		pending.extend(children.get(pid, []))
+	return count
+
+
+def peak_rss_mb() -> Optional[float]:
+	"""This process's peak resident memory; None when it cannot be read."""
+	try:
+		import resource
+	except ImportError:
+		# Windows no tiene resource; psutil informa el pico del working set
+		try:
+			import psutil
+		except ImportError:
+			return None
+		return psutil.Process().memory_info().peak_wset / 1024 / 1024
+	
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# En macOS viene en bytes, en Linux en KB
+	return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(samples: list[float], point: int) -> float:
+	if len(samples) < 2:
+		return samples[0] if samples else 0.0
+	return quantiles(samples, n=100)[point - 1]
+
+
+def child(cycles: int):
+	from PyQt6.QtCore import QCoreApplication, QTimer
+	
+	from tracker.fetchers import Fetcher
+	from tracker.scheduler import Scheduler
+	from tracker.tracker import TrackerWorker
+	
+	app = QCoreApplication(sys.argv)
+	latencies: list[float] = []
+	writes: list[float] = []
+	failures = []
+	
+	class TimedFetcher(Fetcher):
+		
+		def __init__(self, fetcher: Fetcher):
+			self.fetcher = fetcher
+			self.name = fetcher.name
+		
+		def fetch(self, url, deadline, headers=None):
+			started = perf_counter()
+			try:
+				return self.fetcher.fetch(url, deadline, headers)
+			except Exception as e:
+				failures.append(type(e).__name__)
+				raise
+			finally:
+				latencies.append((perf_counter() - started) * 1000)
+	
+	class BenchTracker(TrackerWorker):
+		
+		@property
+		def fetchers(self) -> list[Fetcher]:
+			return [TimedFetcher(fetcher) for fetcher in super().fetchers]
+	
+	def timed(function):
+		def wrapper(*args, **kwargs):
+			started = perf_counter()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				writes.append((perf_counter() - started) * 1000)
+		return wrapper
+	
+	tracker = BenchTracker()
+	# WriteBehind usa estos mismos objetos, así que se mide lo que escribe
+	tracker.store.upsert = timed(tracker.store.upsert)
+	tracker.history.append = timed(tracker.history.append)
+	tracker.apply_loaded(tracker.read_data())
+	
+	durations: list[float] = []
+	browsers: Optional[int] = 0
+	started = 0.0
+	
+	def begin():
+		nonlocal started
+		# Scheduler nuevo: todos los productos vencen en cada ciclo
+		tracker.session.scheduler = Scheduler(tracker.interval, tracker.max_backoff)
+		started = perf_counter()
+		tracker.start()
+	
+	def poll():
+		nonlocal browsers
+		seen = browser_processes(os.getpid())
+		browsers = None if seen is None else max(browsers or 0, seen)
+		if tracker.session.cycle.running:
+			return
+		
+		tracker.writer.flush()
+		durations.append(perf_counter() - started)
+		if len(durations) < cycles:
+			begin()
+		else:
+			timer.stop()
+			app.quit()
+	
+	timer = QTimer()
+	timer.timeout.connect(poll)
+	timer.start(10)
+	begin()
+	app.exec()
+	tracker.stop()
+	
+	print(json.dumps({
+		'durations': durations,
+		'latencies_ms': latencies,
+		'store_writes_ms': writes,
+		'fetch_failures': len(failures),
+		'peak_rss_mb': peak_rss_mb(),
+		'browsers': browsers
+	}))
+
+
+def run_size(urls: int, args: argparse.Namespace, base: str) -> dict:
+	directory = Path(tempfile.mkdtemp(prefix='ml-tracker-cycle-'))
+	try:
+		settings = load_settings(str(directory.joinpath('settings.ini')))
+		settings.set('GENERAL', 'max_paralell_tracking', args.threads)
+		settings.set('GENERAL', 'fetch_backend', args.backend)
+		settings.set('GENERAL', 'fetch_timeout', args.timeout)
+		
+		store = ProductStore(directory.joinpath('products.db'))
+		store.replace(new_products([f'{base}/MLA-{i}' for i in range(urls)]))
+		store.close()
+		
+		output = subprocess.run(
+			[sys.executable, '-m', 'bench.cycle', '--child', '--cycles', str(args.cycles)],
+			cwd=directory,
+			env={**os.environ, 'PYTHONPATH': str(ROOT), 'QT_QPA_PLATFORM': 'offscreen'},
+			capture_output=True,
+			text=True,
+			check=True
+		).stdout
+	finally:
+		shutil.rmtree(directory, ignore_errors=True)
+	
+	raw = json.loads(output.strip().splitlines()[-1])
+	cycle = median(raw['durations'])
+	return {
+		'urls': urls,
+		'cycle_seconds': round(cycle, 3),
+		'cycles_per_minute': round(60 / cycle, 2),
+		'fetch_p50_ms': round(percentile(raw['latencies_ms'], 50), 1),
+		'fetch_p95_ms': round(percentile(raw['latencies_ms'], 95), 1),
+		'peak_rss_mb': None if raw['peak_rss_mb'] is None else round(raw['peak_rss_mb'], 1),
+		'browsers': raw['browsers'],
+		'store_write_ms': round(sum(raw['store_writes_ms']) / len(raw['durations']), 1),
+		'fetch_failures': raw['fetch_failures']
+	}
+
+
+def compare(current: list[dict], previous: list[dict]):
+	before = {result['urls']: result for result in previous}
+	for result in current:
+		old = before.get(result['urls'])
+		if old is None:
+			continue
+		changes = {}
+		for key, value in result.items():
+			if key == 'urls' or value is None or not old.get(key):
+				continue
+			change = (value - old[key]) / old[key] * 100
+			better = change > 0 if key in HIGHER_IS_BETTER else change < 0
+			changes[key] = f'{change:+.1f}%' + (' mejor' if better else ' peor' if change else '')
+		print(json.dumps({'urls': result['urls'], **changes}, ensure_ascii=False))
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+	parser.add_argument('--urls', type=int, nargs='+', default=[10, 100, 1000])
+	parser.add_argument('--cycles', type=int, default=3)
+	parser.add_argument('--threads', type=int, default=4, help='max_paralell_tracking')
+	parser.add_argument('--backend', choices=['http', 'selenium'], default='http')
+	parser.add_argument('--timeout', type=int, default=10, help='fetch_timeout')
+	parser.add_argument('--output', type=Path, help='save the results as JSON')
+	parser.add_argument('--compare', type=Path, help='JSON of a previous --output')
+	parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+	add_arguments(parser)
+	args = parser.parse_args()
+	
+	if args.child:
+		child(args.cycles)
+		return
+	
+	configure_from(args)
+	server = serve()
+	base = f'http://127.0.0.1:{server.server_port}'
+	
+	results = []
+	try:
+		for urls in args.urls:
+			results.append(run_size(urls, args, base))
+			print(json.dumps(results[-1]))
+	finally:
+		server.shutdown()
+	
+	if args.output:
+		fixture = {
+			key: str(value) if isinstance(value, Path) else value
+			for key, value in vars(args).items()
+			if key not in {'output', 'compare', 'child'}
+		}
+		args.output.write_text(json.dumps({'options': fixture, 'results': results}, indent=2))
+	if args.compare:
+		compare(results, json.loads(args.compare.read_text())['results'])
+
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Local stand-in for MercadoLibre product pages, to benchmark tracking
+cycles offline.
+	
+	python -m bench.fixtures --port 8766 --latency 0.2 --error-rate 0.02
+
+Every path ending in an item id (`/MLA-123`) is a product. The item id
+picks one of the VARIANTS, so a product keeps its variant across runs.
+Failures are injected per request:
+- `--error-rate` answers 503;
+- `--maintenance-rate` serves the "Error!" page MercadoLibre shows during
+  maintenance;
+- `--reset-rate` drops the connection without answering.
+`--pages DIR` serves recorded pages, `DIR/<variant>.html`, instead of the
+built-in ones; tests/pages has one per variant. Pages carry an ETag and
+answer 304 to a matching If-None-Match, unless `--no-etag`.
+"""
+import argparse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from random import Random
+from threading import Lock, Thread
+from time import sleep
+from typing import Optional
+
+NORMAL = 'normal'
+OUT_OF_STOCK = 'out_of_stock'
+DISCOUNTED = 'discounted'
+FREE_SHIP = 'free_ship'
+MAINTENANCE = 'maintenance'
+
+# Variante por ítem, en proporción a su peso
+VARIANTS = [(NORMAL, 55), (OUT_OF_STOCK, 10), (DISCOUNTED, 20), (FREE_SHIP, 15)]
+
+PRICE = (
+	'<div id="price"><span class="andes-money-amount__currency-symbol">$</span>'
+	'<span class="andes-money-amount__fraction">{price}</span>{discount}</div>'
+)
+DISCOUNT = '<span class="andes-money-amount__discount">15% OFF</span>'
+SHIPPING = '<div id="shipping_summary"><p class="ui-pdp-color--GREEN">{text}</p></div>'
+OUT_OF_STOCK_MESSAGE = '<p id="item_status_short_description_message">Publicación pausada</p>'
+# Relleno con la forma del resto de la página, para que el parser tenga trabajo realista
+FILLER = '<div class="ui-pdp-container__row"><span class="ui-pdp-family--REGULAR">Característica {0}</span></div>'
+
+
+def variant_of(item: str) -> str:
+	point = zlib.crc32(item.encode()) % sum(weight for _, weight in VARIANTS)
+	for variant, weight in VARIANTS:
+		if point < weight:
+			return variant
+		point -= weight
+	return NORMAL
+
+
+def render(item: str, variant: str, price: int, page_kb: int) -> bytes:
+	if variant == MAINTENANCE:
+		return b'<html><head><title>Error! - Mercado Libre</title></head><body></body></html>'
+	
+	body = [f'<h1 class="ui-pdp-title">Producto {item}</h1>']
+	if variant == OUT_OF_STOCK:
+		body.append(OUT_OF_STOCK_MESSAGE)
+	else:
+		body.append(PRICE.format(
+			price=f'{price:,}'.replace(',', '.'),
+			discount=DISCOUNT if variant == DISCOUNTED else ''
+		))
+		body.append(SHIPPING.format(text='Envío gratis' if variant == FREE_SHIP else 'Llega el jueves'))
+	
+	filler = []
+	size = sum(map(len, body))
+	while size < page_kb * 1024:
+		filler.append(FILLER.format(len(filler)))
+		size += len(filler[-1])
+	
+	return (
+		f'<html><head><title>Producto {item} | MercadoLibre</title></head>'
+		f'<body>{"".join(body)}{"".join(filler)}</body></html>'
+	).encode()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+	
+	# Se configuran con configure()
+	latency = 0.0
+	jitter = 0.0
+	error_rate = 0.0
+	maintenance_rate = 0.0
+	reset_rate = 0.0
+	change_rate = 0.0
+	page_kb = 200
+	pages: Optional[Path] = None
+	etag = True
+	random = Random(0)
+	lock = Lock()
+	
+	def do_GET(self):
+		item = self.path.rstrip('/').rsplit('/', 1)[-1].split('?')[0]
+		with self.lock:
+			roll = self.random.random()
+			delay = self.latency + self.random.uniform(0, self.jitter)
+			changed = self.random.random() < self.change_rate
+		sleep(delay)
+		
+		if roll < self.reset_rate:
+			self.close_connection = True
+			return
+		roll -= self.reset_rate
+		
+		if roll < self.error_rate:
+			self.reply(503, b'<html><title>503</title></html>')
+			return
+		roll -= self.error_rate
+		
+		variant = MAINTENANCE if roll < self.maintenance_rate else variant_of(item)
+		price = 1000 + zlib.crc32(item.encode()) % 100000 + (1 if changed else 0)
+		if self.pages is not None:
+			body = self.pages.joinpath(f'{variant}.html').read_bytes()
+		else:
+			body = render(item, variant, price, self.page_kb)
+		
+		if not self.etag:
+			self.reply(200, body)
+			return
+		etag = f'"{zlib.crc32(body):08x}"'
+		if self.headers.get('If-None-Match') == etag:
+			self.reply(304, b'', etag)
+		else:
+			self.reply(200, body, etag)
+	
+	def reply(self, status: int, body: bytes, etag: Optional[str] = None):
+		self.send_response(status)
+		if etag is not None:
+			self.send_header('ETag', etag)
+		self.send_header('Content-Type', 'text/html; charset=utf-8')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+	
+	def log_message(self, format, *args):
+		pass
+
+
+def configure(**options):
+	"""Set FixtureHandler options by name, plus `seed` for the failure rolls."""
+	seed = options.pop('seed', 0)
+	FixtureHandler.random = Random(seed)
+	for name, value in options.items():
+		if not hasattr(FixtureHandler, name):
+			raise AttributeError(name)
+		setattr(FixtureHandler, name, value)
+
+
+def serve(port: int = 0) -> ThreadingHTTPServer:
+	"""Start the fixtures on a background thread; port 0 picks a free one."""
+	server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+	server.daemon_threads = True
+	Thread(target=server.serve_forever, daemon=True).start()
+	return server
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+	parser.add_argument('--latency', type=float, default=0.1, help='seconds added to each request')
+	parser.add_argument('--jitter', type=float, default=0.05, help='up to this many seconds more, at random')
+	parser.add_argument('--error-rate', type=float, default=0.0, help='fraction answered with 503')
+	parser.add_argument('--maintenance-rate', type=float, default=0.0, help='fraction served the Error! page')
+	parser.add_argument('--reset-rate', type=float, default=0.0, help='fraction dropped without an answer')
+	parser.add_argument('--change-rate', type=float, default=0.1, help='fraction with a different price')
+	parser.add_argument('--page-kb', type=int, default=200, help='size of the built-in pages')
+	parser.add_argument('--pages', type=Path, help='folder with recorded <variant>.html pages')
+	parser.add_argument('--no-etag', action='store_true', help='never answer 304 Not Modified')
+	parser.add_argument('--seed', type=int, default=0)
+
+
+def configure_from(args: argparse.Namespace):
+	configure(
+		latency=args.latency,
+		jitter=args.jitter,
+		error_rate=args.error_rate,
+		maintenance_rate=args.maintenance_rate,
+		reset_rate=args.reset_rate,
+		change_rate=args.change_rate,
+		page_kb=args.page_kb,
+		pages=args.pages,
+		etag=not args.no_etag,
+		seed=args.seed
+	)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+	parser.add_argument('--port', type=int, default=8766)
+	add_arguments(parser)
+	args = parser.parse_args()
+	
+	configure_from(args)
+	print(f'Páginas de prueba en http://127.0.0.1:{args.port}/MLA-1')
+	ThreadingHTTPServer(('127.0.0.1', args.port), FixtureHandler).serve_forever()
+
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
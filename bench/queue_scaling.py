@@ -0,0 +1,100 @@
+"""
+Throughput of `python -m tracker worker --once` as worker processes are
+added: every run drains the same queue of products served by a local page
+server with a fixed latency.
+	
+	python -m bench.queue_scaling --urls 600 --workers 1 2 4 --latency 0.05
+
+Each worker fetches `--threads` pages at a time, so with the latency
+dominating, throughput should grow about linearly with the worker count.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from bench.fixtures import configure, serve
+from tracker.config import load_settings
+from tracker.store import ProductStore, new_products
+from tracker.workqueue import WorkQueue
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def prepare(directory: Path, urls: list[str], threads: int):
+	settings = load_settings(str(directory.joinpath('settings.ini')))
+	settings.set('GENERAL', 'max_paralell_tracking', threads)
+	settings.set('GENERAL', 'fetch_timeout', 10)
+	
+	store = ProductStore(directory.joinpath('products.db'))
+	store.replace(new_products(urls))
+	store.close()
+
+
+def drain(directory: Path, workers: int) -> float:
+	# Cola nueva: todas las URLs vencidas otra vez
+	for name in ('queue.db', 'queue.db-wal', 'queue.db-shm'):
+		directory.joinpath(name).unlink(missing_ok=True)
+	
+	env = {**os.environ, 'PYTHONPATH': str(ROOT)}
+	started = perf_counter()
+	processes = [
+		subprocess.Popen(
+			[sys.executable, '-m', 'tracker', 'worker', '--once', '--dir', str(directory)],
+			env=env,
+			stdout=subprocess.DEVNULL
+		)
+		for _ in range(workers)
+	]
+	for process in processes:
+		process.wait()
+	elapsed = perf_counter() - started
+	
+	queue = WorkQueue(directory.joinpath('queue.db'))
+	stats = queue.stats()
+	queue.close()
+	if stats['due'] or stats['leased']:
+		raise RuntimeError(f'La cola no se vació: {stats}')
+	return elapsed
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+	parser.add_argument('--urls', type=int, default=600)
+	parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+	parser.add_argument('--threads', type=int, default=4, help='pages in flight per worker')
+	parser.add_argument('--latency', type=float, default=0.05, help='seconds per page')
+	args = parser.parse_args()
+	
+	# Páginas chicas y sin fallas: se mide el reparto de la cola, no el parser
+	configure(latency=args.latency, jitter=0.0, change_rate=0.0, page_kb=1)
+	server = serve()
+	base = f'http://127.0.0.1:{server.server_port}'
+	
+	directory = Path(tempfile.mkdtemp(prefix='ml-tracker-queue-'))
+	try:
+		prepare(directory, [f'{base}/MLA-{i}' for i in range(args.urls)], args.threads)
+		
+		baseline = None
+		for workers in args.workers:
+			elapsed = drain(directory, workers)
+			throughput = args.urls / elapsed
+			baseline = baseline or throughput / workers
+			print(json.dumps({
+				'workers': workers,
+				'seconds': round(elapsed, 2),
+				'urls_per_second': round(throughput, 1),
+				'scaling': round(throughput / baseline / workers, 2)
+			}))
+	finally:
+		server.shutdown()
+		shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Cost of moving tracked products between the workers and TrackerWorker:
+pandas Series from iterrows() written back one `loc` at a time, against
+ProductResult records written back in batches.
+	
+	python -m bench.records --results 10000 --batch 200
+
+Reports milliseconds to build the transport objects, to apply the fetched
+fields to them, and to write them back into the DataFrame, plus the
+memory held by the objects while they are in flight.
+"""
+import argparse
+import json
+import tracemalloc
+from time import perf_counter
+
+from pandas import DataFrame
+
+from tracker.engine import apply_fields
+from tracker.records import product_results, write_results
+from tracker.store import DTYPES, new_products
+
+FIELDS = {
+	'product': 'Producto de prueba',
+	'available': True,
+	'free_ship': True,
+	'currency': '$',
+	'price': 1234.0,
+	'with_discount': False
+}
+
+
+def ignore(message: str, level: str, notify: bool):
+	pass
+
+
+def sample(count: int) -> DataFrame:
+	return new_products([f'https://articulo.mercadolibre.com.ar/MLA-{i}' for i in range(count)])
+
+
+def measure(build) -> tuple[list, float, int]:
+	"""Build once for the time and once more, traced, for the memory."""
+	started = perf_counter()
+	objects = build()
+	elapsed = (perf_counter() - started) * 1000
+	
+	tracemalloc.start()
+	traced = build()
+	held = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del traced
+	return objects, elapsed, held
+
+
+def bench_series(count: int) -> dict:
+	data = sample(count)
+	rows, built, held = measure(lambda: list(data.iterrows()))
+	
+	started = perf_counter()
+	for _, row in rows:
+		apply_fields(row, FIELDS, ignore)
+	applied = (perf_counter() - started) * 1000
+	
+	started = perf_counter()
+	for index, row in rows:
+		data.loc[index] = row
+	written = (perf_counter() - started) * 1000
+	
+	return {
+		'transport': 'Series',
+		'build_ms': round(built, 1),
+		'apply_fields_ms': round(applied, 1),
+		'write_ms': round(written, 1),
+		'bytes_per_result': held // count,
+		'dtypes_kept': data.dtypes.astype(str).to_dict() == DTYPES
+	}
+
+
+def bench_records(count: int, batch: int) -> dict:
+	data = sample(count)
+	results, built, held = measure(lambda: product_results(data))
+	
+	started = perf_counter()
+	for result in results:
+		apply_fields(result, FIELDS, ignore)
+	applied = (perf_counter() - started) * 1000
+	
+	started = perf_counter()
+	for start in range(0, count, batch):
+		chunk = results[start:start + batch]
+		positions = data.index.get_indexer([result.index for result in chunk])
+		write_results(data, positions, chunk)
+	written = (perf_counter() - started) * 1000
+	
+	return {
+		'transport': 'ProductResult',
+		'build_ms': round(built, 1),
+		'apply_fields_ms': round(applied, 1),
+		'write_ms': round(written, 1),
+		'bytes_per_result': held // count,
+		'dtypes_kept': data.dtypes.astype(str).to_dict() == DTYPES
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+	parser.add_argument('--results', type=int, default=10000)
+	parser.add_argument('--batch', type=int, default=200, help='results written per batch')
+	args = parser.parse_args()
+	
+	print(json.dumps({'results': args.results, 'batch': args.batch}))
+	print(json.dumps(bench_series(args.results)))
+	print(json.dumps(bench_records(args.results, args.batch)))
+
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
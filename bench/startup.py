@@ -0,0 +1,110 @@
+"""
+Cold-start benchmark of the GUI: time from process launch to the first
+paint of the main window, and to the products being loaded.
+	
+	python -m bench.startup --runs 5 --dir <folder with products.db>
+
+Each run is a fresh interpreter. With --cold the snapshot is removed
+before every run, so the products are read from SQLite.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from time import monotonic
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def child():
+	# monotonic() es el mismo reloj en todos los procesos, así que se compara con el del padre
+	from PyQt6.QtCore import QEvent, QObject, QTimer
+	from PyQt6.QtWidgets import QApplication
+	
+	marks = {}
+	
+	class FirstPaint(QObject):
+		
+		def eventFilter(self, watched, event):
+			if event.type() == QEvent.Type.Paint and 'first_paint' not in marks:
+				marks['first_paint'] = monotonic()
+				done()
+			return False
+	
+	def data_ready():
+		marks['data_ready'] = monotonic()
+		done()
+	
+	def done():
+		if 'first_paint' in marks and 'data_ready' in marks:
+			QTimer.singleShot(0, app.quit)
+	
+	app = QApplication(sys.argv)
+	app.setQuitOnLastWindowClosed(False)
+	marks['qt_ready'] = monotonic()
+	
+	from widgets.app import MainWindow
+	
+	window = MainWindow()
+	window.tracker.signals.loaded.connect(data_ready)
+	paint_filter = FirstPaint()
+	window.installEventFilter(paint_filter)
+	window.show()
+	app.exec()
+	
+	marks['products'] = len(window.tracker.data)
+	print(json.dumps(marks))
+
+
+def run_once(directory: Path) -> dict:
+	env = {**os.environ, 'PYTHONPATH': str(ROOT)}
+	launched = monotonic()
+	output = subprocess.run(
+		[sys.executable, '-m', 'bench.startup', '--child'],
+		cwd=directory,
+		env=env,
+		capture_output=True,
+		text=True,
+		check=True
+	).stdout
+	marks = json.loads(output.strip().splitlines()[-1])
+	return {
+		'qt_ready_ms': round((marks['qt_ready'] - launched) * 1000, 1),
+		'first_paint_ms': round((marks['first_paint'] - launched) * 1000, 1),
+		'data_ready_ms': round((marks['data_ready'] - launched) * 1000, 1),
+		'products': marks['products']
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+	parser.add_argument('--runs', type=int, default=5)
+	parser.add_argument('--dir', type=Path, default=Path('.'), help='folder with products.db and settings.ini')
+	parser.add_argument('--cold', action='store_true', help='remove the snapshot before each run')
+	parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+	
+	if args.child:
+		child()
+		return
+	
+	results = []
+	for _ in range(args.runs):
+		if args.cold:
+			args.dir.joinpath('products.snapshot').unlink(missing_ok=True)
+		result = run_once(args.dir)
+		results.append(result)
+		print(json.dumps(result))
+	
+	summary = {
+		key: median(result[key] for result in results)
+		for key in ('qt_ready_ms', 'first_paint_ms', 'data_ready_ms')
+	}
+	print(json.dumps({'runs': args.runs, 'cold': args.cold, **summary}))
+
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
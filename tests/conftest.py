@@ -0,0 +1,81 @@
+import atexit
+import os
+import sys
+import tempfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# TrackerWorker lee settings.ini del directorio actual al importarse: que no sea el del repositorio
+os.chdir(tempfile.mkdtemp(prefix='ml-tracker-tests-'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Páginas de Mercado Libre guardadas, servidas tal cual por el fixture `pages`
+PAGES = ROOT.joinpath('tests', 'pages')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+	
+	def log_message(self, format, *args):
+		pass
+
+
+@pytest.fixture(scope='session')
+def qapp():
+	from PyQt6.QtWidgets import QApplication
+	
+	app = QApplication.instance() or QApplication([])
+	yield app
+
+
+@pytest.fixture
+def pages():
+	"""Base URL of a local server for the saved pages under tests/pages."""
+	server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(PAGES)))
+	Thread(target=server.serve_forever, daemon=True).start()
+	yield f'http://127.0.0.1:{server.server_address[1]}'
+	server.shutdown()
+	server.server_close()
+
+
+@pytest.fixture
+def make_tracker(qapp, tmp_path, monkeypatch):
+	"""
+	Build TrackerWorkers over `tmp_path`, with the given GENERAL settings
+	and `urls` as its products, already loaded.
+	"""
+	from tracker.config import load_settings
+	from tracker.store import ProductStore, new_products
+	from tracker.tracker import TrackerWorker
+	
+	monkeypatch.chdir(tmp_path)
+	trackers = []
+	
+	def make(urls: list[str] = (), **options) -> TrackerWorker:
+		settings = load_settings(str(tmp_path.joinpath('settings.ini')))
+		for option, value in options.items():
+			settings.set('GENERAL', option, value)
+		monkeypatch.setattr(TrackerWorker, 'settings', settings)
+		
+		store = ProductStore(tmp_path.joinpath('products.db'))
+		store.replace(new_products(list(urls)))
+		store.close()
+		
+		tracker = TrackerWorker()
+		tracker.apply_loaded(tracker.read_data())
+		trackers.append(tracker)
+		return tracker
+	
+	yield make
+	
+	for tracker in trackers:
+		tracker.stop()
+		tracker.threadpool.waitForDone(5000)
+		tracker.writer.stop()
+		atexit.unregister(tracker.save_snapshot)
+		tracker.store.close()
\ No newline at end of file
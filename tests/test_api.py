@@ -0,0 +1,113 @@
+import json
+import zlib
+
+import pytest
+
+from bench import api_mock
+from tracker.api import ItemsClient
+from tracker.breaker import OPEN
+from tracker.cancel import CancelToken
+from tracker.fetchers import FetchError, Fetcher
+from tracker.http import HttpClient
+from tracker.records import ProductResult
+from tracker.scrapper import ApiRunnable
+from tracker.session import TrackingSession
+from tracker.signals import Signals
+
+
+@pytest.fixture
+def api():
+	api_mock.ItemsHandler.requests = 0
+	server = api_mock.serve()
+	http = HttpClient()
+	yield ItemsClient(http, f'http://127.0.0.1:{server.server_port}')
+	http.close()
+	server.shutdown()
+	server.server_close()
+	api_mock.ItemsHandler.down = False
+
+
+def results(count: int) -> list[tuple[ProductResult, str]]:
+	batch = []
+	for i in range(count):
+		url = f'https://articulo.mercadolibre.com.ar/MLA-{1000000000 + i}'
+		result = ProductResult(i, url, None, None, None, None, None, None, None, None, None, None, None, None)
+		batch.append((result, f'MLA{1000000000 + i}'))
+	return batch
+
+
+def test_bench_counts_the_requests_served(capsys):
+	api_mock.bench(45)
+	
+	report = json.loads(capsys.readouterr().out)
+	assert report['requests'] == 3
+
+
+def test_api_runnable_goes_through_the_breaker(api, qapp):
+	api_mock.ItemsHandler.down = True
+	signals = Signals()
+	session = TrackingSession(60, 4, 10, 2, 300, signals.log.emit)
+	scraped = []
+	
+	def run():
+		ApiRunnable(results(3), signals, api, session, CancelToken(), 10, scraped.append).run()
+	
+	run()
+	run()
+	assert api_mock.ItemsHandler.requests == 2
+	assert session.breakers.get(api.base_url).state == OPEN
+	
+	# Con el circuito abierto el lote no vuelve a pedirse: va directo al scraping
+	run()
+	assert api_mock.ItemsHandler.requests == 2
+	assert len(scraped) == 9
+
+
+def test_api_runnable_resolves_the_batch(api, qapp):
+	signals = Signals()
+	session = TrackingSession(60, 4, 10, 2, 300, signals.log.emit)
+	finished = []
+	signals.thread_finished.connect(finished.append)
+	scraped = []
+	
+	batch = results(40)
+	ApiRunnable(batch, signals, api, session, CancelToken(), 10, scraped.append).run()
+	
+	assert api_mock.ItemsHandler.requests == 2
+	# El mock no encuentra una fracción de los ids: esos se scrapean
+	missing = [result for result, item_id in batch if zlib.crc32(item_id.encode()) % 10 == 0]
+	assert scraped == missing
+	assert len(finished) == 40 - len(missing)
+	assert all(result.current_price for result in finished if result.available)
+
+
+def test_api_fallback_scrapes_with_the_cycle_fetchers(api, make_tracker, monkeypatch):
+	from tracker.tracker import TrackerWorker
+	
+	scraped = []
+	built = []
+	
+	class FailingFetcher(Fetcher):
+		name = 'failing'
+		
+		def fetch(self, url, deadline, headers=None):
+			scraped.append(url)
+			raise FetchError('sin red en los tests')
+	
+	def fetchers(self):
+		built.append(FailingFetcher())
+		return built[-1:]
+	
+	# La propiedad lee settings.ini y crea el pool de drivers: solo se evalúa en start()
+	monkeypatch.setattr(TrackerWorker, 'fetchers', property(fetchers))
+	batch = results(40)
+	tracker = make_tracker(
+		[result.url for result, _ in batch], fetch_backend='api', api_base_url=api.base_url
+	)
+	
+	tracker.start()
+	assert tracker.threadpool.waitForDone(10000)
+	
+	missing = [result.url for result, item_id in batch if zlib.crc32(item_id.encode()) % 10 == 0]
+	assert len(built) == 1
+	assert sorted(scraped) == sorted(missing)
\ No newline at end of file
@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from tracker.async_engine import AsyncHttpClient
+
+
+class StandIn:
+	"""
+	Local server answering each request with the next scripted response,
+	raw bytes or None to never answer. Counts connections and how many the
+	client closed.
+	"""
+	
+	def __init__(self, responses: list):
+		self.responses = list(responses)
+		self.connections = 0
+		self.closed = 0
+		self.requests: list[bytes] = []
+	
+	async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		self.connections += 1
+		try:
+			while True:
+				request = await reader.readuntil(b'\r\n\r\n')
+				self.requests.append(request)
+				response = self.responses.pop(0)
+				if response is None:
+					await reader.read()
+					break
+				writer.write(response)
+				await writer.drain()
+				if b'Connection: close' in response:
+					break
+		except (asyncio.IncompleteReadError, ConnectionError):
+			pass
+		self.closed += 1
+		writer.close()
+
+
+async def exchange(responses: list, paths: list[str], timeout: float = 5) -> tuple[StandIn, list]:
+	stand_in = StandIn(responses)
+	server = await asyncio.start_server(stand_in.handle, '127.0.0.1', 0)
+	port = server.sockets[0].getsockname()[1]
+	client = AsyncHttpClient(max_per_host=4)
+	
+	results = []
+	for path in paths:
+		try:
+			results.append(await client.get(f'http://127.0.0.1:{port}{path}', timeout))
+		except Exception as e:
+			results.append(e)
+	# Lo que el cliente cerró le llega al servidor en la próxima vuelta del loop
+	await asyncio.sleep(0.05)
+	results.append(sum(len(connections) for connections in client._idle.values()))
+	
+	client.close()
+	server.close()
+	await server.wait_closed()
+	return stand_in, results
+
+
+def test_chunked_body_with_extensions_and_trailers():
+	response = (
+		b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nContent-Type: text/html\r\n\r\n'
+		b'5;name=value\r\n<html\r\n'
+		b'7\r\n>precio\r\n'
+		b'0\r\nX-Trailer: si\r\n\r\n'
+	)
+	stand_in, (page, second, idle) = asyncio.run(exchange([response, response], ['/a', '/b']))
+	
+	assert page.status == 200
+	assert page.text == '<html>precio'
+	assert second.text == '<html>precio'
+	# El trailer se consumió entero: la segunda respuesta llega por la misma conexión
+	assert stand_in.connections == 1
+	assert idle == 1
+
+
+def test_keep_alive_reuses_one_connection():
+	response = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok'
+	not_modified = b'HTTP/1.1 304 Not Modified\r\nETag: "a"\r\n\r\n'
+	stand_in, (first, second, third, idle) = asyncio.run(
+		exchange([response, not_modified, response], ['/a', '/a', '/b'])
+	)
+	
+	assert [first.status, second.status, third.status] == [200, 304, 200]
+	assert second.body == b''
+	assert stand_in.connections == 1
+	assert idle == 1
+
+
+def test_connection_close_is_not_pooled():
+	response = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok'
+	stand_in, (first, second, idle) = asyncio.run(exchange([response, response], ['/a', '/b']))
+	
+	assert first.body == second.body == b'ok'
+	assert stand_in.connections == 2
+	assert stand_in.closed == 2
+	assert idle == 0
+
+
+def test_body_until_close_without_length():
+	response = b'HTTP/1.0 200 OK\r\n\r\nhasta el cierre'
+	
+	async def run():
+		async def handle(reader, writer):
+			await reader.readuntil(b'\r\n\r\n')
+			writer.write(response)
+			await writer.drain()
+			writer.close()
+		
+		server = await asyncio.start_server(handle, '127.0.0.1', 0)
+		client = AsyncHttpClient()
+		page = await client.get(f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/', 5)
+		idle = sum(len(connections) for connections in client._idle.values())
+		server.close()
+		await server.wait_closed()
+		return page, idle
+	
+	page, idle = asyncio.run(run())
+	assert page.text == 'hasta el cierre'
+	assert idle == 0
+
+
+def test_timeout_closes_the_connection():
+	stand_in, (error, idle) = asyncio.run(exchange([None], ['/lento'], timeout=0.2))
+	
+	assert isinstance(error, asyncio.TimeoutError)
+	# El servidor ve el cierre: la conexión cortada a mitad de respuesta no quedó abierta
+	assert stand_in.closed == 1
+	assert idle == 0
+
+
+def test_stale_pooled_connection_is_retried():
+	response = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok'
+	
+	async def run():
+		connections = []
+		
+		async def handle(reader, writer):
+			connections.append(writer)
+			await reader.readuntil(b'\r\n\r\n')
+			writer.write(response)
+			await writer.drain()
+			# Cierra la conexión que el cliente dejó en el pool
+			writer.close()
+		
+		server = await asyncio.start_server(handle, '127.0.0.1', 0)
+		url = f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/'
+		client = AsyncHttpClient()
+		first = await client.get(url, 5)
+		await asyncio.sleep(0.05)
+		second = await client.get(url, 5)
+		client.close()
+		server.close()
+		await server.wait_closed()
+		return first, second, len(connections)
+	
+	first, second, connections = asyncio.run(run())
+	assert first.body == second.body == b'ok'
+	assert connections == 2
+
+
+@pytest.mark.parametrize('status', [b'200 OK', b'503 Service Unavailable'])
+def test_status_and_headers(status):
+	response = b'HTTP/1.1 ' + status + b'\r\nContent-Length: 0\r\nETag:  "x" \r\n\r\n'
+	_, (page, _) = asyncio.run(exchange([response], ['/a']))
+	
+	assert page.status == int(status.split()[0])
+	assert page.headers['etag'] == '"x"'
\ No newline at end of file
@@ -0,0 +1,109 @@
+from tracker.breaker import CLOSED, OPEN, Breakers, CircuitBreaker, site_key
+from tracker.cancel import CancelToken
+from tracker.fetchers import FetchError, Fetcher
+from tracker.records import ProductResult
+from tracker.scrapper import ProductRunnable
+from tracker.session import TrackingSession
+from tracker.signals import Signals
+
+URL = 'https://articulo.mercadolibre.com.ar/MLA-1'
+
+
+class TrippingFetcher(Fetcher):
+	"""
+	While its request is in flight the breaker trips and another worker takes
+	the half-open probe; then the request fails without a verdict.
+	"""
+	
+	name = 'stub'
+	
+	def __init__(self, breaker: CircuitBreaker):
+		self.breaker = breaker
+		self.probe = None
+	
+	def fetch(self, url, deadline, headers=None):
+		for _ in range(self.breaker.threshold):
+			self.breaker.failure()
+		self.probe = self.breaker.allow()
+		raise FetchError('HTTP 404')
+
+
+def test_site_key():
+	assert site_key('https://articulo.mercadolibre.com.ar/MLA-1') == 'mercadolibre.com.ar'
+	assert site_key('https://www.mercadolibre.com.ar:443/ofertas') == 'mercadolibre.com.ar'
+	assert site_key('http://127.0.0.1:8000/MLA-1') == '127.0.0.1'
+
+
+def test_opens_after_threshold_failures():
+	breaker = CircuitBreaker(threshold=3, cooldown=60)
+	
+	assert not breaker.failure()
+	assert not breaker.failure()
+	assert breaker.allow() == (True, False)
+	# Solo la falla que lo abre avisa
+	assert breaker.failure()
+	assert not breaker.failure()
+	
+	assert breaker.state == OPEN
+	assert breaker.trips == 1
+	assert breaker.allow() == (False, False)
+
+
+def test_success_resets_the_failure_count():
+	breaker = CircuitBreaker(threshold=2, cooldown=60)
+	
+	breaker.failure()
+	assert not breaker.success()
+	assert not breaker.failure()
+	assert breaker.state == CLOSED
+
+
+def test_only_one_probe_when_half_open():
+	breaker = CircuitBreaker(threshold=2, cooldown=0)
+	assert breaker.allow() == (True, False)
+	
+	breaker.failure()
+	breaker.failure()
+	assert breaker.allow() == (True, True)
+	assert breaker.allow() == (False, False)
+	
+	breaker.release()
+	assert breaker.allow() == (True, True)
+	assert breaker.success()
+	assert breaker.allow() == (True, False)
+
+
+def test_failed_probe_opens_again():
+	breaker = CircuitBreaker(threshold=2, cooldown=0)
+	breaker.failure()
+	breaker.failure()
+	
+	assert breaker.allow() == (True, True)
+	assert not breaker.failure()
+	assert breaker.state == OPEN
+	assert breaker.trips == 1
+
+
+def test_one_breaker_per_site():
+	breakers = Breakers(threshold=1, cooldown=60)
+	breaker = breakers.get('https://articulo.mercadolibre.com.ar/MLA-1')
+	
+	assert breakers.get('https://www.mercadolibre.com.ar/ofertas') is breaker
+	assert breakers.get('https://articulo.mercadolibre.com.mx/MLM-1') is not breaker
+	
+	breaker.failure()
+	assert breakers.stats() == {'breaker': OPEN, 'trips': 1}
+
+
+def test_request_from_before_the_trip_does_not_free_the_probe(qapp):
+	signals = Signals()
+	session = TrackingSession(60, 4, 1, 2, 0, signals.log.emit)
+	breaker = session.breakers.get(URL)
+	fetcher = TrippingFetcher(breaker)
+	result = ProductResult(0, URL, None, None, None, None, None, None, None, None, None, None, None, None)
+	
+	ProductRunnable(result, signals, [fetcher], session, CancelToken(), 10).run()
+	
+	assert fetcher.probe == (True, True)
+	# El pedido entró con el circuito cerrado: terminar no le suelta la prueba a un tercero
+	assert breaker.allow() == (False, False)
\ No newline at end of file
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from bench.cycle import browser_processes
+
+# Proceso hijo que hace de Chrome, colgado como una página que no termina de cargar
+DRIVER_SCRIPT = "import subprocess, sys, time; subprocess.Popen([sys.argv[1], '-c', 'import time; time.sleep(600)']); time.sleep(600)"
+
+
+def wait_for(condition, timeout: float = 10) -> bool:
+	deadline = time.monotonic() + timeout
+	while not condition():
+		if time.monotonic() > deadline:
+			return False
+		time.sleep(0.05)
+	return True
+
+
+@pytest.fixture
+def fake_chrome(tmp_path, monkeypatch):
+	"""
+	Replace selenium's Chrome with a stand-in that starts real processes named
+	chromedriver and chrome, in the process group the real Service asks for.
+	Loading a page blocks until chromedriver dies.
+	"""
+	import tracker.drivers
+	
+	if not os.path.isdir('/proc'):
+		pytest.skip('browser_processes recorre /proc')
+	
+	python = os.path.realpath(sys.executable)
+	driver_path = tmp_path.joinpath('chromedriver')
+	chrome_path = tmp_path.joinpath('chrome')
+	for path in (driver_path, chrome_path):
+		os.symlink(python, path)
+	
+	class FakeChrome:
+		
+		def __init__(self, options=None, service=None):
+			self.service = service
+			service.process = subprocess.Popen(
+				[str(driver_path), '-c', DRIVER_SCRIPT, str(chrome_path)], **service.popen_kw
+			)
+		
+		@property
+		def current_url(self) -> str:
+			if self.service.process.poll() is not None:
+				raise ConnectionError('chromedriver terminó')
+			return 'about:blank'
+		
+		def execute_cdp_cmd(self, command, params):
+			pass
+		
+		def set_page_load_timeout(self, timeout):
+			pass
+		
+		def get(self, url):
+			while self.service.process.poll() is None:
+				time.sleep(0.05)
+			raise ConnectionError('chromedriver terminó')
+		
+		def quit(self):
+			tracker.drivers.kill_process_tree(self.service.process.pid)
+			self.service.process.wait(5)
+	
+	monkeypatch.setattr(tracker.drivers, 'Chrome', FakeChrome)
+	yield
+	shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def test_stop_mid_cycle_leaves_no_browsers(fake_chrome, make_tracker):
+	urls = [f'http://127.0.0.1:9/MLA-{i}' for i in range(6)]
+	tracker = make_tracker(urls, fetch_backend='selenium', max_paralell_tracking=2, fetch_timeout=60)
+	
+	tracker.start()
+	assert tracker.session.cycle.running
+	# Dos navegadores, cada uno con su chromedriver y su Chrome
+	assert wait_for(lambda: browser_processes(os.getpid()) == 4)
+	
+	tracker.stop()
+	assert wait_for(lambda: browser_processes(os.getpid()) == 0, timeout=2)
+	assert tracker.threadpool.waitForDone(5000)
+	assert tracker.drivers.alive == 0
+
+
+def test_stop_after_cycle_leaves_no_browsers(fake_chrome, make_tracker):
+	tracker = make_tracker(['http://127.0.0.1:9/MLA-1'], fetch_backend='selenium', max_paralell_tracking=1)
+	
+	tracker.start()
+	assert wait_for(lambda: browser_processes(os.getpid()) == 2)
+	# Un Stop seguido de otro no deja nada ni falla
+	tracker.stop()
+	tracker.stop()
+	assert wait_for(lambda: browser_processes(os.getpid()) == 0, timeout=2)
+
+def test_cycle_bench_without_proc_nor_resource(monkeypatch, capsys):
+	from bench import cycle
+	
+	# Como en Windows sin psutil
+	monkeypatch.setattr(cycle.os.path, 'isdir', lambda path: False)
+	monkeypatch.setitem(sys.modules, 'psutil', None)
+	monkeypatch.setitem(sys.modules, 'resource', None)
+	
+	assert cycle.browser_processes(os.getpid()) is None
+	assert cycle.peak_rss_mb() is None
+	
+	cycle.compare(
+		[{'urls': 10, 'cycles_per_minute': 12.0, 'peak_rss_mb': None, 'browsers': None}],
+		[{'urls': 10, 'cycles_per_minute': 10.0, 'peak_rss_mb': 80.0, 'browsers': 0}]
+	)
+	assert json.loads(capsys.readouterr().out) == {'urls': 10, 'cycles_per_minute': '+20.0% mejor'}
\ No newline at end of file
@@ -0,0 +1,62 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from tracker.extraction import PRODUCT_SPEC, extract, extract_in_browser
+from tracker.parser import Node, parse_html
+
+from conftest import PAGES
+
+# Lo mínimo del DOM y de la Resource Timing API que usa EXTRACT_SCRIPT
+BROWSER = """
+const matches = %s;
+const document = {
+	querySelectorAll: selector => (matches[selector] || []).map(node => ({
+		textContent: node.text,
+		getAttribute: name => name in node.attrs ? node.attrs[name] : null
+	}))
+};
+const performance = {
+	now: () => Date.now(),
+	getEntriesByType: type => type === 'navigation' ? [{transferSize: 1000}] : [{transferSize: 24}, {}]
+};
+const result = (function () { %s }).apply(null, %s);
+process.stdout.write(JSON.stringify(result));
+"""
+
+
+class NodeDriver:
+	"""
+	Stands in for WebDriver: runs the script in node, over a document whose
+	querySelectorAll answers with what the Python parser selects.
+	"""
+	
+	def __init__(self, document: Node):
+		self.document = document
+	
+	def execute_script(self, script: str, *args):
+		selectors = {
+			alternative.strip() for field in args[0] for alternative in field['selector'].split(',')
+		}
+		matches = {
+			selector: [{'text': node.text, 'attrs': node.attrs} for node in self.document.select(selector)]
+			for selector in selectors
+		}
+		program = BROWSER % (json.dumps(matches), script, json.dumps(args))
+		completed = subprocess.run(['node', '-'], input=program, capture_output=True, text=True, check=True)
+		return json.loads(completed.stdout)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='hace falta node para correr el script')
+@pytest.mark.parametrize('variant', ['normal', 'discounted', 'free_ship', 'out_of_stock', 'maintenance'])
+def test_script_reads_what_extract_reads(variant):
+	document = parse_html(PAGES.joinpath(f'{variant}.html').read_text(encoding='utf-8'))
+	expected, expected_timings = extract(document, PRODUCT_SPEC)
+	
+	values, timings, transferred = extract_in_browser(NodeDriver(document), PRODUCT_SPEC)
+	
+	assert values == expected
+	assert timings.keys() == expected_timings.keys()
+	assert transferred == 1024
\ No newline at end of file
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+
+import widgets.formatting
+from widgets.formatting import PostsFormatter
+
+COLUMNS = ['product', 'current_price', 'available']
+
+
+@pytest.fixture
+def formatted(monkeypatch):
+	"""A PostsFormatter over three rows, plus the length of every frame it formats."""
+	tracker = SimpleNamespace(
+		data=DataFrame(
+			{
+				'product': ['A', 'B', 'C'],
+				'previous_price': [100.0, 200.0, 300.0],
+				'current_price': [100.0, 200.0, 300.0],
+				'currency': ['$', '$', 'US$'],
+				'available': [True, True, False]
+			},
+			index=[10, 11, 12]
+		),
+		version=1
+	)
+	calls = []
+	format_posts = widgets.formatting.format_posts
+	
+	def counted(data, columns):
+		calls.append(len(data))
+		return format_posts(data, columns)
+	
+	monkeypatch.setattr(widgets.formatting, 'format_posts', counted)
+	formatter = PostsFormatter(tracker, COLUMNS)
+	assert formatter.display(0, 0) == 'A'
+	return tracker, formatter, calls
+
+
+def test_updated_rows_are_formatted_alone(formatted):
+	tracker, formatter, calls = formatted
+	
+	tracker.data.loc[11, ['current_price', 'available']] = [150.0, False]
+	tracker.version += 1
+	formatter.update_rows(np.array([1]))
+	
+	assert formatter.display(1, 1) == '⬇️ $ 150.0'
+	assert formatter.color(1, 1) == 'lime'
+	assert formatter.display(1, 2) == 'No'
+	assert formatter.display(2, 1) == '➖ US$ 300.0'
+	assert calls == [3, 1]
+
+
+def test_other_changes_format_everything(formatted):
+	tracker, formatter, calls = formatted
+	
+	# Una fila nueva y otra actualizada: la versión avanzó dos veces
+	tracker.data.loc[13] = ['D', 0.0, 50.0, '$', True]
+	tracker.version += 1
+	tracker.data.loc[10, 'current_price'] = 120.0
+	tracker.version += 1
+	formatter.update_rows(np.array([0]))
+	
+	assert formatter.display(3, 0) == 'D'
+	assert formatter.display(0, 1) == '⬆️ $ 120.0'
+	assert calls == [3, 4]
\ No newline at end of file
@@ -0,0 +1,118 @@
+from tracker.history import PriceHistory
+from tracker.store import observation
+
+URL = 'https://articulo.mercadolibre.com.ar/MLA-1'
+
+
+def seen(timestamp: int, price, available: bool = True, url: str = URL) -> dict:
+	return {
+		'url': url,
+		'timestamp': timestamp,
+		'price': price,
+		'currency': '$',
+		'available': available,
+		'free_ship': False,
+		'with_discount': False
+	}
+
+
+def test_identical_observations_extend_the_run(tmp_path):
+	history = PriceHistory(tmp_path / 'history.db')
+	history.append([seen(100, 10.0), seen(200, 10.0), seen(300, 12.0)])
+	history.append([seen(400, 12.0)])
+	
+	runs = history.series(URL)
+	history.close()
+	
+	assert [(run['first_seen'], run['last_seen'], run['observations'], run['price']) for run in runs] == [
+		(100, 200, 2, 10.0),
+		(300, 400, 2, 12.0),
+	]
+
+
+def test_series_returns_the_runs_overlapping_the_range(tmp_path):
+	history = PriceHistory(tmp_path / 'history.db')
+	history.append([seen(100, 10.0), seen(200, 10.0), seen(300, 12.0), seen(400, 14.0)])
+	
+	assert [run['price'] for run in history.series(URL, start=250)] == [12.0, 14.0]
+	assert [run['price'] for run in history.series(URL, end=250)] == [10.0]
+	# Una corrida que empezó antes del rango pero lo alcanza también cuenta
+	assert [run['price'] for run in history.series(URL, start=150, end=300)] == [10.0, 12.0]
+	assert history.series('https://articulo.mercadolibre.com.ar/MLA-2') == []
+	history.close()
+
+
+def test_stats(tmp_path):
+	history = PriceHistory(tmp_path / 'history.db')
+	history.append([seen(100, 10.0), seen(200, 10.0), seen(300, 16.0)])
+	
+	assert history.stats(URL) == {'min': 10.0, 'max': 16.0, 'mean': 12.0, 'count': 3}
+	assert history.all_stats() == {URL: history.stats(URL)}
+	history.close()
+
+
+def test_out_of_stock_is_not_a_price(tmp_path):
+	history = PriceHistory(tmp_path / 'history.db')
+	history.append([seen(100, 10.0), seen(200, 10.0, available=False), seen(300, 0.0, available=False)])
+	history.append([seen(100, 0.0, available=False, url='https://articulo.mercadolibre.com.ar/MLA-2')])
+	
+	assert history.stats(URL) == {'min': 10.0, 'max': 10.0, 'mean': 10.0, 'count': 1}
+	assert history.stats('https://articulo.mercadolibre.com.ar/MLA-2') is None
+	history.close()
+
+
+def test_observation_drops_the_price_without_stock():
+	row = {
+		'url': URL,
+		'checked_at': 100,
+		'current_price': 10.0,
+		'currency': '$',
+		'available': False,
+		'free_ship': False,
+		'with_discount': False
+	}
+	assert observation(row)['price'] is None
+	assert observation({**row, 'available': True})['price'] == 10.0
+	assert observation({**row, 'available': True, 'current_price': 0.0})['price'] is None
+
+def runs(history: PriceHistory) -> list[tuple]:
+	return [
+		(run['first_seen'], run['last_seen'], run['observations'], run['price']) for run in history.series(URL)
+	]
+
+
+def test_rewrite_replaces_the_archived_runs(tmp_path):
+	history = PriceHistory(tmp_path / 'history.db')
+	history.append([seen(50, 9.0), seen(100, 10.0), seen(200, 10.0), seen(300, 12.0)])
+	
+	history.rewrite([seen(100, 11.0), seen(200, 11.0), seen(300, 11.0)])
+	
+	# La corrida anterior a las páginas archivadas no se toca
+	assert runs(history) == [(50, 50, 1, 9.0), (100, 300, 3, 11.0)]
+	assert history.stats(URL) == {'min': 9.0, 'max': 11.0, 'mean': 10.5, 'count': 4}
+	history.close()
+
+
+def test_rewrite_keeps_runs_from_reads_that_were_not_archived(tmp_path):
+	history = PriceHistory(tmp_path / 'history.db')
+	# 200 vino de Selenium: no hay página archivada de esa lectura
+	history.append([seen(100, 10.0), seen(200, 12.0), seen(300, 12.0), seen(400, 13.0)])
+	
+	# Las páginas se archivan un poco antes de marcar el producto como chequeado
+	history.rewrite([seen(99, 11.0), seen(298, 14.0), seen(399, 13.0)], slack=5)
+	
+	assert runs(history) == [(99, 99, 1, 11.0), (200, 300, 2, 12.0), (399, 399, 1, 13.0)]
+	history.close()
+
+def test_appends_from_several_processes(tmp_path):
+	worker = PriceHistory(tmp_path / 'history.db')
+	daemon = PriceHistory(tmp_path / 'history.db')
+	
+	worker.append([seen(100, 10.0)])
+	daemon.append([seen(200, 12.0)])
+	# La última corrida ya no es la que este proceso escribió
+	worker.append([seen(300, 10.0)])
+	
+	assert runs(worker) == [(100, 100, 1, 10.0), (200, 200, 1, 12.0), (300, 300, 1, 10.0)]
+	worker.close()
+	daemon.close()
\ No newline at end of file
@@ -0,0 +1,165 @@
+import pytest
+
+from bench import fixtures
+from tracker.breaker import CircuitBreaker
+from tracker.cancel import CancelToken, Deadline
+from tracker.engine import READ, track_product
+from tracker.fetchers import FetchError, HttpFetcher, MaintenanceError, ParseError
+from tracker.http import HttpClient
+from tracker.metrics import metrics
+from tracker.store import new_products
+
+from conftest import PAGES
+
+EXPECTED = {
+	'normal': {
+		'product': 'Notebook Lenovo IdeaPad 3 15.6 Ryzen 5 8gb 512gb | MercadoLibre',
+		'available': True,
+		'free_ship': False,
+		'currency': '$',
+		'price': 899999.0,
+		'with_discount': False
+	},
+	'discounted': {
+		'product': 'Zapatillas Running Hombre Liviana Talle 42 | MercadoLibre',
+		'available': True,
+		'free_ship': False,
+		'currency': '$',
+		'price': 67999.0,
+		'with_discount': True
+	},
+	'free_ship': {
+		'product': 'Auriculares Bluetooth In Ear Deportivos | MercadoLibre',
+		'available': True,
+		'free_ship': True,
+		'currency': 'US$',
+		'price': 45.0,
+		'with_discount': False
+	},
+	'out_of_stock': {
+		'product': 'Taladro Percutor Inalámbrico 18v Con Maletín | MercadoLibre',
+		'available': False,
+		'free_ship': None,
+		'currency': None,
+		'price': None,
+		'with_discount': False
+	},
+}
+
+
+@pytest.fixture
+def fetcher():
+	fetcher = HttpFetcher(HttpClient())
+	yield fetcher
+	fetcher.close()
+
+
+@pytest.fixture
+def fixture_server():
+	"""bench.fixtures serving the saved pages, with no latency nor failures."""
+	options = {
+		'latency': 0.0,
+		'jitter': 0.0,
+		'error_rate': 0.0,
+		'maintenance_rate': 0.0,
+		'reset_rate': 0.0,
+		'change_rate': 0.0,
+		'pages': PAGES,
+		'etag': True
+	}
+	# Las opciones son atributos de clase: otros tests las pudieron cambiar
+	defaults = {name: getattr(fixtures.FixtureHandler, name) for name in options}
+	fixtures.configure(**options)
+	server = fixtures.serve()
+	yield f'http://127.0.0.1:{server.server_address[1]}'
+	server.shutdown()
+	server.server_close()
+	fixtures.configure(**defaults)
+
+
+def fetch(fetcher: HttpFetcher, url: str, headers: dict[str, str] | None = None) -> dict:
+	return fetcher.fetch(url, Deadline(10, CancelToken()), headers)
+
+
+def item_of(variant: str) -> str:
+	"""An item id bench.fixtures maps to `variant`."""
+	return next(f'MLA-{i}' for i in range(1000) if fixtures.variant_of(f'MLA-{i}') == variant)
+
+
+@pytest.mark.parametrize('variant', list(EXPECTED))
+def test_product_fields(variant, pages, fetcher):
+	fields = fetch(fetcher, f'{pages}/{variant}.html')
+	
+	assert {name: fields[name] for name in EXPECTED[variant]} == EXPECTED[variant]
+	assert fields['bytes'] == PAGES.joinpath(f'{variant}.html').stat().st_size
+	assert not fields['not_modified']
+	assert fields['last_modified'] is not None
+	assert set(fields['timings']) >= {'title', 'price'}
+
+
+def test_maintenance_page(pages, fetcher):
+	with pytest.raises(MaintenanceError, match='Error!'):
+		fetch(fetcher, f'{pages}/maintenance.html')
+
+
+def test_page_without_price(pages, fetcher):
+	# Un listado no tiene #price ni el aviso de publicación pausada
+	with pytest.raises(ParseError):
+		fetch(fetcher, f'{pages}/listing_poly_1.html')
+
+
+def test_missing_page(pages, fetcher):
+	with pytest.raises(FetchError, match='404') as error:
+		fetch(fetcher, f'{pages}/no_existe.html')
+	assert not isinstance(error.value, MaintenanceError)
+
+
+@pytest.mark.parametrize('variant', list(EXPECTED))
+def test_fixture_server_serves_saved_pages(variant, fixture_server, fetcher):
+	fields = fetch(fetcher, f'{fixture_server}/{item_of(variant)}')
+	
+	assert {name: fields[name] for name in EXPECTED[variant]} == EXPECTED[variant]
+	assert fields['etag'] is not None
+
+
+def test_fixture_server_not_modified(fixture_server, fetcher):
+	url = f'{fixture_server}/{item_of("normal")}'
+	first = fetch(fetcher, url)
+	
+	second = fetch(fetcher, url, {'If-None-Match': first['etag']})
+	assert second['not_modified']
+	assert second['bytes'] == 0
+	
+	third = fetch(fetcher, url, {'If-None-Match': '"otro"'})
+	assert third['price'] == first['price']
+
+
+@pytest.mark.parametrize('failure', ['error_rate', 'maintenance_rate'])
+def test_fixture_server_failures(failure, fixture_server, fetcher):
+	fixtures.configure(**{failure: 1.0})
+	try:
+		with pytest.raises(MaintenanceError):
+			fetch(fetcher, f'{fixture_server}/{item_of("normal")}')
+	finally:
+		fixtures.configure(**{failure: 0.0})
+
+
+def test_successful_fetch_only_reaches_metrics(fixture_server, fetcher):
+	row = new_products([f'{fixture_server}/{item_of("normal")}']).iloc[0].to_dict()
+	logs = []
+	metrics.reset()
+	
+	status = track_product(
+		row, [fetcher], CircuitBreaker(5, 60), Deadline(10, CancelToken()),
+		lambda message, level, notify: logs.append(message)
+	)
+	
+	assert status == READ
+	# El tamaño y el tiempo al precio de cada página no van al log de la interfaz
+	assert logs == []
+	snapshot = metrics.snapshot()
+	assert snapshot['counters']['bytes_read'] > 0
+	assert snapshot['timers']['time_to_price']['count'] == 1
+	# Un timer por campo del spec, para ver qué selector es lento o dejó de andar
+	assert snapshot['timers']['extract_price']['count'] == 1
+	assert snapshot['timers']['extract_title']['count'] == 1
\ No newline at end of file
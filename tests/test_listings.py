@@ -0,0 +1,106 @@
+import pytest
+
+from tracker.cancel import CancelToken, Deadline
+from tracker.fetchers import FetchError, MaintenanceError
+from tracker.http import HttpClient
+from tracker.listings import fetch_listing, parse_listing
+from tracker.parser import parse_html
+
+from conftest import PAGES
+
+ARTICLE = 'https://articulo.mercadolibre.com.ar/MLA-{}'
+
+
+def parse(name: str, base_url: str = 'https://listado.mercadolibre.com.ar/auriculares'):
+	return parse_listing(parse_html(PAGES.joinpath(name).read_text('utf-8')), base_url)
+
+
+def fetch(url: str, max_pages: int = 5) -> list[dict]:
+	client = HttpClient()
+	try:
+		return fetch_listing(client, url, max_pages, Deadline(10, CancelToken()))
+	finally:
+		client.close()
+
+
+def test_poly_cards():
+	items, next_url = parse('listing_poly_1.html')
+	by_url = {item['url']: item for item in items}
+	
+	# El link promocionado de click1 no tiene id de publicación y se descarta
+	assert list(by_url) == [
+		ARTICLE.format(1400000001),
+		ARTICLE.format(1400000002),
+		'https://www.mercadolibre.com.ar/auriculares-sony-wh-1000xm5/p/MLA19876543',
+		ARTICLE.format(1400000005),
+	]
+	assert next_url == 'https://listado.mercadolibre.com.ar/listing_poly_2.html'
+	
+	# Precio actual, no el tachado, y el descuento de la misma línea
+	discounted = by_url[ARTICLE.format(1400000001)]
+	assert discounted == {
+		'url': ARTICLE.format(1400000001),
+		'product': 'Auriculares Inalámbricos Bluetooth',
+		'current_price': 25999.0,
+		'currency': '$',
+		'free_ship': True,
+		'with_discount': True,
+		'available': True
+	}
+	
+	normal = by_url[ARTICLE.format(1400000002)]
+	assert normal['current_price'] == 1299999.0
+	assert not normal['free_ship'] and not normal['with_discount']
+	
+	catalog = by_url['https://www.mercadolibre.com.ar/auriculares-sony-wh-1000xm5/p/MLA19876543']
+	assert catalog['currency'] == 'US$'
+	assert catalog['free_ship']
+	
+	paused = by_url[ARTICLE.format(1400000005)]
+	assert paused['current_price'] is None
+	assert not paused['available']
+
+
+def test_last_page_has_no_next():
+	items, next_url = parse('listing_poly_2.html')
+	
+	assert [item['url'] for item in items] == [ARTICLE.format(1400000001), ARTICLE.format(1400000006)]
+	assert next_url is None
+
+
+def test_search_cards():
+	items, next_url = parse('listing_search.html')
+	
+	assert [(item['url'], item['current_price'], item['with_discount'], item['free_ship']) for item in items] == [
+		(ARTICLE.format(1500000001), 7499.0, True, True),
+		(ARTICLE.format(1500000002), 15350.0, False, False),
+	]
+	assert items[0]['product'] == 'Mouse Inalámbrico Ergonómico'
+	assert next_url is None
+
+
+def test_fetch_follows_pagination(pages):
+	items = fetch(f'{pages}/listing_poly_1.html')
+	
+	assert len(items) == 5
+	# Una publicación repetida en la página 2 conserva los valores de la primera
+	assert items[0]['url'] == ARTICLE.format(1400000001)
+	assert items[0]['current_price'] == 25999.0
+	assert items[-1]['url'] == ARTICLE.format(1400000006)
+
+
+def test_fetch_stops_at_max_pages(pages):
+	items = fetch(f'{pages}/listing_poly_1.html', max_pages=1)
+	
+	assert ARTICLE.format(1400000006) not in [item['url'] for item in items]
+	assert len(items) == 4
+
+
+def test_fetch_maintenance(pages):
+	with pytest.raises(MaintenanceError):
+		fetch(f'{pages}/maintenance.html')
+
+
+def test_fetch_missing_page(pages):
+	with pytest.raises(FetchError, match='404'):
+		fetch(f'{pages}/no_existe.html')
\ No newline at end of file
@@ -0,0 +1,80 @@
+import atexit
+import time
+
+from widgets.logs import LogModel, NotificationCoalescer
+
+
+def wait_events(qapp, seconds: float):
+	deadline = time.monotonic() + seconds
+	while time.monotonic() < deadline:
+		qapp.processEvents()
+		time.sleep(0.01)
+
+
+def test_log_model_drops_the_oldest_line(qapp):
+	model = LogModel(capacity=3)
+	removed = []
+	model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+	
+	for content in 'abcde':
+		model.append(content, 'info')
+	
+	assert model.rowCount() == 3
+	assert [model.data(model.index(row)) for row in range(3)] == ['c', 'd', 'e']
+	assert removed == [(0, 0), (0, 0)]
+
+
+def test_repeats_within_the_window_are_merged(qapp):
+	coalescer = NotificationCoalescer(window=100)
+	sent = []
+	coalescer.notify.connect(sent.append)
+	
+	for _ in range(4):
+		coalescer.push('Mantenimiento')
+	coalescer.push('Otro')
+	assert sent == ['Mantenimiento', 'Otro']
+	
+	wait_events(qapp, 0.3)
+	assert sent == ['Mantenimiento', 'Otro', 'Mantenimiento (se repitió 3 veces)']
+	
+	# Pasada la ventana, el mensaje vuelve a salir enseguida
+	coalescer.push('Mantenimiento')
+	assert sent[-1] == 'Mantenimiento'
+	wait_events(qapp, 0.3)
+	assert len(sent) == 4
+
+
+def test_main_window_reads_log_to_file_once(qapp, make_tracker, monkeypatch):
+	from tracker.tracker import TrackerWorker
+	from widgets.app import MainWindow
+	
+	make_tracker(log_to_file=False)
+	window = MainWindow()
+	while not window.tracker.loaded:
+		wait_events(qapp, 0.05)
+	reads = []
+	setting = TrackerWorker.log_to_file
+	monkeypatch.setattr(
+		TrackerWorker, 'log_to_file', property(lambda self: reads.append(1) or setting.fget(self), setting.fset)
+	)
+	written = []
+	monkeypatch.setattr(window.file_log, 'log', lambda level, content: written.append(content))
+	
+	try:
+		# Una ráfaga de errores no relee settings.ini por cada línea
+		for _ in range(10):
+			window.add_log('Error al leer el listado', 'error')
+		assert reads == []
+		assert written == []
+		
+		window.settings_widget.log_to_file_checkbox.setChecked(True)
+		window.add_log('Error al leer el listado', 'error')
+		assert written == ['Error al leer el listado']
+	finally:
+		window.tracker.stop()
+		window.tracker.writer.stop()
+		atexit.unregister(window.tracker.save_snapshot)
+		window.tracker.store.close()
+		window.tray_icon.hide()
+		window.deleteLater()
+		wait_events(qapp, 0.1)
\ No newline at end of file
@@ -0,0 +1,111 @@
+import pstats
+import urllib.request
+from threading import Thread
+
+import pytest
+
+from tracker.metrics import CycleProfiler, Histogram, Metrics, serve
+
+
+@pytest.mark.parametrize(
+	'q, expected',
+	[
+		(0.5, 10),
+		(0.9, 100),
+		(0.95, 200),
+		(1.0, 200),
+	]
+)
+def test_histogram_quantiles(q, expected):
+	histogram = Histogram()
+	# 50 en el bucket de 10 ms, 40 en el de 100, 10 en el de 250
+	for ms in [7.0] * 50 + [60.0] * 40 + [200.0] * 10:
+		histogram.observe(ms)
+	
+	# El límite del bucket, sin pasar el máximo visto
+	assert histogram.quantile(q) == expected
+
+
+def test_histogram_past_the_last_bucket():
+	histogram = Histogram()
+	histogram.observe(400000)
+	
+	assert histogram.buckets[-1] == 1
+	assert histogram.quantile(0.5) == 400000
+	assert Histogram().quantile(0.5) == 0.0
+
+
+def test_counters_gauges_and_timers_reset():
+	metrics = Metrics()
+	metrics.count('products_read')
+	metrics.count('products_read', 2)
+	metrics.gauge('queue_depth', 5)
+	with pytest.raises(ValueError):
+		with metrics.timer('fetch_http'):
+			raise ValueError
+	
+	snapshot = metrics.snapshot()
+	assert snapshot['counters'] == {'products_read': 3}
+	assert snapshot['gauges'] == {'queue_depth': 5}
+	# El timer mide también cuando el bloque falla
+	assert snapshot['timers']['fetch_http']['count'] == 1
+	
+	metrics.reset()
+	assert metrics.snapshot() == {'counters': {}, 'gauges': {}, 'timers': {}}
+
+
+def test_counts_from_several_threads():
+	metrics = Metrics()
+	
+	def work():
+		for _ in range(1000):
+			metrics.count('products_read')
+			metrics.observe('fetch_http', 1)
+	
+	threads = [Thread(target=work) for _ in range(8)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	
+	assert metrics.counters['products_read'] == 8000
+	assert metrics.histograms['fetch_http'].count == 8000
+
+
+def test_render_and_serve(monkeypatch):
+	import tracker.metrics
+	
+	registry = Metrics()
+	registry.count('products_read', 3)
+	registry.observe('fetch_http', 7)
+	registry.observe('fetch_http', 60)
+	monkeypatch.setattr(tracker.metrics, 'metrics', registry)
+	
+	server = serve(0)
+	try:
+		with urllib.request.urlopen(f'http://127.0.0.1:{server.server_port}/metrics') as response:
+			body = response.read().decode()
+	finally:
+		server.shutdown()
+		server.server_close()
+	
+	lines = body.splitlines()
+	assert 'ml_tracker_products_read_total 3' in lines
+	assert 'ml_tracker_fetch_http_ms_bucket{le="5"} 0' in lines
+	assert 'ml_tracker_fetch_http_ms_bucket{le="10"} 1' in lines
+	assert 'ml_tracker_fetch_http_ms_bucket{le="+Inf"} 2' in lines
+	assert 'ml_tracker_fetch_http_ms_count 2' in lines
+
+
+def test_profiler_writes_one_file(tmp_path):
+	profiler = CycleProfiler()
+	assert profiler.stop() is None
+	
+	profiler.start(tmp_path / 'cycle.prof')
+	with profiler.thread():
+		sum(range(1000))
+	path = profiler.stop()
+	
+	assert path == tmp_path / 'cycle.prof'
+	assert pstats.Stats(str(path)).total_calls > 0
+	assert not profiler.active
\ No newline at end of file
@@ -0,0 +1,58 @@
+import gzip
+import io
+
+from tracker.archive import GZIP, PageArchive
+from tracker.history import PriceHistory
+from tracker.reextract import extract_page, reextract
+from tracker.store import ProductStore, new_products, observation
+
+from conftest import PAGES
+
+
+def test_extract_page(tmp_path):
+	path = tmp_path / 'normal.html.gz'
+	path.write_bytes(gzip.compress(PAGES.joinpath('normal.html').read_bytes()))
+	
+	fields, error = extract_page((str(path), GZIP))
+	
+	assert error is None
+	assert fields['price'] == 899999.0
+
+
+def test_corrupt_page_is_reported(tmp_path):
+	body = gzip.compress(PAGES.joinpath('normal.html').read_bytes())
+	path = tmp_path / 'corrupt.html.gz'
+	# Cabecera gzip válida y datos rotos: zlib.error, que no es OSError ni ValueError
+	path.write_bytes(body[:10] + b'\xff' * 20 + body[30:])
+	
+	fields, error = extract_page((str(path), GZIP))
+	
+	assert fields is None
+	assert error.startswith('error: ')
+
+def test_unavailable_page_is_observed_without_price(tmp_path):
+	url = 'https://articulo.mercadolibre.com.ar/MLA-1'
+	store = ProductStore(tmp_path / 'products.db')
+	row = new_products([url]).iloc[0].to_dict()
+	store.upsert([{**row, 'current_price': 10.0, 'checked_at': 5000.0}])
+	store.close()
+	
+	history = PriceHistory(tmp_path / 'products.db')
+	# Una lectura de Selenium, sin página archivada, y la del ciclo siguiente
+	history.append([observation({**row, 'current_price': 9.0, 'checked_at': 1000.0})])
+	history.append([observation({**row, 'current_price': 10.0, 'checked_at': 5000.0})])
+	history.close()
+	
+	archive = PageArchive(tmp_path / 'pages', 1024 * 1024, GZIP)
+	archive.put(url, PAGES.joinpath('out_of_stock.html').read_bytes(), fetched_at=4999.0)
+	archive.close()
+	
+	assert reextract(tmp_path, workers=1, history=True, out=io.StringIO()) == 0
+	
+	history = PriceHistory(tmp_path / 'products.db')
+	series = [(run['first_seen'], run['last_seen'], run['price'], run['available']) for run in history.series(url)]
+	stats = history.stats(url)
+	history.close()
+	# Sin stock no hay precio, ni siquiera el último que tenía guardado el producto
+	assert series == [(1000, 1000, 9.0, 1), (4999, 4999, None, 0)]
+	assert stats == {'min': 9.0, 'max': 9.0, 'mean': 9.0, 'count': 1}
\ No newline at end of file
@@ -0,0 +1,107 @@
+import pytest
+
+from tracker.scheduler import Scheduler
+
+URLS = [f'https://articulo.mercadolibre.com.ar/MLA-{i}' for i in range(4)]
+
+
+def test_new_urls_are_due_right_away():
+	scheduler = Scheduler(60)
+	scheduler.sync(URLS, 0)
+	
+	assert sorted(scheduler.due(0)) == URLS
+	# Sin resultado, vuelven a vencer un intervalo después
+	assert scheduler.due(0) == []
+	assert sorted(scheduler.due(60)) == URLS
+
+
+def test_due_in_order_of_due_time():
+	scheduler = Scheduler(60)
+	scheduler.sync(URLS, 0)
+	scheduler.due(0)
+	for offset, url in zip([30, 10, 20, 0], URLS):
+		scheduler.record(url, offset, observed=True, changed=True)
+	
+	assert scheduler.due(200) == [URLS[3], URLS[1], URLS[2], URLS[0]]
+
+
+def test_due_takes_what_falls_within_half_an_interval():
+	scheduler = Scheduler(60)
+	scheduler.sync(URLS[:2], 0)
+	scheduler.due(0)
+	scheduler.record(URLS[0], 0, observed=True, changed=True)
+	scheduler.record(URLS[1], 1, observed=True, changed=True)
+	
+	# Vencen en 60 y 61: un tick en 30 se lleva el primero por el margen de medio intervalo
+	assert scheduler.due(29) == []
+	assert scheduler.due(30) == [URLS[0]]
+	assert scheduler.due(31) == [URLS[1]]
+
+
+@pytest.mark.parametrize('checks, wait', [(1, 120), (2, 240), (3, 480), (4, 480), (10, 480)])
+def test_backoff_grows_up_to_max(checks, wait):
+	scheduler = Scheduler(60, max_backoff=8)
+	scheduler.sync(URLS[:1], 0)
+	now = 0
+	for _ in range(checks):
+		scheduler.due(now)
+		scheduler.record(URLS[0], now, observed=True)
+		due = scheduler._entries[URLS[0]].due
+		now = due
+	
+	assert due - scheduler._entries[URLS[0]].last_checked == wait
+
+
+@pytest.mark.parametrize('outcome', [{'changed': True}, {'hot': True}])
+def test_change_or_hot_resets_the_backoff(outcome):
+	scheduler = Scheduler(60, max_backoff=8)
+	scheduler.sync(URLS[:1], 0)
+	for now in (0, 120, 360):
+		scheduler.due(now)
+		scheduler.record(URLS[0], now, observed=True)
+	
+	scheduler.due(840)
+	scheduler.record(URLS[0], 840, observed=True, **outcome)
+	assert scheduler.due(870) == [URLS[0]]
+
+
+def test_failed_check_is_retried_next_interval_without_backoff():
+	scheduler = Scheduler(60, max_backoff=8)
+	scheduler.sync(URLS[:1], 0)
+	scheduler.due(0)
+	scheduler.record(URLS[0], 0, observed=True)
+	scheduler.due(120)
+	scheduler.record(URLS[0], 120, observed=False)
+	
+	assert scheduler.due(150) == [URLS[0]]
+	assert scheduler._entries[URLS[0]].multiplier == 2.0
+
+
+def test_sync_forgets_removed_urls():
+	scheduler = Scheduler(60)
+	scheduler.sync(URLS, 0)
+	scheduler.sync(URLS[:2], 0)
+	
+	assert len(scheduler) == 2
+	assert sorted(scheduler.due(0)) == URLS[:2]
+	# Un resultado tardío de una URL borrada no la vuelve a agendar
+	scheduler.record(URLS[3], 0, observed=True)
+	assert len(scheduler) == 2
+
+
+def test_stats():
+	scheduler = Scheduler(60)
+	scheduler.sync(URLS, 0)
+	scheduler.due(0)
+	for url in URLS:
+		scheduler.record(url, 0, observed=True)
+	
+	# Ninguno vence en este tick: son cuatro chequeos ahorrados
+	assert scheduler.due(60) == []
+	assert scheduler.stats.fetches_saved == 4
+	
+	assert len(scheduler.due(120)) == 4
+	scheduler.record(URLS[0], 120, observed=True, changed=True)
+	assert scheduler.stats.ticks == 3
+	assert scheduler.stats.changes == 1
+	assert scheduler.stats.mean_detection_latency == 120
\ No newline at end of file
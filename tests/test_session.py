@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from bench.fixtures import configure, serve
+from tracker.config import load_settings
+from tracker.daemon import Daemon
+from tracker.engine import FAILED, READ, UNCHANGED
+from tracker.scheduler import Scheduler
+from tracker.session import SKIPPED, TrackingSession, outcome
+from tracker.store import ProductStore, new_products
+
+
+def session(capacity: int = 10) -> TrackingSession:
+	return TrackingSession(60, 4, capacity, 5, 60, lambda message, level, notify: None)
+
+
+def test_begin_splits_products_and_listings():
+	tracking = session()
+	
+	assert tracking.begin(['a', 'b'], ['l'], now=0) == (['a', 'b'], ['l'])
+	# Nada vencido: lo que sigue en curso no se vuelve a encolar
+	assert tracking.begin(['a', 'b', 'c'], ['l'], now=1) == (['c'], [])
+	assert tracking.cycle.overruns == 1
+	
+	assert not tracking.finish('a')
+	assert not tracking.finish('l')
+	assert not tracking.finish('b')
+	assert tracking.finish('c')
+
+
+def test_saturated_cycle_is_deferred():
+	tracking = session(capacity=2)
+	tracking.begin(['a', 'b'], [], now=0)
+	
+	assert tracking.begin(['a', 'b', 'c'], [], now=1) is None
+	assert tracking.cycle.pending
+	assert tracking.stats()['deferred'] == 1
+
+
+def test_stop_cancels_the_fetches_in_flight():
+	tracking = session()
+	token = tracking.token
+	tracking.begin(['a'], [], now=0)
+	
+	tracking.stop()
+	assert token.cancelled
+	assert not tracking.token.cancelled
+	assert not tracking.cycle.running
+	assert tracking.track({'url': 'a'}, [], token, 10) == SKIPPED
+
+
+@pytest.mark.parametrize(
+	'status, row, previous, expected',
+	[
+		(READ, {'current_price': 90.0, 'available': True, 'with_discount': False}, (100.0, True), (True, True, False)),
+		(READ, {'current_price': 100.0, 'available': True, 'with_discount': True}, (100.0, True), (True, False, True)),
+		(READ, {'current_price': 100.0, 'available': True, 'with_discount': False}, (100.0, False), (True, True, True)),
+		(UNCHANGED, {'with_discount': True}, (None, None), (True, False, True)),
+		(FAILED, {}, (100.0, True), (False, False, False)),
+		(SKIPPED, {}, (100.0, True), (False, False, False)),
+	]
+)
+def test_outcome(status, row, previous, expected):
+	assert outcome(status, row, *previous) == expected
+
+
+def test_daemon_cycles_through_the_session(tmp_path):
+	configure(latency=0.0, jitter=0.0, change_rate=0.0, error_rate=0.0, maintenance_rate=0.0, etag=True)
+	server = serve()
+	store = ProductStore(tmp_path / 'products.db')
+	store.replace(new_products([f'http://127.0.0.1:{server.server_port}/MLA-{i}' for i in range(4)]))
+	store.close()
+	
+	daemon = Daemon(tmp_path, out=io.StringIO())
+	try:
+		first = daemon.run_cycle()
+		# Scheduler nuevo: todo vuelve a vencer
+		daemon.session.scheduler = Scheduler(1, 4)
+		second = daemon.run_cycle()
+	finally:
+		daemon.close()
+		server.shutdown()
+	
+	assert first[READ] == 4
+	# Las páginas no cambiaron: el segundo ciclo las lee con pedidos condicionales
+	assert second[UNCHANGED] == 4
+	assert not daemon.session.cycle.running
\ No newline at end of file
@@ -0,0 +1,153 @@
+import atexit
+import sqlite3
+
+from tracker.history import PriceHistory
+from tracker.store import ProductStore, WriteBehind, new_products
+
+URLS = [f'https://articulo.mercadolibre.com.ar/MLA-{i}' for i in range(3)]
+
+
+def product(url: str, price: float) -> dict:
+	row = new_products([url]).iloc[0].to_dict()
+	row['current_price'] = price
+	return row
+
+
+def test_snapshot_follows_the_own_writes(tmp_path):
+	store = ProductStore(tmp_path / 'products.db')
+	store.replace(new_products(URLS))
+	data = store.load()
+	
+	data.loc[0, 'current_price'] = 10.0
+	store.upsert([data.loc[0].to_dict()])
+	assert store.save_snapshot(data)
+	store.close()
+	
+	reopened = ProductStore(tmp_path / 'products.db')
+	snapshot = reopened.load_snapshot()
+	reopened.close()
+	assert snapshot is not None
+	assert snapshot.loc[0, 'current_price'] == 10.0
+
+
+def test_snapshot_is_not_saved_over_another_process_writes(tmp_path):
+	gui = ProductStore(tmp_path / 'products.db')
+	gui.replace(new_products(URLS))
+	data = gui.load()
+	
+	# El daemon, reextract o un worker de la cola escriben la misma base
+	daemon = ProductStore(tmp_path / 'products.db')
+	daemon.upsert([product(URLS[0], 20.0)])
+	daemon.close()
+	
+	gui.upsert([data.loc[1].to_dict()])
+	assert not gui.save_snapshot(data)
+	gui.close()
+	
+	reopened = ProductStore(tmp_path / 'products.db')
+	assert reopened.load_snapshot() is None
+	assert reopened.load().loc[0, 'current_price'] == 20.0
+	reopened.close()
+
+
+def test_replace_makes_the_snapshot_current_again(tmp_path):
+	gui = ProductStore(tmp_path / 'products.db')
+	gui.replace(new_products(URLS))
+	data = gui.load()
+	
+	daemon = ProductStore(tmp_path / 'products.db')
+	daemon.upsert([product(URLS[0], 20.0)])
+	daemon.close()
+	
+	# Guardar toda la tabla la deja igual a la copia en memoria
+	gui.replace(data)
+	assert gui.save_snapshot(data)
+	gui.close()
+
+def test_upsert_replace_and_rows(tmp_path):
+	store = ProductStore(tmp_path / 'products.db')
+	store.replace(new_products(URLS))
+	store.upsert([product(URLS[0], 10.0), product('https://articulo.mercadolibre.com.ar/MLA-9', 5.0)])
+	
+	assert len(store) == 4
+	assert [row['current_price'] for row in store.rows([URLS[0]])] == [10.0]
+	assert store.rows([URLS[1]])[0]['available'] is True
+	
+	# replace deja la tabla igual al DataFrame, sin las filas que ya no están
+	store.replace(new_products(URLS[:1]))
+	assert [row['url'] for row in store.rows()] == URLS[:1]
+	store.close()
+
+
+def test_delete(tmp_path):
+	store = ProductStore(tmp_path / 'products.db')
+	store.replace(new_products(URLS))
+	generation = store.generation
+	
+	store.delete([URLS[1], 'https://articulo.mercadolibre.com.ar/MLA-9'])
+	
+	assert sorted(row['url'] for row in store.rows()) == [URLS[0], URLS[2]]
+	assert store.generation == generation + 1
+	store.close()
+
+
+def test_write_behind_keeps_the_last_row_per_url(tmp_path):
+	store = ProductStore(tmp_path / 'products.db')
+	history = PriceHistory(tmp_path / 'products.db')
+	writer = WriteBehind(store, history, batch_size=100, flush_interval=60)
+	writer.start()
+	
+	row = product(URLS[0], 10.0)
+	writer.put({**row, 'checked_at': 100.0}, True)
+	writer.put({**row, 'current_price': 12.0, 'checked_at': 200.0}, True)
+	writer.put(product(URLS[1], 5.0))
+	# flush no vuelve hasta que todo está escrito, aunque el plazo no haya vencido
+	writer.flush()
+	
+	assert {row['url']: row['current_price'] for row in store.rows()} == {URLS[0]: 12.0, URLS[1]: 5.0}
+	assert [run['price'] for run in history.series(URLS[0])] == [10.0, 12.0]
+	writer.stop()
+	atexit.unregister(writer.flush)
+	store.close()
+	history.close()
+
+
+def test_write_behind_retries_a_failed_batch(tmp_path, monkeypatch):
+	store = ProductStore(tmp_path / 'products.db')
+	history = PriceHistory(tmp_path / 'products.db')
+	logs = []
+	writer = WriteBehind(
+		store, history, batch_size=100, flush_interval=60, log=lambda message, level, notify: logs.append(level)
+	)
+	writer.start()
+	
+	upsert = store.upsert
+	
+	def locked(rows):
+		monkeypatch.setattr(store, 'upsert', upsert)
+		raise sqlite3.OperationalError('database is locked')
+	
+	monkeypatch.setattr(store, 'upsert', locked)
+	writer.put(product(URLS[0], 10.0))
+	writer.flush()
+	assert logs == ['error']
+	assert store.rows() == []
+	
+	# El lote no se pierde: sale con el flush siguiente
+	writer.flush()
+	assert [row['current_price'] for row in store.rows()] == [10.0]
+	writer.stop()
+	atexit.unregister(writer.flush)
+	store.close()
+	history.close()
+
+def test_remove_urls_deletes_only_those_rows(make_tracker):
+	tracker = make_tracker(URLS)
+	replaced = []
+	tracker.store.replace = replaced.append
+	
+	tracker.remove_urls([URLS[1]])
+	
+	assert replaced == []
+	assert tracker.data['url'].tolist() == [URLS[0], URLS[2]]
+	assert sorted(row['url'] for row in tracker.store.rows()) == [URLS[0], URLS[2]]
\ No newline at end of file
@@ -0,0 +1,84 @@
+from pandas import Series
+
+from tracker.urls import canonicalize, item_ids, plan_import, split_urls
+
+ITEM = 'https://articulo.mercadolibre.com.ar/MLA-1400000001'
+CATALOG = 'https://www.mercadolibre.com.ar/celular-samsung-galaxy-a15/p/MLA29351372'
+
+
+def canonical(*urls: str) -> list[str]:
+	return canonicalize(Series(list(urls), dtype=object))['url'].tolist()
+
+
+def test_item_pages_map_to_one_url():
+	assert canonical(
+		'https://articulo.mercadolibre.com.ar/MLA-1400000001-auriculares-bluetooth-_JM',
+		'https://articulo.mercadolibre.com.ar/MLA-1400000001-auriculares-bluetooth-_JM#polycard_client=search-nordic',
+		'https://articulo.mercadolibre.com.ar/MLA1400000001?searchVariation=123',
+		' https://www.mercadolibre.com.ar/MLA-1400000001/ ',
+	) == [ITEM] * 4
+
+
+def test_catalog_pages_keep_their_query():
+	variant = f'{CATALOG}?pdp_filters=item_id:MLA1400000002'
+	assert canonical(variant, f'{variant}#reviews', f'{CATALOG}/', f'{CATALOG}?pdp_filters=item_id:MLA1400000003') == [
+		variant,
+		variant,
+		CATALOG,
+		f'{CATALOG}?pdp_filters=item_id:MLA1400000003',
+	]
+	assert item_ids(Series([variant, ITEM])).tolist()[1] == 'MLA1400000001'
+
+
+def test_listings_lose_their_query():
+	assert canonical('https://listado.mercadolibre.com.ar/auriculares?sb=all_mercadolibre#D[A:auriculares]') == [
+		'https://listado.mercadolibre.com.ar/auriculares'
+	]
+
+
+def test_validity():
+	urls = Series([ITEM, 'http://articulo.mercadolibre.com.ar/MLA-1', 'https://example.com/MLA-1', 'MLA-1'])
+	assert canonicalize(urls)['valid'].tolist() == [True, False, False, False]
+
+
+def test_plan_import():
+	text = f'''
+		{ITEM}-auriculares-_JM, {ITEM}#otra
+		https://articulo.mercadolibre.com.ar/MLA-1400000002; no-es-una-url
+		https://articulo.mercadolibre.com.ar/MLA-1400000009-ya-trackeado-_JM
+		{CATALOG}?pdp_filters=item_id:MLA1400000002
+	'''
+	tracked = Series(['https://articulo.mercadolibre.com.ar/MLA-1400000009-viejo-_JM'], dtype=object)
+	
+	plan = plan_import(split_urls(text), tracked)
+	
+	assert plan.urls == [
+		ITEM,
+		'https://articulo.mercadolibre.com.ar/MLA-1400000002',
+		f'{CATALOG}?pdp_filters=item_id:MLA1400000002',
+	]
+	assert plan.invalid == 1
+	# La segunda variante de ITEM y la que ya se trackeaba
+	assert plan.duplicates == 2
+
+
+def test_plan_import_of_nothing():
+	plan = plan_import([], Series([], dtype=object))
+	assert (plan.urls, plan.invalid, plan.duplicates) == ([], 0, 0)
+
+
+def test_add_urls_reports_progress_outside_the_store_lock(make_tracker):
+	tracker = make_tracker()
+	urls = [f'https://articulo.mercadolibre.com.ar/MLA-{1400000000 + i}' for i in range(25)]
+	reports = []
+	
+	def progress(done: int, total: int):
+		# Acá la interfaz procesa eventos: el store no puede estar en medio de una transacción
+		assert not tracker.store._lock.locked()
+		reports.append((done, total, len(tracker.store)))
+	
+	plan = tracker.add_urls(urls, progress, chunk_size=10)
+	
+	assert plan.urls == urls
+	assert reports == [(10, 25, 10), (20, 25, 20), (25, 25, 25)]
+	assert tracker.data['url'].tolist() == urls
\ No newline at end of file
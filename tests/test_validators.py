@@ -0,0 +1,98 @@
+from tracker.breaker import CircuitBreaker
+from tracker.cancel import CancelToken, Deadline
+from tracker.engine import READ, UNCHANGED, track_product
+from tracker.fetchers import Fetcher
+from tracker.store import COLUMNS, NEW_PRODUCT, ProductStore
+from tracker.validators import conditional_headers
+
+
+class StubFetcher(Fetcher):
+	"""Answers with a fixed price, or with a 304 when asked conditionally and `etag` matches."""
+	
+	name = 'stub'
+	
+	def __init__(self, price: float, etag: str):
+		self.price = price
+		self.etag = etag
+		self.requests: list[dict] = []
+	
+	def fetch(self, url, deadline, headers=None):
+		self.requests.append(headers or {})
+		if headers and headers.get('If-None-Match') == self.etag:
+			return {'timings': {}, 'bytes': 0, 'time_to_price': 0.0, 'not_modified': True}
+		return {
+			'product': 'Producto',
+			'available': True,
+			'free_ship': False,
+			'currency': '$',
+			'price': self.price,
+			'with_discount': False,
+			'timings': {},
+			'bytes': 0,
+			'time_to_price': 0.0,
+			'etag': self.etag,
+			'last_modified': None,
+			'not_modified': False
+		}
+
+
+def track(row: dict, fetcher: Fetcher, conditional: bool = True) -> str:
+	return track_product(
+		row,
+		[fetcher],
+		CircuitBreaker(5, 60),
+		Deadline(10, CancelToken()),
+		lambda message, level, notify: None,
+		conditional
+	)
+
+
+def stored_row(store: ProductStore, url: str) -> dict:
+	return store.rows([url])[0]
+
+
+def test_unchanged_page_leaves_row_alone(tmp_path):
+	store = ProductStore(tmp_path / 'products.db')
+	url = 'http://127.0.0.1/MLA-1'
+	store.upsert([{column: None for column in COLUMNS} | NEW_PRODUCT | {'url': url}])
+	
+	row = stored_row(store, url)
+	assert conditional_headers(row) == {}
+	assert track(row, StubFetcher(100.0, '"a"')) == READ
+	store.upsert([row])
+	
+	row = stored_row(store, url)
+	assert conditional_headers(row) == {'If-None-Match': '"a"'}
+	assert track(row, StubFetcher(100.0, '"b"')) == UNCHANGED
+	assert track(row, StubFetcher(100.0, '"a"')) == UNCHANGED
+
+
+def test_stale_worker_compares_against_stored_row(tmp_path):
+	url = 'http://127.0.0.1/MLA-1'
+	first = ProductStore(tmp_path / 'products.db')
+	first.upsert([{column: None for column in COLUMNS} | NEW_PRODUCT | {'url': url}])
+	second = ProductStore(tmp_path / 'products.db')
+	
+	# B lee 100 y lo guarda; A lee 120 y lo guarda
+	row = stored_row(second, url)
+	track(row, StubFetcher(100.0, '"100"'))
+	second.upsert([row])
+	row = stored_row(first, url)
+	track(row, StubFetcher(120.0, '"120"'))
+	first.upsert([row])
+	
+	# El precio vuelve a 100: B no puede darlo por igual a lo que vio él
+	fetcher = StubFetcher(100.0, '"100"')
+	row = stored_row(second, url)
+	assert track(row, fetcher) == READ
+	assert fetcher.requests == [{'If-None-Match': '"120"'}]
+	second.upsert([row])
+	assert stored_row(first, url)['current_price'] == 100.0
+
+
+def test_unconditional_always_reads(tmp_path):
+	row = {column: None for column in COLUMNS} | NEW_PRODUCT | {'url': 'http://127.0.0.1/MLA-1'}
+	fetcher = StubFetcher(100.0, '"a"')
+	assert track(row, fetcher, conditional=False) == READ
+	assert track(row, fetcher, conditional=False) == READ
+	assert fetcher.requests == [{}, {}]
\ No newline at end of file
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from bench.fixtures import configure, serve
+from tracker.config import load_settings
+from tracker.store import ProductStore, new_products
+from tracker.worker import QueueWorker
+from tracker.workqueue import PRODUCT, WorkQueue
+
+URL = 'http://127.0.0.1/MLA-1'
+
+
+def test_expired_leases_park_the_url(tmp_path):
+	queue = WorkQueue(tmp_path / 'queue.db', lease=10, interval=100, max_backoff=4, max_attempts=2)
+	queue.sync([URL], [], now=0)
+	
+	# Dos workers se caen con la URL tomada
+	assert queue.claim('a', 10, now=0) == ([(URL, PRODUCT)], 0, [])
+	assert queue.claim('b', 10, now=11) == ([(URL, PRODUCT)], 1, [])
+	assert queue.claim('c', 10, now=22) == ([], 0, [URL])
+	
+	# Queda libre y pospuesta max_backoff intervalos
+	assert queue.claim('c', 10, now=23) == ([], 0, [])
+	assert queue.claim('c', 10, now=22 + 400) == ([(URL, PRODUCT)], 0, [])
+
+
+def test_release_and_complete_do_not_count_as_attempts(tmp_path):
+	queue = WorkQueue(tmp_path / 'queue.db', lease=10, interval=100, max_attempts=1)
+	queue.sync([URL], [], now=0)
+	
+	queue.claim('a', 10, now=0)
+	queue.release('a')
+	queue.claim('b', 10, now=1)
+	assert queue.complete('b', URL, True, now=2)
+	
+	assert queue.claim('c', 10, now=300) == ([(URL, PRODUCT)], 0, [])
+
+
+@pytest.fixture
+def worker(tmp_path):
+	configure(latency=0.0, jitter=0, error_rate=0.0, maintenance_rate=0.0, reset_rate=0.0, etag=False)
+	server = serve()
+	store = ProductStore(tmp_path / 'products.db')
+	store.replace(new_products([f'http://127.0.0.1:{server.server_port}/MLA-{i}' for i in range(4)]))
+	store.close()
+	settings = load_settings(str(tmp_path / 'settings.ini'))
+	settings.set('GENERAL', 'queue_batch', 10)
+	
+	worker = QueueWorker(tmp_path, out=io.StringIO())
+	yield worker
+	worker.close()
+	server.shutdown()
+
+
+def test_leases_complete_after_the_batch_is_stored(worker, monkeypatch):
+	def fail(rows, *args, **kwargs):
+		raise OSError('disco lleno')
+	
+	monkeypatch.setattr(worker.store, 'upsert', fail)
+	with pytest.raises(OSError):
+		worker.run_cycle()
+	
+	# Nada se completó: las URLs siguen tomadas y vuelven a estar disponibles al vencer el lease
+	stats = worker.queue.stats()
+	assert stats['leased'] == 4
+	assert worker.queue.stats(now=worker.queue.lease + 10 ** 10)['due'] == 4
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+ML Tracker without the GUI, for cron or systemd:
+	
+	python -m tracker run --once
+	python -m tracker run --loop
+	python -m tracker run --once --profile cycle.prof
+	python -m tracker worker --loop --shared
+	python -m tracker reextract --history
+
+Exit codes: 0 ok, 1 some products could not be read, 2 usage error,
+3 MercadoLibre is in maintenance.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog='python -m tracker', description='ML Tracker sin interfaz gráfica.')
+	commands = parser.add_subparsers(dest='command', required=True)
+	
+	run = commands.add_parser('run', help='trackear los productos guardados')
+	mode = run.add_mutually_exclusive_group(required=True)
+	mode.add_argument('--once', action='store_true', help='un solo ciclo y salir')
+	mode.add_argument('--loop', action='store_true', help='un ciclo por intervalo hasta recibir SIGTERM')
+	run.add_argument('--dir', type=Path, default=Path('.'), help='carpeta de products.db y settings.ini')
+	run.add_argument('--browser', action='store_true', help='usar Chrome cuando HTTP no alcanza')
+	run.add_argument('--profile', type=Path, help='guardar el cProfile del primer ciclo en este archivo')
+	
+	worker = commands.add_parser(
+		'worker', help='trackear tomando URLs de la cola compartida queue.db, junto con otros workers'
+	)
+	worker_mode = worker.add_mutually_exclusive_group(required=True)
+	worker_mode.add_argument('--once', action='store_true', help='vaciar lo vencido de la cola y salir')
+	worker_mode.add_argument('--loop', action='store_true', help='seguir tomando URLs hasta recibir SIGTERM')
+	worker.add_argument('--dir', type=Path, default=Path('.'), help='carpeta de products.db y queue.db')
+	worker.add_argument('--browser', action='store_true', help='usar Chrome cuando HTTP no alcanza')
+	worker.add_argument(
+		'--shared', action='store_true', help='la carpeta la comparten varios hosts: sin WAL'
+	)
+	worker.add_argument('--profile', type=Path, help='guardar el cProfile del primer ciclo en este archivo')
+	
+	reextract = commands.add_parser(
+		'reextract', help='volver a extraer los productos de las páginas archivadas, sin red'
+	)
+	reextract.add_argument('--dir', type=Path, default=Path('.'), help='carpeta de products.db y pages/')
+	reextract.add_argument('--since', type=float, help='solo páginas descargadas desde este epoch')
+	reextract.add_argument('--workers', type=int, help='procesos (por defecto, uno por CPU)')
+	reextract.add_argument('--history', action='store_true', help='reconstruir también el historial de precios')
+	
+	args = parser.parse_args(argv)
+	
+	# Importado acá para que --help no cargue nada más
+	if args.command == 'reextract':
+		from tracker.reextract import reextract as run_reextract
+		
+		return run_reextract(args.dir, args.workers, args.since, args.history)
+	
+	if args.command == 'worker':
+		from tracker.worker import QueueWorker
+		
+		return QueueWorker(args.dir, args.browser, args.shared, profile=args.profile).run(loop=args.loop)
+	
+	from tracker.daemon import Daemon
+	
+	return Daemon(args.dir, args.browser, profile=args.profile).run(loop=args.loop)
+
+
+if __name__ == '__main__':
+	sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,103 @@
+import json
+from time import perf_counter
+from typing import Optional
+from urllib.parse import quote
+
+from tracker.cancel import Deadline
+from tracker.fetchers import FetchError, MaintenanceError
+from tracker.http import HttpClient
+
+DEFAULT_API_URL = 'https://api.mercadolibre.com'
+MULTIGET_LIMIT = 20
+ITEM_ATTRIBUTES = 'id,title,price,original_price,currency_id,status,available_quantity,shipping'
+
+# Mismo símbolo que muestra la página, que es lo que se guarda en `currency`
+CURRENCY_SYMBOLS = {
+	'ARS': '$',
+	'USD': 'US$',
+	'BRL': 'R$',
+	'MXN': '$',
+	'CLP': '$',
+	'COP': '$',
+	'UYU': '$',
+	'PEN': 'S/',
+	'VES': 'Bs.',
+	'BOB': 'Bs',
+	'PYG': '₲',
+	'CRC': '₡',
+	'GTQ': 'Q',
+	'DOP': 'RD$',
+}
+
+
+def item_to_fields(body: dict, transferred: int, started: float) -> dict:
+	"""Map one items-API body to the fields a Fetcher returns."""
+	price = body.get('price')
+	original = body.get('original_price')
+	currency = body.get('currency_id')
+	
+	return {
+		'product': body.get('title'),
+		'available': body.get('status') == 'active' and (body.get('available_quantity') or 0) > 0,
+		'free_ship': bool((body.get('shipping') or {}).get('free_shipping')),
+		'currency': CURRENCY_SYMBOLS.get(currency, currency),
+		'price': float(price) if price is not None else None,
+		'with_discount': original is not None and price is not None and original > price,
+		'timings': {},
+		'bytes': transferred,
+		'time_to_price': (perf_counter() - started) * 1000
+	}
+
+
+class ItemsClient:
+	"""
+	Reads items through the JSON multiget endpoint, `MULTIGET_LIMIT` ids per
+	request. `base_url` points at the real API or at a local mock.
+	"""
+	
+	def __init__(self, http: HttpClient, base_url: str = DEFAULT_API_URL, token: str = ''):
+		self.http = http
+		self.base_url = base_url.rstrip('/')
+		self.token = token
+	
+	def get_items(self, ids: list[str], deadline: Deadline) -> dict[str, dict]:
+		"""Fields of every id the API resolved; missing ids were not found or failed."""
+		found = {}
+		for start in range(0, len(ids), MULTIGET_LIMIT):
+			found.update(self._multiget(ids[start:start + MULTIGET_LIMIT], deadline))
+		return found
+	
+	def _multiget(self, ids: list[str], deadline: Deadline) -> dict[str, dict]:
+		url = (
+			f'{self.base_url}/items?ids={quote(",".join(ids), safe=",")}'
+			f'&attributes={ITEM_ATTRIBUTES}'
+		)
+		headers = {'Accept': 'application/json'}
+		if self.token:
+			headers['Authorization'] = f'Bearer {self.token}'
+		
+		started = perf_counter()
+		try:
+			response = self.http.get(url, headers=headers, timeout=deadline.remaining())
+		except Exception as e:
+			deadline.remaining()
+			raise FetchError(e) from e
+		
+		if response.status >= 500:
+			raise MaintenanceError(f'HTTP {response.status}')
+		if response.status != 200:
+			raise FetchError(f'HTTP {response.status}')
+		
+		try:
+			results = json.loads(response.body)
+		except ValueError as e:
+			raise FetchError(e) from e
+		
+		# El costo del pedido se reparte entre los ítems del lote
+		share = len(response.body) // max(len(ids), 1)
+		found = {}
+		for result in results:
+			body: Optional[dict] = result.get('body')
+			if result.get('code') == 200 and body and body.get('id'):
+				found[body['id']] = item_to_fields(body, share, started)
+		return found
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Raw product pages as they were downloaded, so a markup change or a newly
+tracked field can be re-extracted later without touching the network.
+"""
+import gzip
+import hashlib
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Optional
+
+GZIP = 'gzip'
+ZSTD = 'zstd'
+EXTENSIONS = {GZIP: '.html.gz', ZSTD: '.html.zst'}
+
+
+def available_codec(preferred: str) -> str:
+	"""zstd needs the optional `zstandard` package; gzip always works."""
+	if preferred == ZSTD:
+		try:
+			import zstandard  # noqa: F401
+		except ImportError:
+			return GZIP
+		return ZSTD
+	return GZIP
+
+
+def compress(body: bytes, codec: str) -> bytes:
+	if codec == ZSTD:
+		import zstandard
+		
+		return zstandard.ZstdCompressor(level=10).compress(body)
+	return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+	if codec == ZSTD:
+		import zstandard
+		
+		return zstandard.ZstdDecompressor().decompress(data)
+	return gzip.decompress(data)
+
+
+def read_blob(path: Path, codec: str) -> bytes:
+	return decompress(path.read_bytes(), codec)
+
+
+class PageArchive:
+	"""
+	Content-addressed store under `root`: each distinct body is written once,
+	compressed, as `objects/<2 hex>/<sha256><ext>`, and `index.db` records
+	which URL returned which body and when. Once the compressed total passes
+	`max_bytes`, the bodies not seen for the longest time are evicted along
+	with their index rows.
+	"""
+	
+	def __init__(self, root: Path, max_bytes: int, codec: str = ZSTD):
+		self.root = root
+		self.max_bytes = max_bytes
+		self.codec = available_codec(codec)
+		self._lock = Lock()
+		
+		root.joinpath('objects').mkdir(parents=True, exist_ok=True)
+		self._conn = sqlite3.connect(root.joinpath('index.db'), check_same_thread=False, isolation_level=None)
+		self._conn.execute('PRAGMA journal_mode=WAL')
+		self._conn.execute('PRAGMA synchronous=NORMAL')
+		self._conn.executescript(
+			"""
+			CREATE TABLE IF NOT EXISTS blobs (
+				hash TEXT PRIMARY KEY,
+				codec TEXT NOT NULL,
+				size INTEGER NOT NULL,
+				stored INTEGER NOT NULL,
+				last_seen REAL NOT NULL
+			);
+			CREATE INDEX IF NOT EXISTS blobs_last_seen ON blobs (last_seen);
+			CREATE TABLE IF NOT EXISTS pages (
+				url TEXT NOT NULL,
+				fetched_at REAL NOT NULL,
+				hash TEXT NOT NULL,
+				PRIMARY KEY (url, fetched_at)
+			);
+			CREATE INDEX IF NOT EXISTS pages_hash ON pages (hash);
+			"""
+		)
+		self._stored = self._conn.execute('SELECT coalesce(sum(stored), 0) FROM blobs').fetchone()[0]
+	
+	@property
+	def stored_bytes(self) -> int:
+		return self._stored
+	
+	def put(self, url: str, body: bytes, fetched_at: Optional[float] = None) -> str:
+		"""Archive one downloaded body; returns its hash."""
+		fetched_at = time() if fetched_at is None else fetched_at
+		digest = hashlib.sha256(body).hexdigest()
+		
+		with self._lock:
+			known = self._conn.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone()
+			if known is None:
+				data = compress(body, self.codec)
+				path = self.path(digest, self.codec)
+				path.parent.mkdir(exist_ok=True)
+				temporary = path.with_suffix('.tmp')
+				temporary.write_bytes(data)
+				temporary.replace(path)
+				self._conn.execute(
+					'INSERT INTO blobs (hash, codec, size, stored, last_seen) VALUES (?, ?, ?, ?, ?)',
+					(digest, self.codec, len(body), len(data), fetched_at)
+				)
+				self._stored += len(data)
+			else:
+				self._conn.execute(
+					'UPDATE blobs SET last_seen = max(last_seen, ?) WHERE hash = ?', (fetched_at, digest)
+				)
+			
+			self._conn.execute(
+				'INSERT OR REPLACE INTO pages (url, fetched_at, hash) VALUES (?, ?, ?)',
+				(url, fetched_at, digest)
+			)
+			
+			if self._stored > self.max_bytes:
+				self._evict()
+		
+		return digest
+	
+	def path(self, digest: str, codec: str) -> Path:
+		return self.root.joinpath('objects', digest[:2], digest + EXTENSIONS[codec])
+	
+	def read(self, digest: str) -> bytes:
+		with self._lock:
+			row = self._conn.execute('SELECT codec FROM blobs WHERE hash = ?', (digest,)).fetchone()
+		if row is None:
+			raise KeyError(digest)
+		return read_blob(self.path(digest, row[0]), row[0])
+	
+	def pages(self, since: Optional[float] = None) -> list[tuple[str, float, str, str]]:
+		"""`(url, fetched_at, hash, codec)` of every archived page, oldest first."""
+		with self._lock:
+			return self._conn.execute(
+				"""
+				SELECT p.url, p.fetched_at, p.hash, b.codec
+				FROM pages p JOIN blobs b ON b.hash = p.hash
+				WHERE p.fetched_at >= ?
+				ORDER BY p.fetched_at
+				""",
+				(since or 0,)
+			).fetchall()
+	
+	def stats(self) -> dict:
+		with self._lock:
+			blobs, size, stored = self._conn.execute(
+				'SELECT count(*), coalesce(sum(size), 0), coalesce(sum(stored), 0) FROM blobs'
+			).fetchone()
+			pages = self._conn.execute('SELECT count(*) FROM pages').fetchone()[0]
+		return {'pages': pages, 'blobs': blobs, 'bytes': size, 'stored_bytes': stored}
+	
+	def close(self):
+		with self._lock:
+			self._conn.close()
+	
+	def _evict(self):
+		# Se baja al 90% del límite para no desalojar en cada put una vez lleno
+		target = self.max_bytes * 0.9
+		evicted = []
+		oldest = self._conn.execute('SELECT hash, codec, stored FROM blobs ORDER BY last_seen').fetchall()
+		for digest, codec, stored in oldest:
+			if self._stored <= target:
+				break
+			evicted.append(digest)
+			self.path(digest, codec).unlink(missing_ok=True)
+			self._stored -= stored
+		
+		self._conn.execute('BEGIN')
+		self._conn.executemany('DELETE FROM pages WHERE hash = ?', [(digest,) for digest in evicted])
+		self._conn.executemany('DELETE FROM blobs WHERE hash = ?', [(digest,) for digest in evicted])
+		self._conn.execute('COMMIT')
\ No newline at end of file
@@ -0,0 +1,355 @@
+import asyncio
+import ssl
+from concurrent.futures import Future
+from random import uniform
+from threading import Lock, Thread
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Callable, Optional
+from urllib.parse import urljoin, urlsplit
+
+from tracker.breaker import Breakers, site_key
+from tracker.cancel import CancelToken, Cancelled, Deadline
+from tracker.engine import MAINTENANCE_MESSAGE, RECOVERED_MESSAGE, apply_fields, observe_fetch
+from tracker.extraction import PRODUCT_SPEC, extract
+from tracker.fetchers import NOT_MODIFIED, FetchError, MaintenanceError, build_product, not_modified
+from tracker.http import DEFAULT_HEADERS, REDIRECT_CODES, Response, decode_body
+from tracker.metrics import metrics
+from tracker.parser import parse_html
+from tracker.records import ProductResult
+from tracker.signals import Signals
+from tracker.validators import conditional_headers, unchanged
+
+if TYPE_CHECKING:
+	from tracker.archive import PageArchive
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+	
+	def __init__(self, rate: float, burst: int):
+		self.rate = rate
+		self.capacity = burst
+		self.tokens = float(burst)
+		self.updated = monotonic()
+		self._lock = asyncio.Lock()
+	
+	async def acquire(self):
+		async with self._lock:
+			while True:
+				now = monotonic()
+				self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+				self.updated = now
+				if self.tokens >= 1:
+					self.tokens -= 1
+					return
+				await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncHttpClient:
+	"""HTTP/1.1 over asyncio streams, with idle keep-alive connections kept per host."""
+	
+	def __init__(self, max_per_host: int = 16, max_redirects: int = 5):
+		self.max_per_host = max_per_host
+		self.max_redirects = max_redirects
+		
+		self._idle: dict[tuple[str, str, int], list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+		self._limits: dict[tuple[str, str, int], asyncio.Semaphore] = {}
+		self._ssl = ssl.create_default_context()
+	
+	async def get(self, url: str, timeout: float, headers: dict[str, str] | None = None) -> Response:
+		for _ in range(self.max_redirects + 1):
+			response = await asyncio.wait_for(self._request(url, headers or {}), timeout)
+			location = response.headers.get('location')
+			if response.status not in REDIRECT_CODES or not location:
+				return response
+			url = urljoin(url, location)
+		
+		raise FetchError(f'Too many redirects: {url}')
+	
+	def close(self):
+		for connections in self._idle.values():
+			for _, writer in connections:
+				writer.close()
+		self._idle.clear()
+	
+	async def _request(self, url: str, request_headers: dict[str, str]) -> Response:
+		parts = urlsplit(url)
+		https = parts.scheme == 'https'
+		key = (parts.scheme, parts.hostname, parts.port or (443 if https else 80))
+		path = parts.path or '/'
+		if parts.query:
+			path += '?' + parts.query
+		
+		limit = self._limits.setdefault(key, asyncio.Semaphore(self.max_per_host))
+		async with limit:
+			idle = self._idle.setdefault(key, [])
+			reused = bool(idle)
+			reader, writer = idle.pop() if idle else await self._connect(key)
+			pooled = False
+			
+			try:
+				try:
+					status, headers, body, keep_alive = await self._exchange(
+						reader, writer, parts.netloc, path, request_headers
+					)
+				except (OSError, asyncio.IncompleteReadError, ValueError):
+					writer.close()
+					if not reused:
+						raise
+					# La conexión reutilizada pudo haber sido cerrada por el servidor
+					reader, writer = await self._connect(key)
+					status, headers, body, keep_alive = await self._exchange(
+						reader, writer, parts.netloc, path, request_headers
+					)
+				
+				if keep_alive and len(idle) < self.max_per_host:
+					idle.append((reader, writer))
+					pooled = True
+			finally:
+				# También ante CancelledError, cuando wait_for corta el pedido a mitad de respuesta
+				if not pooled:
+					writer.close()
+		
+		return Response(url, status, headers, decode_body(body, headers.get('content-encoding', '')))
+	
+	async def _connect(self, key: tuple[str, str, int]):
+		scheme, host, port = key
+		return await asyncio.open_connection(
+			host, port, ssl=self._ssl if scheme == 'https' else None
+		)
+	
+	@staticmethod
+	async def _exchange(
+		reader: asyncio.StreamReader,
+		writer: asyncio.StreamWriter,
+		host: str,
+		path: str,
+		request_headers: dict[str, str]
+	) -> tuple[int, dict[str, str], bytes, bool]:
+		lines = [f'GET {path} HTTP/1.1', f'Host: {host}']
+		lines.extend(f'{name}: {value}' for name, value in {**DEFAULT_HEADERS, **request_headers}.items())
+		writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+		await writer.drain()
+		
+		status_line = await reader.readline()
+		if not status_line:
+			raise ConnectionResetError('Connection closed by the server')
+		version, status, *_ = status_line.decode('latin-1').split(' ', 2)
+		status = int(status)
+		
+		headers = {}
+		while True:
+			line = await reader.readline()
+			if line in {b'\r\n', b'\n', b''}:
+				break
+			name, _, value = line.decode('latin-1').partition(':')
+			headers[name.strip().lower()] = value.strip()
+		
+		keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+		
+		if 'chunked' in headers.get('transfer-encoding', '').lower():
+			chunks = []
+			while True:
+				size = int((await reader.readline()).split(b';')[0], 16)
+				if size == 0:
+					while (await reader.readline()) not in {b'\r\n', b'\n', b''}:
+						pass
+					break
+				chunks.append(await reader.readexactly(size))
+				await reader.readexactly(2)
+			body = b''.join(chunks)
+		elif 'content-length' in headers:
+			body = await reader.readexactly(int(headers['content-length']))
+		elif status in {204, 304}:
+			body = b''
+		else:
+			body = await reader.read()
+			keep_alive = False
+		
+		return status, headers, body, keep_alive
+
+
+class AsyncFetchEngine:
+	"""
+	Fetches product pages on an asyncio event loop running in its own thread,
+	so hundreds of requests can be in flight without one OS thread each.
+	Requests are rate limited per MercadoLibre site with a token bucket and
+	retried with jittered exponential backoff. Results reach TrackerWorker
+	through the same `thread_finished` signal the runnables use; pages that
+	cannot be read are handed to `fallback`. With `conditional`, requests
+	carry the validators stored in each row and unchanged products come back
+	flagged, untouched.
+	"""
+	
+	def __init__(
+		self,
+		signals: Signals,
+		breakers: Breakers,
+		max_in_flight: int = 200,
+		requests_per_second: float = 5.0,
+		burst: int = 10,
+		retries: int = 3,
+		backoff: float = 0.5,
+		archive: Optional['PageArchive'] = None,
+		conditional: bool = True
+	):
+		self.signals = signals
+		self.breakers = breakers
+		self.archive = archive
+		self.conditional = conditional
+		self.requests_per_second = requests_per_second
+		self.burst = burst
+		self.retries = retries
+		self.backoff = backoff
+		
+		self.client = AsyncHttpClient(max_in_flight)
+		self._slots = asyncio.Semaphore(max_in_flight)
+		self._buckets: dict[str, TokenBucket] = {}
+		self._futures: set[Future] = set()
+		self._lock = Lock()
+		
+		self.loop = asyncio.new_event_loop()
+		self.thread = Thread(target=self.loop.run_forever, name='async-fetch', daemon=True)
+		self.thread.start()
+	
+	@property
+	def in_flight(self) -> int:
+		with self._lock:
+			return len(self._futures)
+	
+	def submit(
+		self,
+		result: ProductResult,
+		token: CancelToken,
+		timeout: float,
+		fallback: Callable[[ProductResult], None]
+	):
+		future = asyncio.run_coroutine_threadsafe(
+			self._track(result, token, timeout, fallback), self.loop
+		)
+		with self._lock:
+			self._futures.add(future)
+		future.add_done_callback(self._forget)
+	
+	def cancel(self):
+		with self._lock:
+			futures = list(self._futures)
+		for future in futures:
+			future.cancel()
+		self.loop.call_soon_threadsafe(self.client.close)
+	
+	def _forget(self, future: Future):
+		with self._lock:
+			self._futures.discard(future)
+	
+	async def _track(
+		self,
+		result: ProductResult,
+		token: CancelToken,
+		timeout: float,
+		fallback: Callable[[ProductResult], None]
+	):
+		async with self._slots:
+			if token.cancelled:
+				return
+			
+			breaker = self.breakers.get(result.url)
+			allowed, probe = breaker.allow()
+			if not allowed:
+				self.signals.thread_finished.emit(result)
+				return
+			
+			deadline = Deadline(timeout, token)
+			started = perf_counter()
+			try:
+				headers = conditional_headers(result) if self.conditional else None
+				fields = await self._fetch(result.url, deadline, headers)
+			except Cancelled:
+				if probe:
+					breaker.release()
+				return
+			except MaintenanceError:
+				metrics.count('maintenance_hits')
+				metrics.count('products_failed')
+				if breaker.failure():
+					self.signals.log.emit(MAINTENANCE_MESSAGE, 'error', True)
+			except FetchError as e:
+				print(f'async: {e}')
+				# El respaldo con el scraper pide su propio permiso al breaker
+				if probe:
+					breaker.release()
+				fallback(result)
+				return
+			except asyncio.TimeoutError:
+				metrics.count('products_failed')
+				self.signals.log.emit(
+					'General error: Se agotó el tiempo para obtener el producto.', 'error', False
+				)
+			except Exception as e:
+				metrics.count('products_failed')
+				self.signals.log.emit(f'General error: {e}', 'error', False)
+			else:
+				metrics.observe('fetch_async', (perf_counter() - started) * 1000)
+				if breaker.success():
+					self.signals.log.emit(RECOVERED_MESSAGE, 'success', True)
+				observe_fetch(fields)
+				if self.conditional and unchanged(result, fields):
+					metrics.count('products_unchanged')
+					result.unchanged = True
+				else:
+					apply_fields(result, fields, self.signals.log.emit)
+			
+			if probe:
+				breaker.release()
+			if not token.cancelled:
+				self.signals.thread_finished.emit(result)
+	
+	async def _fetch(self, url: str, deadline: Deadline, headers: Optional[dict[str, str]] = None) -> dict:
+		bucket = self._bucket(url)
+		started = perf_counter()
+		error: FetchError = FetchError(url)
+		
+		for attempt in range(self.retries + 1):
+			await asyncio.wait_for(bucket.acquire(), deadline.remaining())
+			
+			try:
+				with metrics.timer('http_get'):
+					response = await self.client.get(url, deadline.remaining(), headers)
+			except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+				deadline.remaining()
+				error = FetchError(e)
+			else:
+				if response.status == NOT_MODIFIED and headers:
+					metrics.count('not_modified')
+					return not_modified(started)
+				if response.status == 200:
+					if self.archive is not None:
+						await self.loop.run_in_executor(None, self.archive.put, url, response.body)
+					with metrics.timer('parse'):
+						document = await self.loop.run_in_executor(None, parse_html, response.text)
+					with metrics.timer('extract'):
+						values, timings = extract(document, PRODUCT_SPEC)
+					fields = build_product(values, timings, len(response.body), started)
+					fields['etag'] = response.headers.get('etag')
+					fields['last_modified'] = response.headers.get('last-modified')
+					return fields
+				
+				if response.status not in RETRY_STATUS:
+					raise FetchError(f'HTTP {response.status}')
+				
+				error = (MaintenanceError if response.status >= 500 else FetchError)(
+					f'HTTP {response.status}'
+				)
+			
+			if attempt < self.retries:
+				delay = self.backoff * 2 ** attempt * uniform(0.5, 1.5)
+				await asyncio.sleep(min(delay, deadline.remaining()))
+		
+		raise error
+	
+	def _bucket(self, url: str) -> TokenBucket:
+		key = site_key(url)
+		if key not in self._buckets:
+			self._buckets[key] = TokenBucket(self.requests_per_second, self.burst)
+		return self._buckets[key]
\ No newline at end of file
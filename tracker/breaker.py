@@ -0,0 +1,119 @@
+from threading import Lock
+from time import monotonic
+from urllib.parse import urlsplit
+
+CLOSED = 'cerrado'
+OPEN = 'abierto'
+HALF_OPEN = 'semiabierto'
+
+
+def site_key(url: str) -> str:
+	"""
+	MercadoLibre answers per site, so articulo.mercadolibre.com.ar and
+	www.mercadolibre.com.ar share `mercadolibre.com.ar`.
+	"""
+	host = urlsplit(url).netloc.split(':')[0]
+	index = host.find('mercadolibre.')
+	return host[index:] if index >= 0 else host
+
+
+class CircuitBreaker:
+	"""
+	Opens after `threshold` consecutive maintenance or 5xx answers, so the
+	rest of the cycle is drained without fetching. Once `cooldown` seconds
+	pass, a single half-open probe is let through: success closes the
+	breaker, failure opens it again for another cooldown.
+	"""
+	
+	def __init__(self, threshold: int, cooldown: float):
+		self.threshold = threshold
+		self.cooldown = cooldown
+		self.state = CLOSED
+		self.failures = 0
+		self.trips = 0
+		self.opened_at = 0.0
+		self._probing = False
+		self._lock = Lock()
+	
+	def allow(self) -> tuple[bool, bool]:
+		"""
+		Whether the caller may fetch, and whether it holds the half-open
+		probe; only the holder may `release()` it.
+		"""
+		with self._lock:
+			if self.state == CLOSED:
+				return True, False
+			
+			if self.state == OPEN and monotonic() - self.opened_at >= self.cooldown:
+				self.state = HALF_OPEN
+				self._probing = False
+			
+			if self.state == HALF_OPEN and not self._probing:
+				self._probing = True
+				return True, True
+			return False, False
+	
+	def success(self) -> bool:
+		"""Record a good answer; True when it closed the breaker."""
+		with self._lock:
+			self.failures = 0
+			self._probing = False
+			if self.state == CLOSED:
+				return False
+			self.state = CLOSED
+			return True
+	
+	def release(self):
+		"""Free the half-open probe slot held by the caller, when its probe ended without a verdict."""
+		with self._lock:
+			self._probing = False
+	
+	def failure(self) -> bool:
+		"""Record a maintenance answer; True only when it tripped a closed breaker."""
+		with self._lock:
+			self._probing = False
+			
+			if self.state == HALF_OPEN:
+				self.state = OPEN
+				self.opened_at = monotonic()
+				return False
+			
+			self.failures += 1
+			if self.state == CLOSED and self.failures >= self.threshold:
+				self.state = OPEN
+				self.opened_at = monotonic()
+				self.trips += 1
+				return True
+			return False
+
+
+class Breakers:
+	"""One CircuitBreaker per MercadoLibre site, created on first use."""
+	
+	def __init__(self, threshold: int = 5, cooldown: float = 300):
+		self.threshold = threshold
+		self.cooldown = cooldown
+		self._breakers: dict[str, CircuitBreaker] = {}
+		self._lock = Lock()
+	
+	def get(self, url: str) -> CircuitBreaker:
+		key = site_key(url)
+		with self._lock:
+			if key not in self._breakers:
+				self._breakers[key] = CircuitBreaker(self.threshold, self.cooldown)
+			breaker = self._breakers[key]
+		
+		breaker.threshold = self.threshold
+		breaker.cooldown = self.cooldown
+		return breaker
+	
+	def stats(self) -> dict:
+		with self._lock:
+			breakers = list(self._breakers.values())
+		
+		states = {breaker.state for breaker in breakers}
+		state = next((s for s in (OPEN, HALF_OPEN) if s in states), CLOSED)
+		return {
+			'breaker': state,
+			'trips': sum(breaker.trips for breaker in breakers)
+		}
\ No newline at end of file
@@ -0,0 +1,42 @@
+from threading import Event
+from time import monotonic
+
+
+class Cancelled(Exception):
+	pass
+
+
+class DeadlineExceeded(Exception):
+	pass
+
+
+class CancelToken:
+	"""Shared by every runnable of a tracking session; `stop()` cancels it."""
+	
+	def __init__(self):
+		self._event = Event()
+	
+	def cancel(self):
+		self._event.set()
+	
+	@property
+	def cancelled(self) -> bool:
+		return self._event.is_set()
+
+
+class Deadline:
+	"""Overall time budget of one product fetch, across every backend it tries."""
+	
+	def __init__(self, seconds: float, token: CancelToken):
+		self.expires = monotonic() + seconds
+		self.token = token
+	
+	def remaining(self) -> float:
+		"""Seconds left; raises once cancelled or expired."""
+		if self.token.cancelled:
+			raise Cancelled()
+		
+		remaining = self.expires - monotonic()
+		if remaining <= 0:
+			raise DeadlineExceeded('Se agotó el tiempo para obtener el producto.')
+		return remaining
\ No newline at end of file
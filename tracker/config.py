@@ -0,0 +1,47 @@
+from settings_manager import SettingsManager
+
+from tracker.api import DEFAULT_API_URL
+
+DEFAULTS = {
+	"GENERAL": {
+		"interval": 1800,
+		"track_on_startup": False,
+		"max_paralell_tracking": 4,
+		"driver_max_pages": 50,
+		"fetch_backend": "http",
+		"log_to_file": False,
+		"max_backoff": 16,
+		"fetch_timeout": 30,
+		"fast_profile": True,
+		"fetch_engine": "threads",
+		"max_in_flight": 200,
+		"requests_per_second": 5,
+		"breaker_threshold": 5,
+		"breaker_cooldown": 300,
+		"listing_max_pages": 5,
+		"api_base_url": DEFAULT_API_URL,
+		"api_token": "",
+		"archive_pages": False,
+		"archive_max_mb": 500,
+		"archive_codec": "zstd",
+		"queue_lease": 120,
+		"queue_batch": 0,
+		"queue_max_attempts": 3,
+		"metrics_port": 0,
+		"conditional_fetch": True
+	}
+}
+
+
+def load_settings(file_name: str = 'settings.ini') -> SettingsManager:
+	"""
+	SettingsManager only writes the defaults when the file is new, so options
+	added in later versions are filled in here.
+	"""
+	settings = SettingsManager(file_name, DEFAULTS)
+	settings.load()
+	for section, options in DEFAULTS.items():
+		for key, value in options.items():
+			if not settings.parser.has_option(section, key):
+				settings.set(section, key, value)
+	return settings
\ No newline at end of file
@@ -0,0 +1,84 @@
+from time import monotonic
+from typing import Iterable
+
+
+class CycleCoordinator:
+	"""
+	Tracks the URLs in flight between the timer and the thread pool. A new
+	cycle only queues URLs that are not already being fetched, and is
+	deferred altogether while the previous backlog exceeds `capacity`.
+	"""
+	
+	def __init__(self, capacity: int):
+		self.capacity = capacity
+		self.in_flight: set[str] = set()
+		self.pending = False
+		
+		self.started_at: float | None = None
+		self.last_duration = 0.0
+		self.overruns = 0
+		self.deferred = 0
+		self.merged = 0
+		# Productos del ciclo en curso que cambiaron y que se leyeron igual que antes
+		self.changed = 0
+		self.unchanged = 0
+	
+	@property
+	def running(self) -> bool:
+		return bool(self.in_flight)
+	
+	@property
+	def saturated(self) -> bool:
+		return len(self.in_flight) >= self.capacity
+	
+	def defer(self):
+		self.deferred += 1
+		self.pending = True
+	
+	def begin(self, urls: Iterable[str]) -> list[str]:
+		"""Mark `urls` in flight and return the ones that were not already."""
+		if self.running:
+			self.overruns += 1
+		else:
+			self.started_at = monotonic()
+			self.changed = 0
+			self.unchanged = 0
+		
+		new = []
+		for url in urls:
+			if url in self.in_flight:
+				self.merged += 1
+			else:
+				self.in_flight.add(url)
+				new.append(url)
+		return new
+	
+	def finish(self, url: str) -> bool:
+		"""Mark `url` done; True when that was the last one in flight."""
+		if url not in self.in_flight:
+			return False
+		
+		self.in_flight.discard(url)
+		if self.in_flight:
+			return False
+		
+		if self.started_at is not None:
+			self.last_duration = monotonic() - self.started_at
+			self.started_at = None
+		return True
+	
+	def reset(self):
+		self.in_flight.clear()
+		self.pending = False
+		self.started_at = None
+	
+	def stats(self) -> dict:
+		return {
+			'duration': self.last_duration,
+			'queue_depth': len(self.in_flight),
+			'overruns': self.overruns,
+			'deferred': self.deferred,
+			'merged': self.merged,
+			'changed': self.changed,
+			'unchanged': self.unchanged
+		}
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Headless tracker for servers: the same fetch path as the GUI, without Qt
+or pandas, reporting one JSON object per line on stdout.
+"""
+import json
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Event
+from time import monotonic, time
+from typing import Optional, TextIO
+
+from tracker.breaker import CLOSED
+from tracker.config import load_settings
+from tracker.engine import FAILED, READ, UNCHANGED
+from tracker.fetchers import Fetcher, HttpFetcher, SeleniumFetcher
+from tracker.history import PriceHistory
+from tracker.http import HttpClient
+from tracker.metrics import metrics, profiler, serve
+from tracker.session import SKIPPED, TrackingSession, outcome
+from tracker.store import COLUMNS, NEW_PRODUCT, ProductStore, observation
+from tracker.validators import forget
+
+EXIT_OK = 0
+# Algún producto o listado no se pudo leer
+EXIT_FAILURES = 1
+# 2 queda para los errores de uso que informa argparse
+EXIT_MAINTENANCE = 3
+
+
+class Daemon:
+	"""
+	Runs tracking cycles over the products in `<base_path>/products.db`, with
+	the settings in `<base_path>/settings.ini`. Selenium is only loaded when
+	`browser` is set, as a fallback for pages plain HTTP cannot read. With
+	`profile`, the first cycle's cProfile output is written there.
+	"""
+	
+	def __init__(
+		self,
+		base_path: Path,
+		browser: bool = False,
+		out: TextIO = sys.stdout,
+		journal_mode: str = 'WAL',
+		profile: Optional[Path] = None
+	):
+		self.out = out
+		self.browser = browser
+		self.profile = profile
+		self.settings = load_settings(str(base_path.joinpath('settings.ini')))
+		
+		self.store = ProductStore(base_path.joinpath('products.db'), journal_mode)
+		self.history = PriceHistory(self.store.path, journal_mode)
+		self.http = HttpClient(max_idle_per_host=self.setting('max_paralell_tracking', 'int'))
+		self.session = TrackingSession(
+			self.setting('interval', 'int'),
+			self.setting('max_backoff', 'int'),
+			self.setting('max_paralell_tracking', 'int'),
+			self.setting('breaker_threshold', 'int'),
+			self.setting('breaker_cooldown', 'int'),
+			self.log
+		)
+		self.stopped = Event()
+		self.drivers = None
+		
+		self.archive = None
+		if self.setting('archive_pages', 'bool'):
+			from tracker.archive import PageArchive
+			
+			self.archive = PageArchive(
+				base_path.joinpath('pages'),
+				self.setting('archive_max_mb', 'int') * 1024 * 1024,
+				self.setting('archive_codec')
+			)
+		
+		self.metrics_server = None
+		if self.setting('metrics_port', 'int'):
+			self.metrics_server = serve(self.setting('metrics_port', 'int'))
+	
+	def setting(self, option: str, kind: str = 'str'):
+		return self.settings.get('GENERAL', option, kind)
+	
+	@property
+	def fetchers(self) -> list[Fetcher]:
+		fetchers: list[Fetcher] = [HttpFetcher(self.http, self.archive)]
+		if self.browser:
+			if self.drivers is None:
+				from tracker.drivers import DriverPool
+				
+				self.drivers = DriverPool(
+					self.setting('max_paralell_tracking', 'int'),
+					self.setting('driver_max_pages', 'int'),
+					self.setting('fast_profile', 'bool')
+				)
+			selenium = SeleniumFetcher(self.drivers)
+			fetchers = [selenium] if self.setting('fetch_backend') == 'selenium' else [*fetchers, selenium]
+		return fetchers
+	
+	def emit(self, event: str, **fields):
+		record = {'ts': round(time(), 3), 'event': event, **fields}
+		self.out.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+		self.out.flush()
+	
+	def log(self, message: str, level: str, notify: bool = False):
+		self.emit('log', level=level, message=message, notify=notify)
+	
+	def run(self, loop: bool = False) -> int:
+		signal.signal(signal.SIGINT, self.stop)
+		signal.signal(signal.SIGTERM, self.stop)
+		
+		try:
+			while True:
+				counts = self.profiled_cycle()
+				if not loop or self.stopped.wait(self.wait_interval()):
+					break
+		finally:
+			self.close()
+		
+		if self.stopped.is_set():
+			return EXIT_OK
+		if self.session.breakers.stats()['breaker'] != CLOSED:
+			return EXIT_MAINTENANCE
+		return EXIT_FAILURES if counts[FAILED] else EXIT_OK
+	
+	def wait_interval(self) -> float:
+		return self.setting('interval', 'int')
+	
+	def stop(self, signum=None, frame=None):
+		self.stopped.set()
+		self.session.stop()
+		self.http.abort()
+	
+	def close(self):
+		if self.metrics_server is not None:
+			self.metrics_server.shutdown()
+		self.http.close()
+		if self.drivers is not None:
+			self.drivers.kill()
+		if self.archive is not None:
+			self.archive.close()
+		self.store.close()
+	
+	def profiled_cycle(self) -> dict[str, int]:
+		"""run_cycle, under cProfile the first time when `profile` is set."""
+		if self.profile is None:
+			return self.run_cycle()
+		
+		profiler.start(self.profile)
+		self.profile = None
+		try:
+			return self.run_cycle()
+		finally:
+			path = profiler.stop()
+			if path is not None:
+				self.log(f'Perfil del ciclo guardado en {path}.', 'info')
+	
+	def run_cycle(self) -> dict[str, int]:
+		started = monotonic()
+		rows = {row['url']: row for row in self.store.rows()}
+		# Los productos encontrados en un listado se actualizan con el listado
+		products = [url for url, row in rows.items() if not row['source']]
+		
+		self.session.configure(
+			self.setting('interval', 'int'),
+			self.setting('max_paralell_tracking', 'int'),
+			self.setting('breaker_threshold', 'int'),
+			self.setting('breaker_cooldown', 'int')
+		)
+		begun = self.session.begin(products, self.store.listings(), time())
+		due_products, due_listings = begun or ([], [])
+		self.emit('cycle_start', products=len(due_products), listings=len(due_listings))
+		
+		counts = self.process([rows[url] for url in due_products], due_listings, rows)
+		
+		self.emit(
+			'cycle_end',
+			seconds=round(monotonic() - started, 3),
+			**counts,
+			**self.session.breakers.stats()
+		)
+		return counts
+	
+	def process(self, products: list[dict], listings: list[str], rows: dict[str, dict]) -> dict[str, int]:
+		"""
+		Fetch `products` and `listings` on the thread pool and write the results
+		in one batch. URLs are only rescheduled once that batch is stored, so a
+		crash before the write leaves them due instead of losing what was read.
+		"""
+		counts = {READ: 0, UNCHANGED: 0, FAILED: 0, SKIPPED: 0, 'changed': 0}
+		updated: list[dict] = []
+		# (url, observed, changed, hot) de cada URL terminada
+		finished: list[tuple[str, bool, bool, bool]] = []
+		token = self.session.token
+		timeout = self.setting('fetch_timeout', 'int')
+		conditional = self.setting('conditional_fetch', 'bool')
+		max_pages = self.setting('listing_max_pages', 'int')
+		fetchers = self.fetchers
+		
+		with ThreadPoolExecutor(self.setting('max_paralell_tracking', 'int')) as pool:
+			product_jobs = []
+			for previous in products:
+				row = dict(previous)
+				job = pool.submit(self.session.track, row, fetchers, token, timeout, conditional)
+				product_jobs.append((previous, row, job))
+			listing_jobs = [
+				(
+					url,
+					pool.submit(self.session.read_listing, self.http, url, max_pages, token, timeout * max_pages)
+				)
+				for url in listings
+			]
+			
+			for previous, row, job in product_jobs:
+				status = job.result()
+				counts[status] += 1
+				observed, changed, hot = outcome(status, row, previous['current_price'], previous['available'])
+				if status == READ:
+					self.report(previous, row, changed)
+					counts['changed'] += changed
+					updated.append(row)
+				# Fallido o frenado por el breaker: se reintenta en un intervalo; cancelado, queda vencido
+				if observed or not token.cancelled:
+					finished.append((row['url'], observed, changed, hot))
+			
+			for url, job in listing_jobs:
+				items = job.result()
+				if items is None:
+					counts[FAILED] += 1
+					if not token.cancelled:
+						finished.append((url, False, False, False))
+					continue
+				
+				counts[READ] += 1
+				merged, changed = self.merge_listing(url, items, rows)
+				counts['changed'] += changed
+				updated.extend(merged)
+				finished.append((url, True, changed > 0, False))
+		
+		if updated:
+			with metrics.timer('store_write'):
+				self.store.upsert(updated)
+			with metrics.timer('history_write'):
+				self.history.append([observation(row) for row in updated])
+		for url, observed, changed, hot in finished:
+			self.reschedule(url, observed, changed, hot)
+		return counts
+	
+	def reschedule(self, url: str, observed: bool, changed: bool = False, hot: bool = False):
+		self.session.record(url, observed, changed, hot)
+		self.session.finish(url)
+	
+	def report(self, previous: dict, row: dict, changed: bool):
+		"""Emit a product read."""
+		self.emit(
+			'product',
+			url=row['url'],
+			product=row['product'],
+			price=row['current_price'],
+			previous_price=previous['current_price'],
+			currency=row['currency'],
+			available=row['available'],
+			changed=changed
+		)
+	
+	def merge_listing(self, source: str, items: list[dict], rows: dict[str, dict]) -> tuple[list[dict], int]:
+		"""Upsert the cards of a listing into `rows`; returns the rows touched and how many changed."""
+		from tracker.listings import LISTING_FIELDS
+		
+		merged = []
+		changed = 0
+		checked_at = time()
+		
+		for item in items:
+			row = rows.get(item['url'])
+			if row is None:
+				row = {column: None for column in COLUMNS} | NEW_PRODUCT
+				row.update(url=item['url'], source=source)
+				rows[item['url']] = row
+				changed += 1
+			elif row['current_price'] != item['current_price']:
+				row['previous_price'] = row['current_price']
+				changed += 1
+			
+			# La fila ya no es lo que se leyó de su página
+			forget(row)
+			row.update({field: item[field] for field in LISTING_FIELDS}, checked_at=checked_at)
+			merged.append(row)
+		
+		self.emit('listing', url=source, items=len(items), changed=changed)
+		return merged, changed
\ No newline at end of file
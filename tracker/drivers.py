@@ -0,0 +1,193 @@
+import atexit
+import os
+import signal
+import subprocess
+import sys
+from queue import Empty, LifoQueue
+from threading import Lock
+
+from selenium.webdriver import Chrome
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from tracker.metrics import metrics
+
+
+# Recursos que no hacen falta para leer el precio
+BLOCKED_URLS = [
+	'*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+	'*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm',
+	'*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+	'*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*mercadoads*',
+	'*/recommendations*', '*/tracks*', '*/melidata*'
+]
+
+
+def chrome_options(fast: bool = False) -> Options:
+	options = Options()
+	options.add_argument("--headless")  # Configurar en modo headless si es necesario
+	options.add_argument("--disable-gpu")  # Desactivar la GPU si es necesario
+	
+	if fast:
+		# No espera imágenes ni subrecursos: alcanza con el DOM para leer el precio
+		options.page_load_strategy = 'eager'
+		options.add_argument("--blink-settings=imagesEnabled=false")
+		options.add_experimental_option(
+			'prefs', {
+				'profile.managed_default_content_settings.images': 2,
+				'profile.managed_default_content_settings.fonts': 2
+			}
+		)
+	
+	return options
+
+
+def block_resources(driver: Chrome):
+	driver.execute_cdp_cmd('Network.enable', {})
+	driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+
+
+def chrome_service() -> Service:
+	# En POSIX chromedriver arranca en su propio grupo de procesos, para poder matar a Chrome con él
+	popen_kw = {} if sys.platform == 'win32' else {'start_new_session': True}
+	return Service(popen_kw=popen_kw)
+
+
+def kill_process_tree(pid: int):
+	try:
+		if sys.platform == 'win32':
+			subprocess.run(
+				['taskkill', '/F', '/T', '/PID', str(pid)],
+				stdout=subprocess.DEVNULL,
+				stderr=subprocess.DEVNULL,
+				creationflags=subprocess.CREATE_NO_WINDOW
+			)
+		else:
+			os.killpg(pid, signal.SIGKILL)
+	except (OSError, subprocess.SubprocessError):
+		pass
+
+
+class DriverPool:
+	"""
+	Keeps a set of headless Chrome instances alive across URLs and cycles.
+	Drivers are health-checked when acquired and recycled after `max_pages`
+	pages or whenever a fetch breaks them. With `fast`, pages load eagerly
+	without images, fonts, ads or analytics.
+	"""
+	
+	def __init__(self, size: int, max_pages: int = 50, fast: bool = True):
+		self.size = size
+		self.max_pages = max_pages
+		self.fast = fast
+		
+		self._idle: LifoQueue[Chrome] = LifoQueue()
+		self._pages: dict[Chrome, int] = {}
+		self._generation: dict[Chrome, int] = {}
+		self._current_generation = 0
+		self._lock = Lock()
+		
+		atexit.register(self.kill)
+	
+	@property
+	def alive(self) -> int:
+		with self._lock:
+			return len(self._pages)
+	
+	def acquire(self) -> Chrome:
+		while True:
+			try:
+				driver = self._idle.get_nowait()
+			except Empty:
+				return self._create()
+			
+			if self._is_healthy(driver):
+				return driver
+			
+			self._discard(driver)
+	
+	def release(self, driver: Chrome, broken: bool = False):
+		with self._lock:
+			if driver not in self._pages:
+				return
+			self._pages[driver] += 1
+			stale = (
+				broken or
+				self._pages[driver] >= self.max_pages or
+				self._generation[driver] != self._current_generation or
+				self._idle.qsize() >= self.size
+			)
+		
+		if stale:
+			self._discard(driver)
+		else:
+			self._idle.put(driver)
+	
+	def close(self):
+		"""Quit every idle driver; busy ones are quit as soon as they are released."""
+		with self._lock:
+			self._current_generation += 1
+		
+		while True:
+			try:
+				driver = self._idle.get_nowait()
+			except Empty:
+				break
+			self._discard(driver)
+	
+	def kill(self):
+		"""
+		Force-kill the process tree of every driver, busy ones included, so
+		fetches still running fail right away instead of finishing the page.
+		"""
+		with self._lock:
+			self._current_generation += 1
+			drivers = list(self._pages)
+			self._pages.clear()
+			self._generation.clear()
+		
+		while True:
+			try:
+				self._idle.get_nowait()
+			except Empty:
+				break
+		
+		for driver in drivers:
+			process = getattr(driver.service, 'process', None)
+			if process is not None:
+				kill_process_tree(process.pid)
+				# Se espera a chromedriver para que no quede como proceso zombi
+				try:
+					process.wait(5)
+				except (OSError, subprocess.SubprocessError):
+					pass
+	
+	def _create(self) -> Chrome:
+		with metrics.timer('chrome_start'):
+			driver = Chrome(options=chrome_options(self.fast), service=chrome_service())
+		if self.fast:
+			try:
+				block_resources(driver)
+			except Exception as e:
+				print(e)
+		with self._lock:
+			self._pages[driver] = 0
+			self._generation[driver] = self._current_generation
+		return driver
+	
+	def _discard(self, driver: Chrome):
+		with self._lock:
+			self._pages.pop(driver, None)
+			self._generation.pop(driver, None)
+		try:
+			driver.quit()
+		except Exception as e:
+			print(e)
+	
+	@staticmethod
+	def _is_healthy(driver: Chrome) -> bool:
+		try:
+			driver.current_url
+			return True
+		except Exception:
+			return False
\ No newline at end of file
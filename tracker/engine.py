@@ -0,0 +1,129 @@
+"""
+Tracking logic shared by the Qt GUI and the headless daemon. Nothing here
+imports Qt or pandas: rows are anything indexable by column name, and
+messages go through a `log(message, level, notify)` callable.
+"""
+from time import time
+from typing import Callable, MutableMapping
+
+from tracker.breaker import CircuitBreaker
+from tracker.cancel import Cancelled, Deadline, DeadlineExceeded
+from tracker.fetchers import FetchError, Fetcher, MaintenanceError
+from tracker.metrics import metrics
+from tracker.validators import conditional_headers, remember, unchanged
+
+Log = Callable[[str, str, bool], None]
+
+# Lo que devuelve track_product
+READ = 'read'
+UNCHANGED = 'unchanged'
+FAILED = 'failed'
+
+MAINTENANCE_MESSAGE = 'MercadoLibre está en mantenimiento o fuera de servicio. Se pausan los chequeos.'
+RECOVERED_MESSAGE = 'MercadoLibre volvió a responder.'
+
+
+def observe_fetch(fields: dict):
+	"""
+	Record what a successful fetch measured: bytes, time to price and the
+	milliseconds of each extracted field, so a slow or broken selector shows.
+	"""
+	metrics.count('bytes_read', fields['bytes'])
+	metrics.observe('time_to_price', fields['time_to_price'])
+	for name, ms in fields['timings'].items():
+		metrics.observe(f'extract_{name}', ms)
+
+
+def apply_fields(row: MutableMapping, fields: dict, log: Log):
+	"""Copy what a Fetcher read into the tracked row, along with its validators."""
+	row['product'] = fields['product']
+	row['checked_at'] = time()
+	remember(row, fields)
+	metrics.count('products_read')
+	
+	if not fields['available']:
+		row['available'] = False
+		metrics.count('products_unavailable')
+		return
+	
+	if fields['free_ship'] is not None:
+		row['free_ship'] = fields['free_ship']
+	
+	if fields['currency'] is not None:
+		row['currency'] = fields['currency']
+	
+	if fields['price'] is None:
+		log(f'Error al obtener precio.', 'error', False)
+		row['available'] = False
+		metrics.count('products_unavailable')
+	else:
+		row['available'] = True
+		row['previous_price'] = row['current_price']
+		row['current_price'] = fields['price']
+	
+	row['with_discount'] = fields['with_discount']
+
+
+def track_product(
+	row: MutableMapping,
+	fetchers: list[Fetcher],
+	breaker: CircuitBreaker,
+	deadline: Deadline,
+	log: Log,
+	conditional: bool = True
+) -> str:
+	"""
+	Read `row['url']` with each fetcher in turn until one succeeds and apply
+	the result to `row`. Returns READ, UNCHANGED when `conditional` is set
+	and the page reads as the validators stored in `row` say, leaving `row`
+	as is, or FAILED; raises Cancelled.
+	"""
+	fields = None
+	error = None
+	headers = conditional_headers(row) if conditional else None
+	
+	# Cada backend es un respaldo del anterior si la página no se pudo leer
+	for fetcher in fetchers:
+		try:
+			with metrics.timer(f'fetch_{fetcher.name}'):
+				fields = fetcher.fetch(row['url'], deadline, headers)
+			if breaker.success():
+				log(RECOVERED_MESSAGE, 'success', True)
+			# Por fetch van a las métricas, no al log de la interfaz
+			observe_fetch(fields)
+			break
+		except Cancelled:
+			raise
+		except DeadlineExceeded as e:
+			error = e
+			break
+		except MaintenanceError as e:
+			metrics.count('maintenance_hits')
+			# Una sola notificación por corte, no una por producto
+			if breaker.failure():
+				log(MAINTENANCE_MESSAGE, 'error', True)
+			error = e
+			break
+		except FetchError as e:
+			log(f'{fetcher.name}: {e}', 'debug', False)
+			error = e
+		except Exception as e:
+			log(f'{fetcher.name}: {e}', 'debug', False)
+			error = e
+			break
+	
+	if deadline.token.cancelled:
+		raise Cancelled()
+	
+	if fields is None:
+		metrics.count('products_failed')
+		if not isinstance(error, MaintenanceError):
+			log(f'General error: {error}', 'error', False)
+		return FAILED
+	
+	if conditional and unchanged(row, fields):
+		metrics.count('products_unchanged')
+		return UNCHANGED
+	
+	apply_fields(row, fields, log)
+	return READ
\ No newline at end of file
@@ -0,0 +1,149 @@
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from tracker.parser import Node
+
+FREE_SHIP_TEXTS = {'Llega gratis', 'Envío gratis'}
+
+
+def parse_price(text: str) -> float:
+	return float(text.replace('.', '').replace(',', '.'))
+
+
+def optional_price(text: Optional[str]) -> Optional[float]:
+	try:
+		return parse_price(text) if text else None
+	except ValueError:
+		return None
+
+
+def has_free_ship(texts: list[str]) -> bool:
+	return any(text in element for element in texts for text in FREE_SHIP_TEXTS)
+
+
+@dataclass(frozen=True)
+class Field:
+	"""
+	One value to read from a page. `selector` is a CSS selector of tag, #id
+	and .class compounds; with a comma-separated list the first alternative
+	with any match wins. `attribute` is 'text', 'exists' or an attribute name.
+	`transform` runs in Python on the raw value, whichever engine read it.
+	"""
+	
+	name: str
+	selector: str
+	attribute: str = 'text'
+	many: bool = False
+	transform: Optional[Callable[[Any], Any]] = None
+
+
+PRODUCT_SPEC = [
+	Field('title', 'title'),
+	Field('unavailable', '#item_status_short_description_message', 'exists'),
+	Field('has_price', '#price', 'exists'),
+	Field('has_shipping', '#buybox-form, #shipping_summary', 'exists'),
+	Field(
+		'free_ship',
+		'#buybox-form .ui-pdp-color--GREEN, #shipping_summary .ui-pdp-color--GREEN',
+		many=True,
+		transform=has_free_ship
+	),
+	Field('currency', '#price .andes-money-amount__currency-symbol'),
+	Field('price', '#price .andes-money-amount__fraction', transform=optional_price),
+	Field('with_discount', '#price .andes-money-amount__discount', 'exists'),
+]
+
+# Tarjetas de resultados: diseño "poly" actual y el anterior "ui-search"
+LISTING_CARD = 'li.ui-search-layout__item, div.poly-card, div.ui-search-result__wrapper'
+LISTING_NEXT_PAGE = 'li.andes-pagination__button--next a'
+
+_CARD_PRICE = '.poly-price__current {0}, .ui-search-price__second-line {0}'
+
+LISTING_SPEC = [
+	Field('link', 'a.poly-component__title, h2.poly-box a, a.ui-search-link', 'href'),
+	Field('title', '.poly-component__title, .ui-search-item__title'),
+	Field('currency', _CARD_PRICE.format('.andes-money-amount__currency-symbol')),
+	Field('price', _CARD_PRICE.format('.andes-money-amount__fraction'), transform=optional_price),
+	Field('with_discount', _CARD_PRICE.format('.andes-money-amount__discount'), 'exists'),
+	Field(
+		'free_ship',
+		'.poly-component__shipping, .ui-search-item__shipping',
+		many=True,
+		transform=has_free_ship
+	),
+]
+
+# Recibe el spec serializado y devuelve todos los valores en un único viaje a WebDriver
+EXTRACT_SCRIPT = """
+const spec = arguments[0];
+const values = {};
+const timings = {};
+const normalize = text => (text || '').replace(/\\s+/g, ' ').trim();
+
+for (const field of spec) {
+	const start = performance.now();
+	let nodes = [];
+	for (const alternative of field.selector.split(',')) {
+		nodes = Array.from(document.querySelectorAll(alternative.trim()));
+		if (nodes.length) break;
+	}
+	const read = node => field.attribute === 'text'
+		? normalize(node.textContent)
+		: node.getAttribute(field.attribute);
+	
+	if (field.attribute === 'exists') values[field.name] = nodes.length > 0;
+	else if (field.many) values[field.name] = nodes.map(read);
+	else values[field.name] = nodes.length ? read(nodes[0]) : null;
+	
+	timings[field.name] = performance.now() - start;
+}
+const resources = performance.getEntriesByType('navigation')
+	.concat(performance.getEntriesByType('resource'));
+const bytes = resources.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+return {values: values, timings: timings, bytes: bytes};
+"""
+
+
+def _read(node: Node, attribute: str) -> Optional[str]:
+	return node.text if attribute == 'text' else node.get(attribute)
+
+
+def _finish(spec: list[Field], values: dict) -> dict:
+	return {
+		field.name: field.transform(values[field.name]) if field.transform else values[field.name]
+		for field in spec
+	}
+
+
+def extract(document: Node, spec: list[Field]) -> tuple[dict, dict[str, float]]:
+	"""Run `spec` over a parsed page; returns the values and the milliseconds per field."""
+	values = {}
+	timings = {}
+	
+	for field in spec:
+		start = perf_counter()
+		nodes = document.select(field.selector)
+		
+		if field.attribute == 'exists':
+			values[field.name] = bool(nodes)
+		elif field.many:
+			values[field.name] = [_read(node, field.attribute) for node in nodes]
+		else:
+			values[field.name] = _read(nodes[0], field.attribute) if nodes else None
+		
+		timings[field.name] = (perf_counter() - start) * 1000
+	
+	return _finish(spec, values), timings
+
+
+def extract_in_browser(driver, spec: list[Field]) -> tuple[dict, dict[str, float], int]:
+	"""
+	Run `spec` inside the page with a single `execute_script` call. Also
+	returns the bytes the page transferred, per the Resource Timing API.
+	"""
+	serialized = [
+		{key: value for key, value in asdict(field).items() if key != 'transform'} for field in spec
+	]
+	result = driver.execute_script(EXTRACT_SCRIPT, serialized)
+	return _finish(spec, result['values']), result['timings'], int(result['bytes'])
\ No newline at end of file
@@ -0,0 +1,194 @@
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional
+
+from tracker.cancel import Cancelled, Deadline, DeadlineExceeded
+from tracker.extraction import PRODUCT_SPEC, extract, extract_in_browser
+from tracker.http import HttpClient
+from tracker.metrics import metrics
+from tracker.parser import parse_html
+
+if TYPE_CHECKING:
+	from tracker.archive import PageArchive
+	from tracker.drivers import DriverPool
+
+NOT_MODIFIED = 304
+
+
+class FetchError(Exception):
+	pass
+
+
+class MaintenanceError(FetchError):
+	pass
+
+
+class ParseError(FetchError):
+	pass
+
+
+class Fetcher:
+	"""
+	A fetch backend turns a product URL into the fields ProductRunnable stores:
+	`product`, `available`, `free_ship`, `currency`, `price` and `with_discount`,
+	plus the per-field extraction `timings` in milliseconds, the `bytes`
+	transferred and the `time_to_price` in milliseconds. `price` is None
+	when the page had no readable price. `etag` and `last_modified` are the
+	page's validators, when the server sent them. `headers` are conditional
+	request headers; a backend that can send them and gets a 304 returns
+	only the timing keys, with `not_modified` set. Implementations must give
+	up with Cancelled or DeadlineExceeded once `deadline` says so.
+	"""
+	
+	name = 'base'
+	
+	def fetch(self, url: str, deadline: Deadline, headers: Optional[dict[str, str]] = None) -> dict:
+		raise NotImplementedError
+	
+	def close(self):
+		pass
+
+
+def build_product(
+	values: dict,
+	timings: dict[str, float],
+	transferred: int,
+	started: float
+) -> dict:
+	"""Turn the raw PRODUCT_SPEC values into the fields a Fetcher returns."""
+	if 'Error!' in (values['title'] or ''):
+		raise MaintenanceError(values['title'])
+	
+	fields = {
+		'product': values['title'],
+		'available': not values['unavailable'],
+		'free_ship': values['free_ship'] if values['has_shipping'] else None,
+		'currency': values['currency'],
+		'price': values['price'],
+		'with_discount': values['with_discount'],
+		'timings': timings,
+		'bytes': transferred,
+		'time_to_price': (perf_counter() - started) * 1000,
+		'etag': None,
+		'last_modified': None,
+		'not_modified': False
+	}
+	
+	if fields['available'] and not values['has_price']:
+		raise ParseError('No se encontró el precio en la página.')
+	
+	return fields
+
+
+def not_modified(started: float) -> dict:
+	"""What a Fetcher returns when the server answered 304 Not Modified."""
+	return {'timings': {}, 'bytes': 0, 'time_to_price': (perf_counter() - started) * 1000, 'not_modified': True}
+
+
+class HttpFetcher(Fetcher):
+	"""
+	Downloads the server-rendered HTML over pooled keep-alive connections, no
+	browser. Every page read is kept in `archive`, when given.
+	"""
+	
+	name = 'http'
+	
+	def __init__(self, client: HttpClient, archive: Optional['PageArchive'] = None):
+		self.client = client
+		self.archive = archive
+	
+	def fetch(self, url: str, deadline: Deadline, headers: Optional[dict[str, str]] = None) -> dict:
+		timeout = deadline.remaining()
+		started = perf_counter()
+		try:
+			with metrics.timer('http_get'):
+				response = self.client.get(url, headers, timeout=timeout)
+		except Exception as e:
+			deadline.remaining()
+			raise FetchError(e) from e
+		
+		if response.status == NOT_MODIFIED and headers:
+			metrics.count('not_modified')
+			return not_modified(started)
+		if response.status >= 500:
+			raise MaintenanceError(f'HTTP {response.status}')
+		if response.status != 200:
+			raise FetchError(f'HTTP {response.status}')
+		
+		if self.archive is not None:
+			self.archive.put(url, response.body)
+		
+		with metrics.timer('parse'):
+			document = parse_html(response.text)
+		with metrics.timer('extract'):
+			values, timings = extract(document, PRODUCT_SPEC)
+		transferred = int(response.headers.get('content-length', len(response.body)))
+		fields = build_product(values, timings, transferred, started)
+		fields['etag'] = response.headers.get('etag')
+		fields['last_modified'] = response.headers.get('last-modified')
+		return fields
+	
+	def close(self):
+		self.client.close()
+
+
+class SeleniumFetcher(Fetcher):
+	"""
+	Renders the page in a pooled headless Chrome; slower, but runs the page
+	scripts. Requests are never conditional.
+	"""
+	
+	name = 'selenium'
+	
+	def __init__(self, drivers: 'DriverPool'):
+		self.drivers = drivers
+	
+	def fetch(self, url: str, deadline: Deadline, headers: Optional[dict[str, str]] = None) -> dict:
+		# Selenium se importa recién al usarlo: el daemon sin navegador no lo carga
+		from selenium.common.exceptions import TimeoutException
+		from selenium.webdriver.common.by import By
+		from selenium.webdriver.support.expected_conditions import presence_of_element_located
+		from selenium.webdriver.support.wait import WebDriverWait
+		
+		deadline.remaining()
+		with metrics.timer('driver_acquire'):
+			driver = self.drivers.acquire()
+		broken = False
+		
+		try:
+			started = perf_counter()
+			driver.set_page_load_timeout(deadline.remaining())
+			with metrics.timer('driver_get'):
+				driver.get(url)
+			
+			price_present = presence_of_element_located((By.ID, 'price'))
+			with metrics.timer('wait_price'):
+				WebDriverWait(driver, min(10.0, deadline.remaining()), poll_frequency=0.2).until(
+					# remaining() corta la espera apenas se cancela el tracking
+					lambda d: deadline.remaining() and price_present(d)
+				)
+			
+			with metrics.timer('extract_browser'):
+				extracted = extract_in_browser(driver, PRODUCT_SPEC)
+			return build_product(*extracted, started)
+		
+		except FetchError:
+			raise
+		
+		except (Cancelled, DeadlineExceeded):
+			broken = True
+			raise
+		
+		except TimeoutException as e:
+			deadline.remaining()
+			raise ParseError('No se encontró el precio en la página.') from e
+		
+		except Exception as e:
+			broken = True
+			deadline.remaining()
+			raise FetchError(e) from e
+		
+		finally:
+			self.drivers.release(driver, broken)
+	
+	def close(self):
+		self.drivers.close()
\ No newline at end of file
@@ -0,0 +1,298 @@
+import sqlite3
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+OBSERVED_FIELDS = ['price', 'currency', 'available', 'free_ship', 'with_discount']
+
+
+class PriceHistory:
+	"""
+	Every observation of every product, stored as runs: consecutive identical
+	observations only extend the last run's `last_seen` and `observations`.
+	Min/max/mean of the prices seen in stock are kept up to date per product
+	so they never need a scan.
+	"""
+	
+	def __init__(self, path: Path, journal_mode: str = 'WAL'):
+		self.path = path
+		self._lock = Lock()
+		self._keys: dict[str, int] = {}
+		
+		self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+		self._conn.execute(f'PRAGMA journal_mode={journal_mode}')
+		self._conn.execute('PRAGMA synchronous=NORMAL')
+		self._conn.executescript(
+			"""
+			CREATE TABLE IF NOT EXISTS history_keys (
+				id INTEGER PRIMARY KEY,
+				url TEXT NOT NULL UNIQUE
+			);
+			CREATE TABLE IF NOT EXISTS history (
+				product INTEGER NOT NULL,
+				first_seen INTEGER NOT NULL,
+				last_seen INTEGER NOT NULL,
+				observations INTEGER NOT NULL,
+				price REAL,
+				currency TEXT,
+				available INTEGER,
+				free_ship INTEGER,
+				with_discount INTEGER,
+				PRIMARY KEY (product, first_seen)
+			) WITHOUT ROWID;
+			CREATE TABLE IF NOT EXISTS history_stats (
+				product INTEGER PRIMARY KEY,
+				min_price REAL NOT NULL,
+				max_price REAL NOT NULL,
+				total REAL NOT NULL,
+				count INTEGER NOT NULL
+			);
+			"""
+		)
+	
+	def append(self, observations: list[dict]):
+		"""
+		Record observations in one transaction. Each one needs `url`,
+		`timestamp` (epoch seconds) and the OBSERVED_FIELDS.
+		"""
+		if not observations:
+			return
+		
+		with self._lock:
+			self._conn.execute('BEGIN IMMEDIATE')
+			try:
+				for observation in sorted(observations, key=lambda o: o['timestamp']):
+					self._append(observation)
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				self._keys.clear()
+				raise
+			self._conn.execute('COMMIT')
+	
+	def rewrite(self, observations: list[dict], slack: float = 0):
+		"""
+		Replace the runs that came from the pages `observations` were
+		re-extracted from, and recompute the stats. A run is replaced when
+		both its ends are within `slack` seconds of one of those pages; the
+		others, from reads that were not archived (Selenium, the items API),
+		are kept, along with the observations they already count.
+		"""
+		if not observations:
+			return
+		
+		by_url: dict[str, list[dict]] = {}
+		for observation in sorted(observations, key=lambda o: o['timestamp']):
+			by_url.setdefault(observation['url'], []).append(observation)
+		
+		with self._lock:
+			self._conn.execute('BEGIN IMMEDIATE')
+			try:
+				for url, archived in by_url.items():
+					product = self._key(url)
+					self._rewrite(product, archived, slack)
+					
+					# _append suma a las estadísticas; acá se rehacen desde las corridas que quedaron
+					self._conn.execute('DELETE FROM history_stats WHERE product = ?', (product,))
+					self._conn.execute(
+						"""
+						INSERT INTO history_stats (product, min_price, max_price, total, count)
+						SELECT product, min(price), max(price), sum(price * observations), sum(observations)
+						FROM history WHERE product = ? AND available = 1 AND price > 0
+						GROUP BY product
+						""",
+						(product,)
+					)
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				self._keys.clear()
+				raise
+			self._conn.execute('COMMIT')
+	
+	def series(self, url: str, start: Optional[float] = None, end: Optional[float] = None) -> list[dict]:
+		"""Runs overlapping [start, end], oldest first."""
+		with self._lock:
+			product = self._key(url, create=False)
+			if product is None:
+				return []
+			
+			rows = self._conn.execute(
+				f"""
+				SELECT first_seen, last_seen, observations, {', '.join(OBSERVED_FIELDS)}
+				FROM history
+				WHERE product = ? AND first_seen <= ? AND last_seen >= ?
+				ORDER BY first_seen
+				""",
+				(product, int(end if end is not None else 2 ** 62), int(start or 0))
+			).fetchall()
+		
+		columns = ['first_seen', 'last_seen', 'observations', *OBSERVED_FIELDS]
+		return [dict(zip(columns, row)) for row in rows]
+	
+	def stats(self, url: str) -> Optional[dict]:
+		with self._lock:
+			product = self._key(url, create=False)
+			if product is None:
+				return None
+			
+			row = self._conn.execute(
+				'SELECT min_price, max_price, total, count FROM history_stats WHERE product = ?',
+				(product,)
+			).fetchone()
+		
+		if row is None:
+			return None
+		
+		min_price, max_price, total, count = row
+		return {'min': min_price, 'max': max_price, 'mean': total / count, 'count': count}
+	
+	def all_stats(self) -> dict[str, dict]:
+		with self._lock:
+			rows = self._conn.execute(
+				"""
+				SELECT k.url, s.min_price, s.max_price, s.total, s.count
+				FROM history_stats s JOIN history_keys k ON k.id = s.product
+				"""
+			).fetchall()
+		
+		return {
+			url: {'min': min_price, 'max': max_price, 'mean': total / count, 'count': count}
+			for url, min_price, max_price, total, count in rows
+		}
+	
+	def close(self):
+		with self._lock:
+			self._conn.close()
+	
+	def _append(self, observation: dict):
+		product = self._key(observation['url'])
+		timestamp = int(observation['timestamp'])
+		values = tuple(self._normalize(field, observation.get(field)) for field in OBSERVED_FIELDS)
+		
+		# Siempre desde la base, dentro de la transacción: otros procesos agregan al mismo archivo
+		last_run = self._conn.execute(
+			f"""
+			SELECT first_seen, {', '.join(OBSERVED_FIELDS)} FROM history
+			WHERE product = ? ORDER BY first_seen DESC LIMIT 1
+			""",
+			(product,)
+		).fetchone()
+		if last_run is not None:
+			last_run = (last_run[0], tuple(last_run[1:]))
+		
+		if last_run is not None and last_run[1] == values and last_run[0] <= timestamp:
+			self._conn.execute(
+				"""
+				UPDATE history SET last_seen = max(last_seen, ?), observations = observations + 1
+				WHERE product = ? AND first_seen = ?
+				""",
+				(timestamp, product, last_run[0])
+			)
+		else:
+			self._conn.execute(
+				f"""
+				INSERT OR REPLACE INTO history
+				(product, first_seen, last_seen, observations, {', '.join(OBSERVED_FIELDS)})
+				VALUES (?, ?, ?, 1, {', '.join('?' * len(OBSERVED_FIELDS))})
+				""",
+				(product, timestamp, timestamp, *values)
+			)
+		
+		# Solo los precios a la venta cuentan para mínimo, máximo y media
+		price, available = values[0], values[2]
+		if available and price is not None and price > 0:
+			self._conn.execute(
+				"""
+				INSERT INTO history_stats (product, min_price, max_price, total, count)
+				VALUES (?, ?, ?, ?, 1)
+				ON CONFLICT(product) DO UPDATE SET
+					min_price = min(min_price, excluded.min_price),
+					max_price = max(max_price, excluded.max_price),
+					total = total + excluded.total,
+					count = count + 1
+				""",
+				(product, price, price, price)
+			)
+	
+	def _rewrite(self, product: int, archived: list[dict], slack: float):
+		"""Swap the runs of `product` that match `archived`, oldest first, for runs built from it."""
+		times = [int(observation['timestamp']) for observation in archived]
+		
+		def matches(timestamp: int) -> bool:
+			at = bisect_left(times, timestamp - slack)
+			return at < len(times) and times[at] <= timestamp + slack
+		
+		kept = []
+		runs = self._conn.execute(
+			'SELECT first_seen, last_seen FROM history WHERE product = ? AND last_seen >= ?',
+			(product, times[0] - slack)
+		).fetchall()
+		for first_seen, last_seen in runs:
+			if matches(first_seen) and matches(last_seen):
+				self._conn.execute(
+					'DELETE FROM history WHERE product = ? AND first_seen = ?', (product, first_seen)
+				)
+			else:
+				kept.append((first_seen, last_seen))
+		
+		# Las corridas nuevas no atraviesan las que quedan: se cortan donde empieza una
+		events = sorted(
+			[(first_seen, last_seen, None) for first_seen, last_seen in kept] +
+			[(timestamp, timestamp, observation) for timestamp, observation in zip(times, archived)],
+			key=lambda event: event[0]
+		)
+		run = None
+		for first_seen, last_seen, observation in events:
+			if observation is None:
+				self._insert_run(product, run)
+				run = None
+				continue
+			if any(start - slack <= first_seen <= end + slack for start, end in kept):
+				# Ya la cuenta una corrida que queda
+				continue
+			
+			values = tuple(self._normalize(field, observation.get(field)) for field in OBSERVED_FIELDS)
+			if run is not None and run[3] == values:
+				run = (run[0], first_seen, run[2] + 1, values)
+			else:
+				self._insert_run(product, run)
+				run = (first_seen, first_seen, 1, values)
+		self._insert_run(product, run)
+	
+	def _insert_run(self, product: int, run: Optional[tuple[int, int, int, tuple]]):
+		if run is None:
+			return
+		first_seen, last_seen, count, values = run
+		self._conn.execute(
+			f"""
+			INSERT OR REPLACE INTO history
+			(product, first_seen, last_seen, observations, {', '.join(OBSERVED_FIELDS)})
+			VALUES (?, ?, ?, ?, {', '.join('?' * len(OBSERVED_FIELDS))})
+			""",
+			(product, first_seen, last_seen, count, *values)
+		)
+	
+	def _key(self, url: str, create: bool = True) -> Optional[int]:
+		product = self._keys.get(url)
+		if product is not None:
+			return product
+		
+		if create:
+			self._conn.execute('INSERT OR IGNORE INTO history_keys (url) VALUES (?)', (url,))
+		
+		row = self._conn.execute('SELECT id FROM history_keys WHERE url = ?', (url,)).fetchone()
+		if row is None:
+			return None
+		
+		self._keys[url] = row[0]
+		return row[0]
+	
+	@staticmethod
+	def _normalize(field: str, value):
+		if value is None or (isinstance(value, float) and value != value):
+			return None
+		if field in {'available', 'free_ship', 'with_discount'}:
+			return int(bool(value))
+		if field == 'price':
+			return float(value)
+		return str(value)
\ No newline at end of file
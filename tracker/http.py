@@ -0,0 +1,183 @@
+import gzip
+import socket
+import zlib
+from dataclasses import dataclass
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
+from threading import Lock
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = (
+	'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+	'Chrome/133.0.0.0 Safari/537.36'
+)
+
+DEFAULT_HEADERS = {
+	'User-Agent': USER_AGENT,
+	'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+	'Accept-Language': 'es-AR,es;q=0.9',
+	'Accept-Encoding': 'gzip, deflate',
+	'Connection': 'keep-alive'
+}
+
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+	if encoding == 'gzip':
+		return gzip.decompress(body)
+	if encoding == 'deflate':
+		return zlib.decompress(body)
+	return body
+
+
+@dataclass
+class Response:
+	url: str
+	status: int
+	headers: dict[str, str]
+	body: bytes
+	
+	@property
+	def text(self) -> str:
+		charset = 'utf-8'
+		content_type = self.headers.get('content-type', '')
+		if 'charset=' in content_type:
+			charset = content_type.split('charset=')[-1].split(';')[0].strip()
+		return self.body.decode(charset, errors='replace')
+
+
+class HttpClient:
+	"""
+	Thread-safe HTTP/1.1 client that keeps idle keep-alive connections per host
+	so consecutive product pages skip the TCP and TLS handshakes.
+	"""
+	
+	def __init__(self, timeout: float = 10, max_idle_per_host: int = 8, max_redirects: int = 5):
+		self.timeout = timeout
+		self.max_idle_per_host = max_idle_per_host
+		self.max_redirects = max_redirects
+		
+		self._idle: dict[tuple[str, str], list[HTTPConnection]] = {}
+		self._active: set[HTTPConnection] = set()
+		self._lock = Lock()
+	
+	def get(
+		self,
+		url: str,
+		headers: dict[str, str] | None = None,
+		timeout: float | None = None
+	) -> Response:
+		for _ in range(self.max_redirects + 1):
+			response = self._request(url, headers or {}, timeout or self.timeout)
+			location = response.headers.get('location')
+			if response.status not in REDIRECT_CODES or not location:
+				return response
+			url = urljoin(url, location)
+		
+		raise HTTPException(f'Too many redirects: {url}')
+	
+	def close(self):
+		with self._lock:
+			connections = [conn for pool in self._idle.values() for conn in pool]
+			self._idle.clear()
+		
+		for conn in connections:
+			conn.close()
+	
+	def abort(self):
+		"""Shut down the connections of requests in progress, so they fail right away."""
+		with self._lock:
+			active = list(self._active)
+		
+		for conn in active:
+			if conn.sock is not None:
+				try:
+					conn.sock.shutdown(socket.SHUT_RDWR)
+				except OSError:
+					pass
+	
+	def _request(self, url: str, headers: dict[str, str], timeout: float) -> Response:
+		parts = urlsplit(url)
+		key = (parts.scheme, parts.netloc)
+		path = parts.path or '/'
+		if parts.query:
+			path += '?' + parts.query
+		
+		request_headers = {**DEFAULT_HEADERS, **headers}
+		
+		conn, reused = self._checkout(key)
+		try:
+			raw, body = self._send(conn, path, request_headers, timeout)
+		except (HTTPException, OSError):
+			self._forget(conn)
+			if not reused:
+				raise
+			# La conexión reutilizada pudo haber sido cerrada por el servidor
+			conn = self._connect(key)
+			try:
+				raw, body = self._send(conn, path, request_headers, timeout)
+			except (HTTPException, OSError):
+				self._forget(conn)
+				raise
+		
+		response_headers = {name.lower(): value for name, value in raw.getheaders()}
+		body = decode_body(body, response_headers.get('content-encoding', ''))
+		
+		if raw.will_close:
+			self._forget(conn)
+			conn.close()
+		else:
+			self._checkin(key, conn)
+		
+		return Response(url, raw.status, response_headers, body)
+	
+	@staticmethod
+	def _send(
+		conn: HTTPConnection,
+		path: str,
+		headers: dict[str, str],
+		timeout: float
+	) -> tuple[HTTPResponse, bytes]:
+		conn.timeout = timeout
+		if conn.sock is not None:
+			conn.sock.settimeout(timeout)
+		try:
+			conn.request('GET', path, headers=headers)
+			raw = conn.getresponse()
+			return raw, raw.read()
+		except (HTTPException, OSError):
+			conn.close()
+			raise
+	
+	def _checkout(self, key: tuple[str, str]) -> tuple[HTTPConnection, bool]:
+		with self._lock:
+			pool = self._idle.get(key)
+			if pool:
+				conn = pool.pop()
+				self._active.add(conn)
+				return conn, True
+		return self._connect(key), False
+	
+	def _checkin(self, key: tuple[str, str], conn: HTTPConnection):
+		with self._lock:
+			self._active.discard(conn)
+			pool = self._idle.setdefault(key, [])
+			if len(pool) < self.max_idle_per_host:
+				pool.append(conn)
+				return
+		conn.close()
+	
+	def _connect(self, key: tuple[str, str]) -> HTTPConnection:
+		scheme, netloc = key
+		if scheme == 'https':
+			conn = HTTPSConnection(netloc, timeout=self.timeout)
+		else:
+			conn = HTTPConnection(netloc, timeout=self.timeout)
+		
+		with self._lock:
+			self._active.add(conn)
+		return conn
+	
+	def _forget(self, conn: HTTPConnection):
+		with self._lock:
+			self._active.discard(conn)
\ No newline at end of file
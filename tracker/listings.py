@@ -0,0 +1,80 @@
+from typing import Optional
+from urllib.parse import urljoin
+
+from pandas import Series
+
+from tracker.cancel import Deadline
+from tracker.extraction import LISTING_CARD, LISTING_NEXT_PAGE, LISTING_SPEC, extract
+from tracker.fetchers import FetchError, MaintenanceError
+from tracker.http import HttpClient
+from tracker.parser import Document, parse_html
+from tracker.urls import canonicalize
+
+# Columnas de la fila de producto que actualiza cada tarjeta de un listado
+LISTING_FIELDS = ['product', 'current_price', 'currency', 'free_ship', 'with_discount', 'available']
+
+
+def parse_listing(document: Document, base_url: str) -> tuple[list[dict], Optional[str]]:
+	"""
+	Every result card of a search or listing page as product fields keyed
+	by canonical `url`, plus the absolute URL of the next page, if any.
+	Sponsored click-tracking links, which carry no item id, are skipped.
+	"""
+	cards = []
+	for card in document.select(LISTING_CARD):
+		values, _ = extract(card, LISTING_SPEC)
+		if values['link']:
+			cards.append(values)
+	
+	items = []
+	if cards:
+		links = canonicalize(Series([urljoin(base_url, card['link']) for card in cards]))
+		for card, url, valid in zip(cards, links['url'], links['valid']):
+			if not valid or not (url.startswith('https://articulo.') or '/p/ML' in url):
+				continue
+			items.append(
+				{
+					'url': url,
+					'product': card['title'],
+					'current_price': card['price'],
+					'currency': card['currency'],
+					'free_ship': card['free_ship'],
+					'with_discount': card['with_discount'],
+					'available': card['price'] is not None
+				}
+			)
+	
+	next_page = document.select(LISTING_NEXT_PAGE)
+	next_url = next_page[0].get('href') if next_page else None
+	return items, urljoin(base_url, next_url) if next_url else None
+
+
+def fetch_listing(client: HttpClient, url: str, max_pages: int, deadline: Deadline) -> list[dict]:
+	"""Follow the pagination of a listing from `url`, up to `max_pages` pages."""
+	items: dict[str, dict] = {}
+	page_url: Optional[str] = url
+	
+	for _ in range(max_pages):
+		if page_url is None:
+			break
+		
+		try:
+			response = client.get(page_url, timeout=deadline.remaining())
+		except Exception as e:
+			deadline.remaining()
+			raise FetchError(e) from e
+		
+		if response.status >= 500:
+			raise MaintenanceError(f'HTTP {response.status}')
+		if response.status != 200:
+			raise FetchError(f'HTTP {response.status}')
+		
+		document = parse_html(response.text)
+		if 'Error!' in document.title:
+			raise MaintenanceError(document.title)
+		
+		page_items, page_url = parse_listing(document, response.url)
+		for item in page_items:
+			items.setdefault(item['url'], item)
+	
+	return list(items.values())
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+In-process instrumentation of the tracking hot path: counters, gauges and
+per-stage timing histograms, read by the diagnostics tab and the optional
+plain-text endpoint on localhost. Nothing here imports Qt.
+"""
+import cProfile
+import pstats
+import sys
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Iterator, Optional
+
+# Límite superior de cada bucket de los histogramas, en milisegundos
+BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+PREFIX = 'ml_tracker_'
+# Desde 3.12 cProfile va sobre sys.monitoring: un solo perfil activo por proceso, que ve todos los hilos
+PROCESS_WIDE_PROFILE = sys.version_info >= (3, 12)
+
+
+class Histogram:
+	"""Durations in milliseconds, counted in the fixed BUCKETS."""
+	
+	__slots__ = ('buckets', 'count', 'total', 'max')
+	
+	def __init__(self):
+		self.buckets = [0] * (len(BUCKETS) + 1)
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+	
+	def observe(self, ms: float):
+		self.buckets[bisect_left(BUCKETS, ms)] += 1
+		self.count += 1
+		self.total += ms
+		self.max = max(self.max, ms)
+	
+	def quantile(self, q: float) -> float:
+		"""Upper bound of the bucket holding the `q` quantile, never above the max seen."""
+		rank = q * self.count
+		seen = 0
+		for bound, count in zip(BUCKETS, self.buckets):
+			seen += count
+			if count and seen >= rank:
+				return min(bound, self.max)
+		return self.max
+
+
+class Metrics:
+	"""Thread-safe registry; names are created on first use."""
+	
+	def __init__(self):
+		self._lock = Lock()
+		self.counters: dict[str, int] = {}
+		self.gauges: dict[str, float] = {}
+		self.histograms: dict[str, Histogram] = {}
+	
+	def count(self, name: str, amount: int = 1):
+		with self._lock:
+			self.counters[name] = self.counters.get(name, 0) + amount
+	
+	def gauge(self, name: str, value: float):
+		with self._lock:
+			self.gauges[name] = value
+	
+	def observe(self, name: str, ms: float):
+		with self._lock:
+			histogram = self.histograms.get(name)
+			if histogram is None:
+				histogram = self.histograms[name] = Histogram()
+			histogram.observe(ms)
+	
+	@contextmanager
+	def timer(self, name: str) -> Iterator[None]:
+		"""Time the block into the `name` histogram, also when it raises."""
+		started = perf_counter()
+		try:
+			yield
+		finally:
+			self.observe(name, (perf_counter() - started) * 1000)
+	
+	def snapshot(self) -> dict:
+		with self._lock:
+			return {
+				'counters': dict(self.counters),
+				'gauges': dict(self.gauges),
+				'timers': {
+					name: {
+						'count': histogram.count,
+						'total_ms': histogram.total,
+						'p50_ms': histogram.quantile(0.5),
+						'p95_ms': histogram.quantile(0.95),
+						'max_ms': histogram.max
+					}
+					for name, histogram in self.histograms.items()
+				}
+			}
+	
+	def render(self) -> str:
+		"""Everything in the Prometheus text format, timers as `<name>_ms` histograms."""
+		lines = []
+		with self._lock:
+			for name, value in sorted(self.counters.items()):
+				lines += [f'# TYPE {PREFIX}{name}_total counter', f'{PREFIX}{name}_total {value}']
+			for name, value in sorted(self.gauges.items()):
+				lines += [f'# TYPE {PREFIX}{name} gauge', f'{PREFIX}{name} {value}']
+			for name, histogram in sorted(self.histograms.items()):
+				metric = f'{PREFIX}{name}_ms'
+				lines.append(f'# TYPE {metric} histogram')
+				cumulative = 0
+				for bound, count in zip(BUCKETS, histogram.buckets):
+					cumulative += count
+					lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+				lines += [
+					f'{metric}_bucket{{le="+Inf"}} {histogram.count}',
+					f'{metric}_sum {histogram.total:.3f}',
+					f'{metric}_count {histogram.count}'
+				]
+		return '\n'.join(lines) + '\n'
+	
+	def reset(self):
+		with self._lock:
+			self.counters.clear()
+			self.gauges.clear()
+			self.histograms.clear()
+
+
+class CycleProfiler:
+	"""
+	cProfile over a single cycle, profiled from `start` to `stop`. Before
+	Python 3.12 a profile only sees its own thread, so each fetch thread
+	also profiles its work under `thread()` and the stats are merged into
+	one file; from 3.12 on the one profile already sees every thread.
+	Profiler errors are printed and never reach the fetch they wrap.
+	"""
+	
+	def __init__(self):
+		self._lock = Lock()
+		self._main: Optional[cProfile.Profile] = None
+		self._threads: list[cProfile.Profile] = []
+		self.path: Optional[Path] = None
+	
+	@property
+	def active(self) -> bool:
+		return self.path is not None
+	
+	def start(self, path: Path):
+		main = cProfile.Profile()
+		try:
+			main.enable()
+		except ValueError as e:
+			# Otro perfilador ya está activo en el proceso
+			print(e)
+			return
+		
+		with self._lock:
+			self.path = path
+			self._threads = []
+		self._main = main
+	
+	@contextmanager
+	def thread(self) -> Iterator[None]:
+		if self.path is None or PROCESS_WIDE_PROFILE:
+			yield
+			return
+		
+		profile: Optional[cProfile.Profile] = cProfile.Profile()
+		try:
+			profile.enable()
+		except ValueError as e:
+			print(e)
+			profile = None
+		
+		try:
+			yield
+		finally:
+			if profile is not None:
+				profile.disable()
+				with self._lock:
+					if self.path is not None:
+						self._threads.append(profile)
+	
+	def stop(self) -> Optional[Path]:
+		"""Write the merged stats; returns their path, or None if nothing was being profiled."""
+		with self._lock:
+			path, self.path = self.path, None
+			profiles, self._threads = self._threads, []
+		main, self._main = self._main, None
+		if path is None or main is None:
+			return None
+		
+		try:
+			main.disable()
+			stats = pstats.Stats()
+			for profile in [main, *profiles]:
+				profile.create_stats()
+				# pstats no acepta un perfil vacío
+				if profile.stats:
+					stats.add(profile)
+			path.parent.mkdir(parents=True, exist_ok=True)
+			stats.dump_stats(path)
+		except Exception as e:
+			print(e)
+			return None
+		return path
+
+
+metrics = Metrics()
+profiler = CycleProfiler()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+	
+	def do_GET(self):
+		if self.path.split('?')[0] not in ('/', '/metrics'):
+			self.send_error(404)
+			return
+		
+		body = metrics.render().encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+	
+	def log_message(self, format, *args):
+		pass
+
+
+def serve(port: int) -> ThreadingHTTPServer:
+	"""Serve `metrics` on 127.0.0.1:`port` from a background thread; only local clients can reach it."""
+	server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+	server.daemon_threads = True
+	Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+	return server
\ No newline at end of file
@@ -0,0 +1,155 @@
+import re
+from html.parser import HTMLParser
+from typing import Iterator, Optional
+
+VOID_TAGS = {
+	'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source',
+	'track', 'wbr'
+}
+RAW_TAGS = {'script', 'style', 'noscript', 'template'}
+
+_COMPOUND = re.compile(r'([a-z0-9]+)?((?:[#.][\w-]+)*)', re.IGNORECASE)
+_PARTS = re.compile(r'[#.][\w-]+')
+
+
+class Node:
+	"""Minimal DOM element, just enough to look fields up by id, class and tag."""
+	
+	__slots__ = ('tag', 'attrs', 'children', 'classes')
+	
+	def __init__(self, tag: str, attrs: dict[str, str]):
+		self.tag = tag
+		self.attrs = attrs
+		self.children: list['Node | str'] = []
+		self.classes = set(attrs.get('class', '').split())
+	
+	def get(self, attr: str, default: Optional[str] = None) -> Optional[str]:
+		return self.attrs.get(attr, default)
+	
+	def iter(self) -> Iterator['Node']:
+		stack = [self]
+		while stack:
+			node = stack.pop()
+			yield node
+			stack.extend(child for child in reversed(node.children) if isinstance(child, Node))
+	
+	def matches(self, tag: Optional[str] = None, cls: Optional[str] = None) -> bool:
+		return (tag is None or self.tag == tag) and (cls is None or cls in self.classes)
+	
+	def find(self, tag: Optional[str] = None, cls: Optional[str] = None) -> Optional['Node']:
+		return next((node for node in self.iter() if node.matches(tag, cls)), None)
+	
+	def find_all(self, tag: Optional[str] = None, cls: Optional[str] = None) -> list['Node']:
+		return [node for node in self.iter() if node.matches(tag, cls)]
+	
+	def select(self, selector: str) -> list['Node']:
+		"""
+		Descendants matching a CSS selector made of tag, #id and .class compounds
+		joined by spaces. For a comma-separated list, the first alternative with
+		any match wins, same as the in-browser extraction script.
+		"""
+		for alternative in selector.split(','):
+			nodes = self._select(alternative.split())
+			if nodes:
+				return nodes
+		return []
+	
+	def _select(self, compounds: list[str]) -> list['Node']:
+		scopes: list[Node] = [self]
+		for compound in compounds:
+			tag, rest = _COMPOUND.fullmatch(compound).groups()
+			parts = _PARTS.findall(rest)
+			element_id = next((part[1:] for part in parts if part[0] == '#'), None)
+			classes = {part[1:] for part in parts if part[0] == '.'}
+			
+			found: dict[int, Node] = {}
+			for scope in scopes:
+				for node in scope.iter():
+					if node is scope:
+						continue
+					if (
+						(tag is None or node.tag == tag.lower()) and
+						(element_id is None or node.attrs.get('id') == element_id) and
+						classes <= node.classes
+					):
+						found.setdefault(id(node), node)
+			scopes = list(found.values())
+		return scopes
+	
+	@property
+	def text(self) -> str:
+		parts = []
+		stack: list['Node | str'] = [self]
+		while stack:
+			node = stack.pop()
+			if isinstance(node, str):
+				parts.append(node)
+			elif node.tag not in RAW_TAGS:
+				stack.extend(reversed(node.children))
+		return ' '.join(''.join(parts).split())
+
+
+class Document(Node):
+	
+	__slots__ = ('ids', 'title')
+	
+	def __init__(self):
+		super().__init__('#document', {})
+		self.ids: dict[str, Node] = {}
+		self.title = ''
+	
+	def by_id(self, element_id: str) -> Optional[Node]:
+		return self.ids.get(element_id)
+	
+	def _select(self, compounds: list[str]) -> list[Node]:
+		# Un id al principio se resuelve con el índice en vez de recorrer todo el árbol
+		if compounds and _PARTS.fullmatch(compounds[0]) and compounds[0][0] == '#':
+			node = self.ids.get(compounds[0][1:])
+			if node is None:
+				return []
+			return node._select(compounds[1:]) if compounds[1:] else [node]
+		return super()._select(compounds)
+
+
+class _TreeBuilder(HTMLParser):
+	
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.document = Document()
+		self.stack: list[Node] = [self.document]
+	
+	def handle_starttag(self, tag, attrs):
+		node = Node(tag, {key: value or '' for key, value in attrs})
+		self.stack[-1].children.append(node)
+		
+		element_id = node.attrs.get('id')
+		if element_id and element_id not in self.document.ids:
+			self.document.ids[element_id] = node
+		
+		if tag not in VOID_TAGS:
+			self.stack.append(node)
+	
+	def handle_startendtag(self, tag, attrs):
+		self.handle_starttag(tag, attrs)
+		if tag not in VOID_TAGS:
+			self.stack.pop()
+	
+	def handle_endtag(self, tag):
+		# Cierra hasta la etiqueta correspondiente, ignorando cierres huérfanos
+		for i in range(len(self.stack) - 1, 0, -1):
+			if self.stack[i].tag == tag:
+				del self.stack[i:]
+				return
+	
+	def handle_data(self, data):
+		node = self.stack[-1]
+		node.children.append(data)
+		if node.tag == 'title' and not self.document.title:
+			self.document.title = ' '.join(data.split())
+
+
+def parse_html(html: str) -> Document:
+	builder = _TreeBuilder()
+	builder.feed(html)
+	builder.close()
+	return builder.document
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+The record a product travels in between TrackerWorker and the fetch
+workers, and how finished records are written back to the DataFrame.
+"""
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from tracker.store import COLUMNS, DTYPES
+
+
+@dataclass(slots=True)
+class ProductResult:
+	"""
+	One product row plus its `index` label in `TrackerWorker.data`. It can be
+	indexed by column name, so the engine treats it like any other row, and
+	each worker owns its record: nothing is shared with the GUI thread.
+	The fields after `index` follow COLUMNS; `unchanged` is set by the
+	worker when the page read the same as last time and nothing else was.
+	"""
+	
+	index: int
+	url: str
+	previous_price: float
+	current_price: float
+	free_ship: bool
+	available: bool
+	currency: Optional[str]
+	product: Optional[str]
+	with_discount: bool
+	checked_at: float
+	source: Optional[str]
+	etag: Optional[str]
+	last_modified: Optional[str]
+	digest: Optional[str]
+	unchanged: bool = False
+	
+	def __getitem__(self, column: str) -> Any:
+		return getattr(self, column)
+	
+	def __setitem__(self, column: str, value: Any):
+		setattr(self, column, value)
+	
+	def to_dict(self) -> dict:
+		return {column: getattr(self, column) for column in COLUMNS}
+
+
+def product_results(data: DataFrame) -> list[ProductResult]:
+	"""A record per row of `data`, read column-wise instead of with iterrows."""
+	columns = [data[column].tolist() for column in COLUMNS]
+	return [ProductResult(*values) for values in zip(data.index.tolist(), *columns)]
+
+
+def write_results(data: DataFrame, positions: np.ndarray, results: list[ProductResult]):
+	"""
+	Write `results` into `data` at the integer `positions`, one typed column at
+	a time, so the columns keep DTYPES.
+	"""
+	for column in COLUMNS:
+		values = np.array([getattr(result, column) for result in results], dtype=DTYPES[column])
+		data.iloc[positions, data.columns.get_loc(column)] = values
\ No newline at end of file
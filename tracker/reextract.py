@@ -0,0 +1,129 @@
+"""
+Offline re-extraction: runs the current PRODUCT_SPEC over the pages in the
+archive, in a process pool, to repair or backfill the stored products and,
+optionally, their price history. Nothing is downloaded.
+"""
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import monotonic, perf_counter, time
+from typing import Optional, TextIO
+
+from tracker.archive import PageArchive, read_blob
+from tracker.config import load_settings
+from tracker.engine import apply_fields
+from tracker.extraction import PRODUCT_SPEC, extract
+from tracker.fetchers import build_product
+from tracker.history import PriceHistory
+from tracker.parser import parse_html
+from tracker.store import ProductStore, observation
+
+
+def extract_page(job: tuple[str, str]) -> tuple[Optional[dict], Optional[str]]:
+	"""Runs in the worker processes: `(path, codec)` to `(fields, error)`."""
+	path, codec = job
+	started = perf_counter()
+	try:
+		body = read_blob(Path(path), codec)
+		values, timings = extract(parse_html(body.decode('utf-8', errors='replace')), PRODUCT_SPEC)
+		return build_product(values, timings, len(body), started), None
+	except Exception as e:
+		# Una página ilegible, sea cual sea el error, no debe cortar el resto del pool
+		return None, f'{type(e).__name__}: {e}'
+
+
+def reextract(
+	base_path: Path,
+	workers: Optional[int] = None,
+	since: Optional[float] = None,
+	history: bool = False,
+	out: TextIO = sys.stdout
+) -> int:
+	"""
+	Re-extract every archived page fetched at or after `since`. A product row
+	is only rewritten when its newest archived page is at least as recent as
+	its last check; with `history` the archived observations also replace
+	the price history runs that came from those pages, keeping the ones
+	read without archiving.
+	Returns 0, or 1 if some page could not be extracted.
+	"""
+	def emit(event: str, **fields):
+		out.write(json.dumps({'ts': round(time(), 3), 'event': event, **fields}, ensure_ascii=False) + '\n')
+		out.flush()
+	
+	settings = load_settings(str(base_path.joinpath('settings.ini')))
+	# Margen entre que se archiva la página y se marca el producto como chequeado
+	slack = settings.get('GENERAL', 'fetch_timeout', 'int')
+	
+	archive = PageArchive(
+		base_path.joinpath('pages'),
+		settings.get('GENERAL', 'archive_max_mb', 'int') * 1024 * 1024,
+		settings.get('GENERAL', 'archive_codec', 'str')
+	)
+	store = ProductStore(base_path.joinpath('products.db'))
+	started = monotonic()
+	
+	try:
+		pages = archive.pages(since)
+		# Una página idéntica en varios ciclos se extrae una sola vez
+		blobs = {digest: codec for _, _, digest, codec in pages}
+		emit('reextract_start', pages=len(pages), blobs=len(blobs))
+		
+		jobs = [(str(archive.path(digest, codec)), codec) for digest, codec in blobs.items()]
+		with ProcessPoolExecutor(workers) as pool:
+			results = dict(zip(blobs, pool.map(extract_page, jobs, chunksize=32)))
+		
+		rows = {row['url']: row for row in store.rows()}
+		checked = {url: row['checked_at'] for url, row in rows.items()}
+		rebuilt: dict[str, dict] = {}
+		observations = []
+		counts = {'extracted': 0, 'failed': 0, 'unknown': 0, 'stale': 0}
+		
+		for url, fetched_at, digest, _ in pages:
+			fields, error = results[digest]
+			if fields is None:
+				counts['failed'] += 1
+				emit('page_failed', url=url, fetched_at=fetched_at, error=error)
+				continue
+			
+			row = rows.get(url)
+			if row is None:
+				# El producto se borró después de archivar la página
+				counts['unknown'] += 1
+				continue
+			
+			counts['extracted'] += 1
+			apply_fields(row, fields, lambda message, level, notify: None)
+			row['checked_at'] = fetched_at
+			observations.append(observation(row))
+			rebuilt[url] = row
+		
+		updated = []
+		for url, row in rebuilt.items():
+			if checked[url] is not None and row['checked_at'] < checked[url] - slack:
+				# Hay datos más nuevos que la última página archivada (por ejemplo, de Selenium)
+				counts['stale'] += 1
+				continue
+			updated.append(row)
+		
+		if updated:
+			store.upsert(updated)
+		if history and observations:
+			price_history = PriceHistory(store.path)
+			try:
+				price_history.rewrite(observations, slack)
+			finally:
+				price_history.close()
+		
+		emit(
+			'reextract_end',
+			seconds=round(monotonic() - started, 3),
+			products=len(updated),
+			observations=len(observations) if history else 0,
+			**counts
+		)
+		return 1 if counts['failed'] else 0
+	finally:
+		archive.close()
+		store.close()
\ No newline at end of file
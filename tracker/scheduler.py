@@ -0,0 +1,109 @@
+import heapq
+from dataclasses import dataclass
+from typing import Iterable
+
+
+@dataclass
+class _Entry:
+	due: float
+	multiplier: float = 1.0
+	last_checked: float | None = None
+
+
+@dataclass
+class SchedulerStats:
+	ticks: int = 0
+	fetches: int = 0
+	possible_fetches: int = 0
+	changes: int = 0
+	latency_total: float = 0.0
+	latency_samples: int = 0
+	
+	@property
+	def fetches_saved(self) -> int:
+		return self.possible_fetches - self.fetches
+	
+	@property
+	def mean_detection_latency(self) -> float:
+		"""Mean time between the previous check and the one that saw a change, in seconds."""
+		return self.latency_total / self.latency_samples if self.latency_samples else 0.0
+
+
+class Scheduler:
+	"""
+	Adaptive per-product schedule kept on a min-heap of due times. Products
+	that change, are discounted or come back in stock are checked every
+	`interval`; each check without changes multiplies the wait by `growth`,
+	up to `max_backoff` intervals.
+	"""
+	
+	def __init__(self, interval: float, max_backoff: float = 16, growth: float = 2.0):
+		self.interval = interval
+		self.max_backoff = max_backoff
+		self.growth = growth
+		self.stats = SchedulerStats()
+		
+		self._entries: dict[str, _Entry] = {}
+		self._heap: list[tuple[float, str]] = []
+	
+	def sync(self, urls: Iterable[str], now: float):
+		"""Schedule new URLs right away and forget the ones no longer tracked."""
+		urls = set(urls)
+		
+		for url in urls - self._entries.keys():
+			self._entries[url] = _Entry(now)
+			heapq.heappush(self._heap, (now, url))
+		
+		for url in self._entries.keys() - urls:
+			del self._entries[url]
+	
+	def due(self, now: float) -> list[str]:
+		"""
+		Pop the URLs due by the end of this tick. Anything due within half an
+		interval goes now, so products don't slip a whole tick on timer jitter.
+		"""
+		limit = now + self.interval / 2
+		due = []
+		
+		while self._heap and self._heap[0][0] <= limit:
+			time, url = heapq.heappop(self._heap)
+			entry = self._entries.get(url)
+			# Entradas obsoletas: URL eliminada o reprogramada
+			if entry is None or entry.due != time:
+				continue
+			due.append(url)
+			
+			# Reintento provisorio por si el chequeo nunca informa resultado
+			entry.due = now + self.interval
+			heapq.heappush(self._heap, (entry.due, url))
+		
+		self.stats.ticks += 1
+		self.stats.fetches += len(due)
+		self.stats.possible_fetches += len(self._entries)
+		return due
+	
+	def record(self, url: str, now: float, observed: bool, changed: bool = False, hot: bool = False):
+		"""Reschedule `url` after a check; failed checks are retried on the next tick."""
+		entry = self._entries.get(url)
+		if entry is None:
+			return
+		
+		if observed:
+			if changed:
+				self.stats.changes += 1
+				if entry.last_checked is not None:
+					self.stats.latency_total += now - entry.last_checked
+					self.stats.latency_samples += 1
+			
+			if changed or hot:
+				entry.multiplier = 1.0
+			else:
+				entry.multiplier = min(self.max_backoff, entry.multiplier * self.growth)
+			
+			entry.last_checked = now
+		
+		entry.due = now + self.interval * (entry.multiplier if observed else 1.0)
+		heapq.heappush(self._heap, (entry.due, url))
+	
+	def __len__(self) -> int:
+		return len(self._entries)
\ No newline at end of file
@@ -1,11 +1,15 @@
+from typing import Callable
+
 from PyQt6.QtCore import QRunnable
-from pandas import Series
-from selenium.webdriver import Chrome
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.expected_conditions import presence_of_element_located
-from selenium.webdriver.support.wait import WebDriverWait
 
+from tracker.api import ItemsClient
+from tracker.cancel import CancelToken, Cancelled, Deadline, DeadlineExceeded
+from tracker.engine import MAINTENANCE_MESSAGE, RECOVERED_MESSAGE, UNCHANGED, apply_fields
+from tracker.fetchers import FetchError, Fetcher, MaintenanceError
+from tracker.http import HttpClient
+from tracker.metrics import metrics, profiler
+from tracker.records import ProductResult
+from tracker.session import SKIPPED, TrackingSession
 from tracker.signals import Signals
 
 
@@ -13,91 +17,132 @@ class ProductRunnable(QRunnable):
 	
 	def __init__(
 		self,
-		index: int,
-		row: Series,
+		result: ProductResult,
 		signals: Signals,
+		fetchers: list[Fetcher],
+		session: TrackingSession,
+		token: CancelToken,
+		timeout: float,
+		conditional: bool = True,
 	):
 		super().__init__()
-		self.index = index
-		self.row = row
+		self.result = result
 		self.signals = signals
+		self.fetchers = fetchers
+		self.session = session
+		self.token = token
+		self.timeout = timeout
+		self.conditional = conditional
 	
 	def run(self):
-		options = Options()
-		options.add_argument("--headless")  # Configurar en modo headless si es necesario
-		options.add_argument("--disable-gpu")  # Desactivar la GPU si es necesario
-		driver = Chrome(options=options)
+		status = self.session.track(self.result, self.fetchers, self.token, self.timeout, self.conditional)
+		if status == SKIPPED and self.token.cancelled:
+			return
 		
-		try:
-			driver.get(self.row['url'])
-			
-			WebDriverWait(driver, 10).until(
-				presence_of_element_located(
-					(By.ID, 'price')
-				)
-			)
-			
-			if 'Error!' in driver.title:
-				self.signals.log.emit(
-					'MercadoLibre está en mantenimiento o fuera de servicio.', 'error', True
-				)
-				return
-			
-			self.row['product'] = driver.title
-			
-			try:
-				driver.find_element(By.ID, 'item_status_short_description_message')
-				self.row['available'] = False
-				self.signals.thread_finished.emit(self.row)
-				return
-			except:
-				pass
-			
-			shipping_container = None
-			
-			try:
-				shipping_container = driver.find_element(By.ID, 'buybox-form')
-			except:
-				try:
-					shipping_container = driver.find_element(By.ID, 'shipping_summary')
-				except:
-					pass
-			
-			if shipping_container is not None:
-				elements = shipping_container.find_elements(By.CLASS_NAME, 'ui-pdp-color--GREEN')
-				self.row['free_ship'] = any(
-					text in el.text for el in elements for text in {'Llega gratis', 'Envío gratis'}
-				)
-			
-			price_container = driver.find_element(By.ID, 'price')
-			
-			try:
-				self.row['currency'] = price_container.find_element(
-					By.CLASS_NAME, 'andes-money-amount__currency-symbol'
-				).text
-			except Exception as e:
-				print(e)
-			
-			try:
-				price_element = price_container.find_element(By.CLASS_NAME,
-				                                             'andes-money-amount__fraction')
-				self.row['previous_price'] = self.row['current_price']
-				self.row['current_price'] = float(price_element.text.replace('.', '').replace(',',
-				                                                                              '.'))
-			except Exception as e:
-				print(e)
-				self.signals.log.emit(f'Error al obtener precio.', 'error', False)
-				self.row['available'] = False
-			
-			try:
-				price_container.find_element(By.CLASS_NAME, 'andes-money-amount__discount')
-				self.row['with_discount'] = True
-			except:
-				pass
+		self.result.unchanged = status == UNCHANGED
+		# Siempre se informa, también con el circuito abierto, para que el ciclo sepa que esta URL terminó
+		self.signals.thread_finished.emit(self.result)
+
+
+class ApiRunnable(QRunnable):
+	"""
+	Reads a batch of products with one items-API multiget, behind the API
+	host's breaker. Products the API cannot resolve, or the whole batch while
+	that breaker is open, are handed to `fallback`, which scrapes them instead.
+	"""
+	
+	def __init__(
+		self,
+		results: list[tuple[ProductResult, str]],
+		signals: Signals,
+		client: ItemsClient,
+		session: TrackingSession,
+		token: CancelToken,
+		timeout: float,
+		fallback: Callable[[ProductResult], None],
+	):
+		super().__init__()
+		self.results = results
+		self.signals = signals
+		self.client = client
+		self.session = session
+		self.token = token
+		self.timeout = timeout
+		self.fallback = fallback
+	
+	def run(self):
+		if self.token.cancelled:
+			return
+		
+		breaker = self.session.breakers.get(self.client.base_url)
+		allowed, probe = breaker.allow()
+		if not allowed:
+			# El scraping pasa por el breaker de cada sitio
+			for result, _ in self.results:
+				self.fallback(result)
+			return
 		
+		ids = [item_id for _, item_id in self.results]
+		found = {}
+		try:
+			with profiler.thread(), metrics.timer('api_multiget'):
+				found = self.client.get_items(ids, Deadline(self.timeout, self.token))
+			if breaker.success():
+				self.signals.log.emit(RECOVERED_MESSAGE, 'success', True)
+		except Cancelled:
+			return
+		except MaintenanceError:
+			metrics.count('maintenance_hits')
+			if breaker.failure():
+				self.signals.log.emit(MAINTENANCE_MESSAGE, 'error', True)
+		except (FetchError, DeadlineExceeded) as e:
+			print(f'api: {e}')
 		except Exception as e:
 			print(e)
-			self.signals.log.emit(f'General error: {e}', 'error', False)
+		finally:
+			if probe:
+				breaker.release()
+		
+		if self.token.cancelled:
+			return
+		
+		self.signals.log.emit(
+			f'api: {len(found)} de {len(ids)} productos en un pedido.', 'debug', False
+		)
 		
-		self.signals.thread_finished.emit(self.index, self.row)
-		driver.quit()
\ No newline at end of file
+		for result, item_id in self.results:
+			fields = found.get(item_id)
+			if fields is None:
+				self.fallback(result)
+				continue
+			
+			apply_fields(result, fields, self.signals.log.emit)
+			self.signals.thread_finished.emit(result)
+
+
+class ListingRunnable(QRunnable):
+	"""Refreshes every product of a search or listing page, following its pagination."""
+	
+	def __init__(
+		self,
+		url: str,
+		signals: Signals,
+		client: HttpClient,
+		max_pages: int,
+		session: TrackingSession,
+		token: CancelToken,
+		timeout: float,
+	):
+		super().__init__()
+		self.url = url
+		self.signals = signals
+		self.client = client
+		self.max_pages = max_pages
+		self.session = session
+		self.token = token
+		self.timeout = timeout
+	
+	def run(self):
+		items = self.session.read_listing(self.client, self.url, self.max_pages, self.token, self.timeout)
+		if not self.token.cancelled:
+			self.signals.listing_finished.emit(self.url, items)
\ No newline at end of file
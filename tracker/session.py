@@ -0,0 +1,175 @@
+"""
+Cycle orchestration shared by the Qt GUI and the headless daemon: which URLs
+are due, fetching each one behind its site's breaker and what the scheduler
+learns from the outcome. Like tracker.engine, nothing here imports Qt or
+pandas; TrackerWorker adapts it to runnables and signals.
+"""
+from time import time
+from typing import Any, Iterable, Optional
+
+from tracker.breaker import Breakers
+from tracker.cancel import CancelToken, Cancelled, Deadline, DeadlineExceeded
+from tracker.cycle import CycleCoordinator
+from tracker.engine import MAINTENANCE_MESSAGE, READ, RECOVERED_MESSAGE, UNCHANGED, Log, track_product
+from tracker.fetchers import FetchError, Fetcher, MaintenanceError
+from tracker.http import HttpClient
+from tracker.metrics import metrics, profiler
+from tracker.scheduler import Scheduler
+
+# Lo que devuelve track además de los estados de track_product: cancelado o frenado por el breaker
+SKIPPED = 'skipped'
+
+
+def outcome(status: str, row, previous_price: Any, previous_available: Any) -> tuple[bool, bool, bool]:
+	"""
+	What the scheduler learns from tracking `row`, given its price and
+	availability before the fetch: whether it was observed, whether it
+	changed and whether it is hot.
+	"""
+	if status == UNCHANGED:
+		# Igual que la vez anterior: solo se reprograma
+		return True, False, bool(row['with_discount'])
+	if status != READ:
+		return False, False, False
+	
+	back_in_stock = bool(row['available']) and not previous_available
+	changed = row['current_price'] != previous_price or back_in_stock
+	return True, changed, bool(row['with_discount']) or back_in_stock
+
+
+class TrackingSession:
+	"""
+	What a tracker keeps between cycles: the adaptive Scheduler, one breaker
+	per site, the CycleCoordinator of the URLs in flight and the CancelToken
+	of the current fetches. Messages go to `log(message, level, notify)`.
+	"""
+	
+	def __init__(
+		self,
+		interval: float,
+		max_backoff: float,
+		capacity: int,
+		breaker_threshold: int,
+		breaker_cooldown: float,
+		log: Log
+	):
+		self.scheduler = Scheduler(interval, max_backoff)
+		self.breakers = Breakers(breaker_threshold, breaker_cooldown)
+		self.cycle = CycleCoordinator(capacity)
+		self.token = CancelToken()
+		self.log = log
+	
+	def configure(self, interval: float, capacity: int, breaker_threshold: int, breaker_cooldown: float):
+		"""Apply the settings read at the start of a cycle."""
+		self.scheduler.interval = interval
+		self.cycle.capacity = capacity
+		self.breakers.threshold = breaker_threshold
+		self.breakers.cooldown = breaker_cooldown
+	
+	def begin(
+		self,
+		products: Iterable[str],
+		listings: Iterable[str],
+		now: float
+	) -> Optional[tuple[list[str], list[str]]]:
+		"""
+		Start a cycle over the due `products` and `listings` not already in
+		flight, returned in that order. None when the previous cycle's backlog
+		still fills the capacity: the cycle is deferred until it drains.
+		"""
+		if self.cycle.saturated:
+			self.cycle.defer()
+			return None
+		
+		listings = set(listings)
+		self.scheduler.sync([*products, *listings], now)
+		urls = self.cycle.begin(self.scheduler.due(now))
+		return [url for url in urls if url not in listings], [url for url in urls if url in listings]
+	
+	def track(
+		self,
+		row,
+		fetchers: list[Fetcher],
+		token: CancelToken,
+		timeout: float,
+		conditional: bool = True
+	) -> str:
+		"""track_product behind the site's breaker; SKIPPED when cancelled or refused."""
+		if token.cancelled:
+			return SKIPPED
+		
+		breaker = self.breakers.get(row['url'])
+		allowed, probe = breaker.allow()
+		if not allowed:
+			return SKIPPED
+		
+		try:
+			with profiler.thread():
+				return track_product(row, fetchers, breaker, Deadline(timeout, token), self.log, conditional)
+		except Cancelled:
+			return SKIPPED
+		finally:
+			if probe:
+				breaker.release()
+	
+	def read_listing(
+		self,
+		client: HttpClient,
+		url: str,
+		max_pages: int,
+		token: CancelToken,
+		timeout: float
+	) -> list[dict] | None:
+		"""The cards of the listing at `url`, or None when it could not be read."""
+		# Los listados usan pandas para canonicalizar: solo se carga si hay alguno
+		from tracker.listings import fetch_listing
+		
+		if token.cancelled:
+			return None
+		
+		breaker = self.breakers.get(url)
+		allowed, probe = breaker.allow()
+		if not allowed:
+			return None
+		
+		try:
+			with profiler.thread(), metrics.timer('listing'):
+				items = fetch_listing(client, url, max_pages, Deadline(timeout, token))
+			if breaker.success():
+				self.log(RECOVERED_MESSAGE, 'success', True)
+			return items
+		except Cancelled:
+			return None
+		except MaintenanceError:
+			metrics.count('maintenance_hits')
+			if breaker.failure():
+				self.log(MAINTENANCE_MESSAGE, 'error', True)
+		except (FetchError, DeadlineExceeded) as e:
+			self.log(f'Error al leer el listado: {e}', 'error', False)
+		except Exception as e:
+			print(e)
+			self.log(f'General error: {e}', 'error', False)
+		finally:
+			if probe:
+				breaker.release()
+		return None
+	
+	def record(self, url: str, observed: bool, changed: bool = False, hot: bool = False):
+		"""Reschedule `url` after its fetch, with what the fetch learnt."""
+		self.scheduler.record(url, time(), observed, changed=changed, hot=hot)
+	
+	def finish(self, url: str) -> bool:
+		"""Mark `url` done; True when that ended the cycle."""
+		if not self.cycle.finish(url):
+			return False
+		metrics.observe('cycle', self.cycle.last_duration * 1000)
+		return True
+	
+	def stop(self):
+		"""Cancel the fetches in flight; the next cycle starts with a new token."""
+		self.token.cancel()
+		self.token = CancelToken()
+		self.cycle.reset()
+	
+	def stats(self) -> dict:
+		return {**self.cycle.stats(), **self.breakers.stats()}
\ No newline at end of file
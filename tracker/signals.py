@@ -1,9 +1,12 @@
 from PyQt6.QtCore import QObject, pyqtSignal
-from pandas import Series
 
 
 class Signals(QObject):
 	status: pyqtSignal = pyqtSignal(str, str)
 	log: pyqtSignal = pyqtSignal(str, str, bool)
 	updated: pyqtSignal = pyqtSignal()
-	thread_finished: pyqtSignal = pyqtSignal(int, Series)
\ No newline at end of file
+	rows_updated: pyqtSignal = pyqtSignal(list)
+	cycle: pyqtSignal = pyqtSignal(dict)
+	thread_finished: pyqtSignal = pyqtSignal(object)
+	listing_finished: pyqtSignal = pyqtSignal(str, object)
+	loaded: pyqtSignal = pyqtSignal(object)
\ No newline at end of file
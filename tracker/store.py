@@ -0,0 +1,458 @@
+import atexit
+import pickle
+import sqlite3
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic, time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from tracker.history import PriceHistory
+from tracker.metrics import metrics
+
+if TYPE_CHECKING:
+	from pandas import DataFrame
+
+COLUMNS = [
+	'url', 'previous_price', 'current_price', 'free_ship', 'available', 'currency', 'product',
+	'with_discount', 'checked_at', 'source', 'etag', 'last_modified', 'digest'
+]
+# Validadores de la última página leída; no se exportan ni se muestran
+VALIDATOR_COLUMNS = ['etag', 'last_modified', 'digest']
+BOOL_COLUMNS = ['free_ship', 'available', 'with_discount']
+# Fijos para que los resultados se escriban por columna sin volverlas object
+DTYPES = {
+	'url': 'object',
+	'previous_price': 'float64',
+	'current_price': 'float64',
+	'free_ship': 'bool',
+	'available': 'bool',
+	'currency': 'object',
+	'product': 'object',
+	'with_discount': 'bool',
+	'checked_at': 'float64',
+	'source': 'object',
+	'etag': 'object',
+	'last_modified': 'object',
+	'digest': 'object'
+}
+NEW_PRODUCT = {
+	'available': True,
+	'previous_price': 0.0,
+	'current_price': 0.0,
+	'free_ship': False,
+	'with_discount': False
+}
+
+
+class ProductStore:
+	"""
+	SQLite store for the tracked products, one row per URL. Every write bumps
+	a generation counter, so a snapshot of the products taken at generation
+	N can be loaded instead of the table for as long as nothing changed.
+	`synced` is the generation the caller's copy of the products reflects:
+	the one it loaded, moved along by its own writes but not by those of
+	other processes sharing the file.
+	WAL needs shared memory, so processes on different hosts sharing the
+	file have to open it with `journal_mode='DELETE'`.
+	"""
+	
+	def __init__(self, path: Path, journal_mode: str = 'WAL'):
+		self.path = path
+		self.snapshot_path = Path(path).with_suffix('.snapshot')
+		self.synced: Optional[int] = None
+		self._pending: Optional[int] = None
+		self._lock = Lock()
+		
+		self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+		self._conn.execute(f'PRAGMA journal_mode={journal_mode}')
+		self._conn.execute('PRAGMA synchronous=NORMAL')
+		self._conn.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS products (
+				url TEXT PRIMARY KEY,
+				previous_price REAL,
+				current_price REAL,
+				free_ship INTEGER,
+				available INTEGER,
+				currency TEXT,
+				product TEXT,
+				with_discount INTEGER,
+				checked_at REAL,
+				source TEXT,
+				etag TEXT,
+				last_modified TEXT,
+				digest TEXT
+			)
+			"""
+		)
+		self._conn.execute(
+			'CREATE TABLE IF NOT EXISTS listings (url TEXT PRIMARY KEY, added_at REAL)'
+		)
+		self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)')
+		self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+		
+		existing = {row[1] for row in self._conn.execute('PRAGMA table_info(products)')}
+		added = [
+			(column, kind) for column, kind in (
+				('checked_at', 'REAL'),
+				('source', 'TEXT'),
+				('etag', 'TEXT'),
+				('last_modified', 'TEXT'),
+				('digest', 'TEXT')
+			)
+			if column not in existing
+		]
+		for column, kind in added:
+			self._conn.execute(f'ALTER TABLE products ADD COLUMN {column} {kind}')
+		if added:
+			# Un snapshot de antes de la migración no tiene las columnas nuevas
+			self._bump()
+		# Los validadores se guardaban aparte, en memoria de cada proceso
+		self._conn.execute('DROP TABLE IF EXISTS validators')
+	
+	def __len__(self) -> int:
+		with self._lock:
+			return self._conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+	
+	def load(self) -> 'DataFrame':
+		from pandas import DataFrame
+		
+		# Leída antes que las filas: si alguien escribe en el medio, el snapshot queda viejo y no se guarda
+		generation = self.generation
+		data = with_dtypes(DataFrame.from_records(self._select(), columns=COLUMNS))
+		self.synced = generation
+		return data
+	
+	@property
+	def generation(self) -> int:
+		with self._lock:
+			return self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+	
+	def load_snapshot(self) -> Optional['DataFrame']:
+		"""The pickled products, if the snapshot is as recent as the table."""
+		try:
+			with self.snapshot_path.open('rb') as f:
+				snapshot = pickle.load(f)
+		except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+			return None
+		
+		if snapshot.get('generation') != self.generation:
+			return None
+		self.synced = snapshot['generation']
+		return with_dtypes(snapshot['data'])
+	
+	def save_snapshot(self, data: 'DataFrame') -> bool:
+		"""
+		Pickle `data`, the caller's copy of the products, under the `synced`
+		generation. Skipped when the table has moved past it: another process
+		wrote products `data` does not have.
+		"""
+		generation = self.synced
+		if generation is None or generation != self.generation:
+			return False
+		
+		# Se escribe aparte y se renombra, para no dejar un snapshot a medias
+		partial = self.snapshot_path.with_suffix('.snapshot.tmp')
+		with partial.open('wb') as f:
+			pickle.dump({'generation': generation, 'data': data}, f, pickle.HIGHEST_PROTOCOL)
+		partial.replace(self.snapshot_path)
+		return True
+	
+	def rows(self, urls: Optional[list[str]] = None) -> list[dict]:
+		"""Every product, or those in `urls`, as plain dicts for callers that do without pandas."""
+		rows = [dict(zip(COLUMNS, values)) for values in self._select(urls)]
+		for row in rows:
+			for column in BOOL_COLUMNS:
+				row[column] = bool(row[column])
+		return rows
+	
+	def _select(self, urls: Optional[list[str]] = None) -> list[tuple]:
+		query = f'SELECT {", ".join(COLUMNS)} FROM products'
+		with self._lock:
+			if urls is None:
+				return self._conn.execute(query).fetchall()
+			
+			selected = []
+			# SQLite limita la cantidad de parámetros por consulta
+			for start in range(0, len(urls), 500):
+				chunk = urls[start:start + 500]
+				selected += self._conn.execute(
+					f'{query} WHERE url IN ({", ".join("?" * len(chunk))})', chunk
+				).fetchall()
+			return selected
+	
+	def upsert(self, rows: list[dict], chunk_size: int = 1000):
+		"""Write `rows` in one transaction."""
+		if not rows:
+			return
+		
+		placeholders = ', '.join('?' * len(COLUMNS))
+		updates = ', '.join(f'{column} = excluded.{column}' for column in COLUMNS[1:])
+		values = [self._values(row) for row in rows]
+		
+		with self._lock:
+			self._conn.execute('BEGIN')
+			try:
+				for start in range(0, len(values), chunk_size):
+					self._conn.executemany(
+						f'INSERT INTO products ({", ".join(COLUMNS)}) VALUES ({placeholders}) '
+						f'ON CONFLICT(url) DO UPDATE SET {updates}',
+						values[start:start + chunk_size]
+					)
+				self._bump()
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._commit()
+	
+	def replace(self, data: 'DataFrame'):
+		"""Make the store mirror `data` exactly, in a single transaction."""
+		rows = data.to_dict('records')
+		
+		with self._lock:
+			self._conn.execute('BEGIN')
+			try:
+				self._conn.execute('DELETE FROM products')
+				self._conn.executemany(
+					f'INSERT OR REPLACE INTO products ({", ".join(COLUMNS)}) '
+					f'VALUES ({", ".join("?" * len(COLUMNS))})',
+					[self._values(row) for row in rows]
+				)
+				self._bump(mirrored=True)
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._commit()
+	
+	def delete(self, urls: list[str]):
+		"""Forget the products at `urls`, in one transaction."""
+		if not urls:
+			return
+		
+		with self._lock:
+			self._conn.execute('BEGIN')
+			try:
+				# SQLite limita la cantidad de parámetros por consulta
+				for start in range(0, len(urls), 500):
+					chunk = urls[start:start + 500]
+					self._conn.execute(
+						f'DELETE FROM products WHERE url IN ({", ".join("?" * len(chunk))})', chunk
+					)
+				self._bump()
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._commit()
+	
+	def listings(self) -> list[str]:
+		with self._lock:
+			rows = self._conn.execute('SELECT url FROM listings ORDER BY added_at').fetchall()
+		return [row[0] for row in rows]
+	
+	def add_listing(self, url: str):
+		with self._lock:
+			self._conn.execute(
+				'INSERT OR IGNORE INTO listings (url, added_at) VALUES (?, ?)', (url, time())
+			)
+	
+	def remove_listing(self, url: str):
+		"""Forget a listing along with the products it found."""
+		with self._lock:
+			self._conn.execute('BEGIN')
+			try:
+				self._conn.execute('DELETE FROM listings WHERE url = ?', (url,))
+				self._conn.execute('DELETE FROM products WHERE source = ?', (url,))
+				self._bump()
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._commit()
+	
+	def close(self):
+		with self._lock:
+			self._conn.close()
+	
+	def _bump(self, mirrored: bool = False):
+		"""
+		Count a write. Once committed it moves `synced` along if the caller's
+		copy was current before it, or if the write made the table mirror it.
+		"""
+		self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+		generation = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+		synced = mirrored or (self.synced is not None and self.synced == generation - 1)
+		self._pending = generation if synced else None
+	
+	def _commit(self):
+		self._conn.execute('COMMIT')
+		if self._pending is not None:
+			self.synced = self._pending
+			self._pending = None
+	
+	@staticmethod
+	def _values(row: dict) -> tuple:
+		values = []
+		for column in COLUMNS:
+			value = row.get(column)
+			# NaN de pandas se guarda como NULL
+			if isinstance(value, float) and value != value:
+				value = None
+			elif column in BOOL_COLUMNS and value is not None:
+				value = int(bool(value))
+			values.append(value)
+		return tuple(values)
+
+
+def with_dtypes(data: 'DataFrame') -> 'DataFrame':
+	"""`data` cast to DTYPES; missing booleans become False."""
+	for column in BOOL_COLUMNS:
+		data[column] = data[column].notna() & data[column].astype(bool)
+	return data.astype(DTYPES)
+
+
+def new_products(urls: list[str]) -> 'DataFrame':
+	from pandas import DataFrame
+	
+	data = DataFrame({'url': urls}, columns=COLUMNS)
+	for column, value in NEW_PRODUCT.items():
+		data[column] = value
+	return with_dtypes(data)
+
+
+def read_products_excel(path: Path) -> 'DataFrame':
+	from pandas import read_excel
+	
+	data = read_excel(path)
+	for column in COLUMNS:
+		# Las filas importadas ya no son lo que se leyó de sus páginas
+		if column not in data or column in VALIDATOR_COLUMNS:
+			data[column] = None
+	data.drop_duplicates(subset=['url'], inplace=True)
+	return with_dtypes(data[COLUMNS].copy())
+
+
+def observation(row: dict) -> dict:
+	"""
+	The price history entry for a row that was just read. Without stock
+	there is no price: the row keeps showing the last one it had.
+	"""
+	price = row['current_price']
+	if not row['available'] or price is None or not price > 0:
+		price = None
+	
+	return {
+		'url': row['url'],
+		'timestamp': row['checked_at'],
+		'price': price,
+		'currency': row['currency'],
+		'available': row['available'],
+		'free_ship': row['free_ship'],
+		'with_discount': row['with_discount']
+	}
+
+
+class WriteBehind(Thread):
+	"""
+	Collects finished rows and upserts them into the store in batched
+	transactions, off the GUI thread. A batch is written once it reaches
+	`batch_size` rows or `flush_interval` seconds after its first row;
+	later rows for the same URL replace earlier ones still waiting.
+	Observed rows are also appended to the price history. A batch that
+	fails to commit is kept for the next attempt and reported to
+	`log(message, level, notify)`.
+	"""
+	
+	FLUSH = 'flush'
+	STOP = 'stop'
+	
+	def __init__(
+		self,
+		store: ProductStore,
+		history: PriceHistory,
+		batch_size: int = 200,
+		flush_interval: float = 1.0,
+		log: Optional[Callable[[str, str, bool], None]] = None
+	):
+		super().__init__(daemon=True)
+		self.store = store
+		self.history = history
+		self.log = log
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		
+		self._queue: Queue[tuple[dict, bool] | str] = Queue()
+		
+		atexit.register(self.flush)
+	
+	def put(self, row: dict, observed: bool = False):
+		self._queue.put((row, observed))
+	
+	def flush(self):
+		"""Write whatever is pending and block until it is committed."""
+		if self.is_alive():
+			self._queue.put(self.FLUSH)
+			self._queue.join()
+	
+	def stop(self):
+		if self.is_alive():
+			self._queue.put(self.STOP)
+			self.join()
+	
+	def run(self):
+		pending: dict[str, dict] = {}
+		observations: list[dict] = []
+		taken = 0
+		deadline = None
+		# Tras un error se reintenta al vencer el plazo, no con cada fila que llega
+		failed = False
+		
+		while True:
+			timeout = None if deadline is None else max(0.0, deadline - monotonic())
+			try:
+				item = self._queue.get(timeout=timeout)
+				taken += 1
+			except Empty:
+				item = self.FLUSH
+			
+			if isinstance(item, tuple):
+				row, observed = item
+				pending[row['url']] = row
+				if observed:
+					observations.append(observation(row))
+				if deadline is None:
+					deadline = monotonic() + self.flush_interval
+				if failed or len(pending) < self.batch_size:
+					continue
+			
+			# Un flush sin filas no cuenta como escritura en las métricas
+			if pending:
+				try:
+					with metrics.timer('store_write'):
+						self.store.upsert(list(pending.values()))
+					pending.clear()
+				except Exception as e:
+					self._report(f'No se pudieron guardar {len(pending)} productos: {e}')
+			if observations:
+				try:
+					with metrics.timer('history_write'):
+						self.history.append(observations)
+					observations.clear()
+				except Exception as e:
+					self._report(f'No se pudo guardar el historial de {len(observations)} productos: {e}')
+			
+			# Lo que no se pudo escribir queda para el próximo intento
+			failed = bool(pending or observations)
+			deadline = monotonic() + self.flush_interval if failed else None
+			for _ in range(taken):
+				self._queue.task_done()
+			taken = 0
+			
+			if item == self.STOP:
+				return
+	
+	def _report(self, message: str):
+		metrics.count('write_errors')
+		if self.log is None:
+			print(message)
+		else:
+			self.log(message, 'error', False)
\ No newline at end of file
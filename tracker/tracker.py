@@ -1,27 +1,49 @@
+import atexit
 import sys
+from functools import partial
 from pathlib import Path
+from threading import Thread
+from time import strftime, time
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
 
-from PyQt6.QtCore import QObject, QThreadPool
-from pandas import DataFrame, Series, read_excel
-from settings_manager import SettingsManager
+from PyQt6.QtCore import QObject, QThreadPool, QTimer
+from pandas import DataFrame, Series, concat, isna, notna
 
-from tracker.scrapper import ProductRunnable
+from tracker.api import MULTIGET_LIMIT, ItemsClient
+from tracker.config import load_settings
+from tracker.engine import FAILED, READ, UNCHANGED
+from tracker.fetchers import Fetcher, HttpFetcher, SeleniumFetcher
+from tracker.history import PriceHistory
+from tracker.http import HttpClient
+from tracker.listings import LISTING_FIELDS
+from tracker.metrics import metrics, profiler, serve
+from tracker.records import ProductResult, product_results, write_results
+from tracker.scrapper import ApiRunnable, ListingRunnable, ProductRunnable
+from tracker.session import TrackingSession, outcome
 from tracker.signals import Signals
+from tracker.store import (
+	DTYPES,
+	VALIDATOR_COLUMNS,
+	ProductStore,
+	WriteBehind,
+	new_products,
+	read_products_excel,
+)
+from tracker.urls import ImportPlan, item_ids, plan_import
+
+if TYPE_CHECKING:
+	from tracker.archive import PageArchive
+	from tracker.async_engine import AsyncFetchEngine
+	from tracker.drivers import DriverPool
 
 
 class TrackerWorker(QObject):
 	
 	data: DataFrame
+	# Se incrementa con cada cambio en `data`, para que las vistas cacheen lo que derivan
+	version: int = 0
 	
-	settings = SettingsManager(
-		defaults={
-			"GENERAL": {
-				"interval": 1800,
-				"track_on_startup": False,
-				"max_paralell_tracking": 4
-			}
-		}
-	)
+	settings = load_settings()
 	
 	def __init__(self):
 		super().__init__()
@@ -29,12 +51,71 @@ class TrackerWorker(QObject):
 		self.signals = Signals()
 		self.signals.thread_finished.connect(self.handle_thread_result)
 		
+		# Los resultados se aplican a `data` en lotes, no uno por señal
+		self.results: list[ProductResult] = []
+		self.results_timer = QTimer(self)
+		self.results_timer.setSingleShot(True)
+		self.results_timer.setInterval(100)
+		self.results_timer.timeout.connect(self.apply_results)
+		self.signals.listing_finished.connect(self.handle_listing_result)
+		
 		self.threadpool = QThreadPool()
 		self.threadpool.setMaxThreadCount(self.max_paralell_tracking)
+		# Scheduler, breakers y ciclo en curso, compartidos con el daemon
+		self.session = TrackingSession(
+			self.interval,
+			self.max_backoff,
+			self.max_paralell_tracking,
+			self.breaker_threshold,
+			self.breaker_cooldown,
+			self.signals.log.emit
+		)
+		# Ajustes por producto, leídos una vez por ciclo en start: cada lectura vuelve a parsear settings.ini
+		self.timeout = self.fetch_timeout
+		self.conditional = self.conditional_fetch
+		
+		# Selenium y asyncio se importan recién cuando se usan
+		self._drivers: Optional['DriverPool'] = None
+		self.http = HttpClient(max_idle_per_host=self.max_paralell_tracking)
+		self.engine: Optional['AsyncFetchEngine'] = None
 		
 		base_path = Path(getattr(sys, '_MEIPASS', "."))
 		self.excel_path = base_path.joinpath('./products.xlsx')
-		self.load_data()
+		self.archive_path = base_path.joinpath('./pages')
+		self.profiles_path = base_path.joinpath('./profiles')
+		# Archivo para el perfil del próximo ciclo, cuando se pide uno
+		self.profile_path: Optional[Path] = None
+		self._archive: Optional['PageArchive'] = None
+		self.store = ProductStore(base_path.joinpath('./products.db'))
+		self.history = PriceHistory(self.store.path)
+		
+		# Hasta que load_data termine, la vista muestra una tabla vacía
+		self.data = new_products([])
+		self.listings = self.store.listings()
+		self.loaded = False
+		self.signals.loaded.connect(self.apply_loaded)
+		# Registrado antes que WriteBehind: atexit corre al revés, así el snapshot va después del flush
+		atexit.register(self.save_snapshot)
+		
+		self.writer = WriteBehind(self.store, self.history, log=self.signals.log.emit)
+		self.writer.start()
+		
+		self.metrics_server = None
+		if self.metrics_port:
+			try:
+				self.metrics_server = serve(self.metrics_port)
+			except OSError as e:
+				print(e)
+	
+	@property
+	def drivers(self) -> 'DriverPool':
+		if self._drivers is None:
+			from tracker.drivers import DriverPool
+			
+			self._drivers = DriverPool(
+				self.max_paralell_tracking, self.driver_max_pages, self.fast_profile
+			)
+		return self._drivers
 	
 	@property
 	def interval(self) -> int:
@@ -52,6 +133,188 @@ class TrackerWorker(QObject):
 	def max_paralell_tracking(self, value: int):
 		self.settings.set('GENERAL', 'max_paralell_tracking', value)
 	
+	@property
+	def driver_max_pages(self) -> int:
+		return self.settings.get('GENERAL', 'driver_max_pages', 'int')
+	
+	@driver_max_pages.setter
+	def driver_max_pages(self, value: int):
+		self.settings.set('GENERAL', 'driver_max_pages', value)
+	
+	@property
+	def fetch_backend(self) -> str:
+		return self.settings.get('GENERAL', 'fetch_backend', 'str')
+	
+	@fetch_backend.setter
+	def fetch_backend(self, value: str):
+		self.settings.set('GENERAL', 'fetch_backend', value)
+	
+	@property
+	def fetchers(self) -> list[Fetcher]:
+		"""
+		Fetch backends in fallback order; Selenium is always the last resort.
+		With the 'api' backend these scrape what the items API could not resolve.
+		Reads the settings and creates the driver pool on first use, so only
+		the GUI thread evaluates it.
+		"""
+		selenium = SeleniumFetcher(self.drivers)
+		if self.fetch_backend == 'selenium':
+			return [selenium]
+		return [HttpFetcher(self.http, self.archive), selenium]
+	
+	@property
+	def max_backoff(self) -> int:
+		return self.settings.get('GENERAL', 'max_backoff', 'int')
+	
+	@max_backoff.setter
+	def max_backoff(self, value: int):
+		self.settings.set('GENERAL', 'max_backoff', value)
+	
+	@property
+	def fetch_timeout(self) -> int:
+		return self.settings.get('GENERAL', 'fetch_timeout', 'int')
+	
+	@fetch_timeout.setter
+	def fetch_timeout(self, value: int):
+		self.settings.set('GENERAL', 'fetch_timeout', value)
+	
+	@property
+	def fast_profile(self) -> bool:
+		return self.settings.get('GENERAL', 'fast_profile', 'bool')
+	
+	@fast_profile.setter
+	def fast_profile(self, value: bool):
+		self.settings.set('GENERAL', 'fast_profile', value)
+	
+	@property
+	def fetch_engine(self) -> str:
+		return self.settings.get('GENERAL', 'fetch_engine', 'str')
+	
+	@fetch_engine.setter
+	def fetch_engine(self, value: str):
+		self.settings.set('GENERAL', 'fetch_engine', value)
+	
+	@property
+	def max_in_flight(self) -> int:
+		return self.settings.get('GENERAL', 'max_in_flight', 'int')
+	
+	@max_in_flight.setter
+	def max_in_flight(self, value: int):
+		self.settings.set('GENERAL', 'max_in_flight', value)
+	
+	@property
+	def requests_per_second(self) -> int:
+		return self.settings.get('GENERAL', 'requests_per_second', 'int')
+	
+	@requests_per_second.setter
+	def requests_per_second(self, value: int):
+		self.settings.set('GENERAL', 'requests_per_second', value)
+	
+	@property
+	def breaker_threshold(self) -> int:
+		return self.settings.get('GENERAL', 'breaker_threshold', 'int')
+	
+	@breaker_threshold.setter
+	def breaker_threshold(self, value: int):
+		self.settings.set('GENERAL', 'breaker_threshold', value)
+	
+	@property
+	def breaker_cooldown(self) -> int:
+		return self.settings.get('GENERAL', 'breaker_cooldown', 'int')
+	
+	@breaker_cooldown.setter
+	def breaker_cooldown(self, value: int):
+		self.settings.set('GENERAL', 'breaker_cooldown', value)
+	
+	@property
+	def listing_max_pages(self) -> int:
+		return self.settings.get('GENERAL', 'listing_max_pages', 'int')
+	
+	@listing_max_pages.setter
+	def listing_max_pages(self, value: int):
+		self.settings.set('GENERAL', 'listing_max_pages', value)
+	
+	@property
+	def api_base_url(self) -> str:
+		return self.settings.get('GENERAL', 'api_base_url', 'str')
+	
+	@api_base_url.setter
+	def api_base_url(self, value: str):
+		self.settings.set('GENERAL', 'api_base_url', value)
+	
+	@property
+	def api_token(self) -> str:
+		return self.settings.get('GENERAL', 'api_token', 'str')
+	
+	@api_token.setter
+	def api_token(self, value: str):
+		self.settings.set('GENERAL', 'api_token', value)
+	
+	@property
+	def archive_pages(self) -> bool:
+		return self.settings.get('GENERAL', 'archive_pages', 'bool')
+	
+	@archive_pages.setter
+	def archive_pages(self, value: bool):
+		self.settings.set('GENERAL', 'archive_pages', value)
+	
+	@property
+	def archive_max_mb(self) -> int:
+		return self.settings.get('GENERAL', 'archive_max_mb', 'int')
+	
+	@archive_max_mb.setter
+	def archive_max_mb(self, value: int):
+		self.settings.set('GENERAL', 'archive_max_mb', value)
+	
+	@property
+	def archive_codec(self) -> str:
+		return self.settings.get('GENERAL', 'archive_codec', 'str')
+	
+	@archive_codec.setter
+	def archive_codec(self, value: str):
+		self.settings.set('GENERAL', 'archive_codec', value)
+	
+	@property
+	def archive(self) -> Optional['PageArchive']:
+		"""The raw page archive while `archive_pages` is on, opened on first use."""
+		if not self.archive_pages:
+			return None
+		if self._archive is None:
+			from tracker.archive import PageArchive
+			
+			self._archive = PageArchive(self.archive_path, 0, self.archive_codec)
+		self._archive.max_bytes = self.archive_max_mb * 1024 * 1024
+		return self._archive
+	
+	@property
+	def metrics_port(self) -> int:
+		return self.settings.get('GENERAL', 'metrics_port', 'int')
+	
+	@metrics_port.setter
+	def metrics_port(self, value: int):
+		self.settings.set('GENERAL', 'metrics_port', value)
+	
+	@property
+	def conditional_fetch(self) -> bool:
+		return self.settings.get('GENERAL', 'conditional_fetch', 'bool')
+	
+	@conditional_fetch.setter
+	def conditional_fetch(self, value: bool):
+		self.settings.set('GENERAL', 'conditional_fetch', value)
+	
+	@property
+	def use_async(self) -> bool:
+		"""The asyncio engine only speaks HTTP; Selenium stays on the thread pool."""
+		return self.fetch_engine == 'async' and self.fetch_backend == 'http'
+	
+	@property
+	def log_to_file(self) -> bool:
+		return self.settings.get('GENERAL', 'log_to_file', 'bool')
+	
+	@log_to_file.setter
+	def log_to_file(self, value: bool):
+		self.settings.set('GENERAL', 'log_to_file', value)
+	
 	@property
 	def track_on_startup(self) -> bool:
 		return self.settings.get('GENERAL', 'track_on_startup', 'bool')
@@ -60,47 +323,410 @@ class TrackerWorker(QObject):
 	def track_on_startup(self, value: bool):
 		self.settings.set('GENERAL', 'track_on_startup', value)
 	
+	def read_data(self) -> DataFrame:
+		# Migración automática desde la planilla usada antes de la base de datos
+		if not len(self.store) and self.excel_path.exists():
+			self.store.replace(read_products_excel(self.excel_path))
+		
+		snapshot = self.store.load_snapshot()
+		return snapshot if snapshot is not None else self.store.load()
+	
 	def load_data(self):
-		if not self.excel_path.exists():
-			self.data = DataFrame(
-				columns=['url', 'previous_price', 'current_price', 'free_ship', 'available', 'currency',
-				         'product', 'with_discount']
-			)
-			self.save_data()
-		else:
-			self.data = read_excel(self.excel_path)
-			self.data['free_ship'] = self.data['free_ship'].infer_objects(copy=False)
-			self.data.drop_duplicates(subset=['url'], inplace=True)
+		"""Read the products on a background thread; `signals.loaded` fires when done."""
+		Thread(target=lambda: self.signals.loaded.emit(self.read_data()), daemon=True).start()
+	
+	def apply_loaded(self, data: DataFrame):
+		self.data = data
+		self.listings = self.store.listings()
+		self.loaded = True
+		self.version += 1
+		self.signals.updated.emit()
+	
+	def save_snapshot(self):
+		if self.loaded:
+			try:
+				self.store.save_snapshot(self.data)
+			except Exception as e:
+				print(e)
 	
 	def start(self):
-		if self.data.empty:
+		if not self.loaded:
+			return
+		
+		if self.data.empty and not self.listings:
 			self.signals.log.emit('No hay productos configurados para trackear.', "info", True)
 			return
 		
-		self.signals.log.emit(f'Trackeando {len(self.data)} productos...', 'info', False)
+		self.session.configure(
+			self.interval,
+			self.max_in_flight if self.use_async else self.max_paralell_tracking,
+			self.breaker_threshold,
+			self.breaker_cooldown
+		)
+		# Los productos encontrados en un listado se actualizan con el listado
+		products = self.data[self.data['source'].isna()]
+		fresh = not self.session.cycle.running
+		
+		begun = self.session.begin(products['url'], self.listings, time())
+		if begun is None:
+			self.signals.log.emit(
+				'Ciclo pospuesto: el anterior todavía tiene la cola llena.', 'warning', False
+			)
+			self.signals.cycle.emit(self.cycle_stats())
+			return
+		urls, listings = begun
 		
-		self.signals.status.emit('Activo.', 'success')
+		self.timeout = self.fetch_timeout
+		self.conditional = self.conditional_fetch
 		
-		for index, row in self.data.iterrows():
-			runnable = ProductRunnable(
-				index,
-				row,
-				self.signals
+		if self.use_async and self.engine is None:
+			from tracker.async_engine import AsyncFetchEngine
+			
+			self.engine = AsyncFetchEngine(
+				self.signals, self.session.breakers, self.max_in_flight, self.requests_per_second
+			)
+		if self.engine is not None:
+			self.engine.archive = self.archive
+			self.engine.conditional = self.conditional
+		
+		# Solo se perfila un ciclo entero, no uno que se suma al anterior
+		if self.profile_path is not None and fresh and (urls or listings):
+			profiler.start(self.profile_path)
+			self.profile_path = None
+		due = products[products['url'].isin(urls)]
+		
+		message = f'Trackeando {len(due)} de {len(products)} productos'
+		if self.listings:
+			message += f' y {len(listings)} de {len(self.listings)} listados'
+		self.signals.log.emit(f'{message}...', 'info', False)
+		
+		stats = self.session.scheduler.stats
+		self.signals.log.emit(
+			f'Chequeos ahorrados: {stats.fetches_saved}. '
+			f'Latencia media de detección: {stats.mean_detection_latency / 60:.0f} min.',
+			'debug',
+			False
+		)
+		
+		# Se arman acá, en el hilo de la interfaz: los hilos del pool solo reciben la lista
+		fetchers = self.fetchers
+		
+		if self.fetch_backend == 'api':
+			due = self.start_api(due, fetchers)
+		
+		if self.use_async:
+			# Lo que HTTP no pudo leer va directo a Selenium, el último de la lista
+			fallback = partial(self.fallback, fetchers[-1:])
+			for result in product_results(due):
+				self.engine.submit(result, self.session.token, self.timeout, fallback)
+		else:
+			for result in product_results(due):
+				runnable = ProductRunnable(
+					result,
+					self.signals,
+					fetchers,
+					self.session,
+					self.session.token,
+					self.timeout,
+					self.conditional
+				)
+				self.threadpool.start(runnable)
+		
+		max_pages = self.listing_max_pages
+		for url in listings:
+			runnable = ListingRunnable(
+				url,
+				self.signals,
+				self.http,
+				max_pages,
+				self.session,
+				self.session.token,
+				self.timeout * max_pages
 			)
 			self.threadpool.start(runnable)
 		
+		if self.session.cycle.running:
+			self.signals.status.emit('Activo.', 'success')
+		else:
+			self.signals.status.emit('En espera.', 'warning')
+		
+		self.signals.cycle.emit(self.cycle_stats())
+		self.signals.updated.emit()
+	
+	def start_api(self, due: DataFrame, fetchers: list[Fetcher]) -> DataFrame:
+		"""
+		Queue the products with an item id in multiget batches; returns the
+		rest. What the API cannot resolve is scraped with `fetchers`.
+		"""
+		ids = item_ids(due['url'])
+		batched = due[ids.notna()]
+		client = ItemsClient(self.http, self.api_base_url, self.api_token)
+		
+		for start in range(0, len(batched), MULTIGET_LIMIT):
+			batch = batched.iloc[start:start + MULTIGET_LIMIT]
+			runnable = ApiRunnable(
+				[(result, ids[result.index]) for result in product_results(batch)],
+				self.signals,
+				client,
+				self.session,
+				self.session.token,
+				self.timeout,
+				partial(self.scrape, fetchers)
+			)
+			self.threadpool.start(runnable)
+		
+		return due[ids.isna()]
+	
+	def scrape(self, fetchers: list[Fetcher], result: ProductResult):
+		"""Called by ApiRunnable for products the items API could not resolve."""
+		runnable = ProductRunnable(
+			result,
+			self.signals,
+			fetchers,
+			self.session,
+			self.session.token,
+			self.timeout,
+			self.conditional
+		)
+		self.threadpool.start(runnable)
+	
+	def fallback(self, fetchers: list[Fetcher], result: ProductResult):
+		"""Called from the engine's loop for pages HTTP could not read."""
+		runnable = ProductRunnable(
+			result,
+			self.signals,
+			fetchers,
+			self.session,
+			self.session.token,
+			self.timeout,
+			self.conditional
+		)
+		self.threadpool.start(runnable)
+	
+	def profile_next_cycle(self):
+		"""Capture cProfile output for the next cycle into `profiles/`."""
+		self.profile_path = self.profiles_path.joinpath(f'cycle-{strftime("%Y%m%d-%H%M%S")}.prof')
+		self.signals.log.emit('El próximo ciclo se va a perfilar.', 'info', False)
+	
+	def cycle_stats(self) -> dict:
+		stats = self.session.stats()
+		metrics.gauge('queue_depth', stats['queue_depth'])
+		metrics.gauge('active_threads', self.threadpool.activeThreadCount())
+		if self.engine is not None:
+			metrics.gauge('async_in_flight', self.engine.in_flight)
+		if self._drivers is not None:
+			metrics.gauge('browsers', self._drivers.alive)
+		return stats
+	
+	def finish_cycle(self):
+		cycle = self.session.cycle
+		self.save_profile()
 		self.signals.status.emit('En espera.', 'warning')
+		self.signals.log.emit(
+			f'Ciclo terminado en {cycle.last_duration:.1f} segundos: '
+			f'{cycle.changed} con cambios, {cycle.unchanged} sin cambios.',
+			'info',
+			False
+		)
+		
+		if cycle.pending:
+			cycle.pending = False
+			self.start()
+	
+	def save_profile(self):
+		path = profiler.stop()
+		if path is not None:
+			self.signals.log.emit(f'Perfil del ciclo guardado en {path}.', 'info', False)
+	
+	def handle_thread_result(self, result: ProductResult):
+		self.results.append(result)
+		if not self.results_timer.isActive():
+			self.results_timer.start()
+	
+	def apply_results(self):
+		"""Write the results received since the last batch into `data` and the store."""
+		results, self.results = self.results, []
+		if not results:
+			return
+		
+		with metrics.timer('apply_results'):
+			self.write_batch(results)
+		
+		for result in results:
+			if self.session.finish(result.url):
+				self.finish_cycle()
+		self.signals.cycle.emit(self.cycle_stats())
+	
+	def write_batch(self, results: list[ProductResult]):
+		"""Apply `results` to `data`, the scheduler and the store."""
+		# Leídos igual que la vez anterior: solo se reprograman, la fila y la tabla quedan como están
+		for result in results:
+			if result.unchanged:
+				self.session.record(result.url, *outcome(UNCHANGED, result, None, None))
+				self.session.cycle.unchanged += 1
+		results = [result for result in results if not result.unchanged]
+		
+		positions = self.data.index.get_indexer([result.index for result in results])
+		# Un producto borrado mientras se trackeaba ya no tiene posición
+		present = [result for result, position in zip(results, positions) if position >= 0]
+		positions = positions[positions >= 0]
+		previous_prices = self.data['current_price'].to_numpy()[positions]
+		previous_checks = self.data['checked_at'].to_numpy()[positions]
+		previous_available = self.data['available'].to_numpy()[positions]
+		
+		for result, price, checked_at, available in zip(
+			present, previous_prices, previous_checks, previous_available
+		):
+			# Solo las filas leídas con éxito traen un checked_at nuevo
+			read = notna(result.checked_at) and result.checked_at != checked_at
+			observed, changed, hot = outcome(READ if read else FAILED, result, price, available)
+			self.session.record(result.url, observed, changed, hot)
+			self.writer.put(result.to_dict(), observed)
+			self.session.cycle.changed += int(observed)
+		
+		if present:
+			write_results(self.data, positions, present)
+			self.version += 1
+			self.signals.rows_updated.emit([result.index for result in present])
+	
+	def add_urls(
+		self,
+		urls: Iterable[str],
+		progress: Optional[Callable[[int, int], None]] = None,
+		chunk_size: int = 1000
+	) -> ImportPlan:
+		"""
+		Canonicalize, dedup and add `urls`, stored `chunk_size` at a time.
+		`progress(done, total)` runs between chunks, outside any store
+		transaction, so it may process UI events.
+		"""
+		plan = plan_import(urls, self.data['url'])
+		if not plan.urls:
+			return plan
+		
+		added = new_products(plan.urls)
+		rows = added.to_dict('records')
+		self.writer.flush()
+		for start in range(0, len(rows), chunk_size):
+			self.store.upsert(rows[start:start + chunk_size])
+			if progress:
+				progress(min(start + chunk_size, len(rows)), len(rows))
+		
+		# Mientras se guardaba, un listado pudo haber agregado alguna de estas URLs
+		self.append_rows(added[~added['url'].isin(self.data['url'])])
+		self.version += 1
+		self.signals.updated.emit()
+		return plan
+	
+	def handle_listing_result(self, url: str, items: list[dict] | None):
+		changed = 0
+		if items is not None:
+			changed = self.merge_listing(url, items)
+			self.signals.log.emit(
+				f'Listado actualizado: {len(items)} productos, {changed} con cambios.', 'info', False
+			)
+		self.session.record(url, items is not None, changed > 0)
+		
+		if self.session.finish(url):
+			self.finish_cycle()
+		self.signals.cycle.emit(self.cycle_stats())
+	
+	def merge_listing(self, source: str, items: list[dict]) -> int:
+		"""Upsert the cards of a listing into `data`; returns how many rows changed or are new."""
+		if not items:
+			return 0
+		
+		found = DataFrame(items)
+		found['checked_at'] = time()
+		fields = [*LISTING_FIELDS, 'checked_at']
+		
+		positions = Series(self.data.index, index=self.data['url'])
+		known = found['url'].isin(positions.index)
+		existing = found[known]
+		rows = positions[existing['url']].to_numpy()
+		
+		previous = self.data.loc[rows, 'current_price'].to_numpy()
+		current = existing['current_price'].to_numpy()
+		moved = (previous != current) & ~(isna(previous) & isna(current))
+		self.data.loc[rows[moved], 'previous_price'] = previous[moved]
+		# La fila ya no es lo que se leyó de su página
+		self.data.loc[rows, VALIDATOR_COLUMNS] = None
+		
+		added = new_products(found.loc[~known, 'url'].tolist())
+		# Columna por columna, para no volver object las columnas bool y float
+		for field in fields:
+			self.data.loc[rows, field] = existing[field].to_numpy(dtype=DTYPES[field])
+			added[field] = found.loc[~known, field].to_numpy(dtype=DTYPES[field])
+		added['source'] = source
+		added = self.append_rows(added)
+		
+		for index in [*rows, *added.index]:
+			self.writer.put(self.data.loc[index].to_dict(), True)
+		
+		self.version += 1
 		self.signals.updated.emit()
+		return int(moved.sum()) + len(added)
 	
-	def handle_thread_result(self, index: int, row: Series):
-		self.data.loc[index] = row
+	def append_rows(self, rows: DataFrame) -> DataFrame:
+		"""Append `rows` after the current index labels, which runnables in flight still use."""
+		start = int(self.data.index.max()) + 1 if len(self.data) else 0
+		rows.index = range(start, start + len(rows))
+		self.data = concat([self.data, rows])
+		return rows
+	
+	def add_listing(self, url: str):
+		self.store.add_listing(url)
+		if url not in self.listings:
+			self.listings.append(url)
+		self.signals.updated.emit()
+	
+	def remove_listing(self, url: str):
+		self.writer.flush()
+		self.store.remove_listing(url)
+		self.listings = [listing for listing in self.listings if listing != url]
+		self.data = self.data[self.data['source'] != url]
+		self.version += 1
+		self.signals.updated.emit()
+	
+	def remove_urls(self, urls: list[str]):
+		self.writer.flush()
+		self.store.delete(urls)
+		self.data = self.data[~self.data['url'].isin(urls)]
+		self.version += 1
 		self.signals.updated.emit()
-		self.save_data()
 	
 	def save_data(self):
-		self.data.to_excel(self.excel_path, index=False)
+		with metrics.timer('save_data'):
+			self.writer.flush()
+			self.store.replace(self.data)
+	
+	def export_excel(self, path: Path):
+		with metrics.timer('export_excel'):
+			self.data.drop(columns=VALIDATOR_COLUMNS).to_excel(path, index=False)
+	
+	def import_excel(self, path: Path):
+		self.writer.flush()
+		imported = read_products_excel(path)
+		self.store.upsert(imported.to_dict('records'))
+		self.data = self.store.load()
+		self.version += 1
+		self.signals.updated.emit()
 	
 	def stop(self):
 		self.signals.status.emit('Deteniendo...', 'info')
+		# Los runnables en curso ven el token cancelado; los siguientes usan uno nuevo
+		self.session.stop()
 		self.threadpool.clear()
+		if self.engine is not None:
+			self.engine.cancel()
+		# Lo ya recibido se guarda; con el ciclo reiniciado no dispara otro
+		self.results_timer.stop()
+		self.apply_results()
+		# Un ciclo cortado igual deja su perfil, hasta donde llegó
+		self.save_profile()
+		if self._drivers is not None:
+			self._drivers.kill()
+		self.http.abort()
+		self.http.close()
+		self.writer.flush()
 		self.signals.status.emit('Inactivo.', 'error')
\ No newline at end of file
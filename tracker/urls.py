@@ -0,0 +1,79 @@
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from pandas import DataFrame, Series
+
+URL_PATTERN = re.compile(r'https://([a-z]+\.)?mercadolibre(\.[a-z]+)+(/.+)?')
+# Publicaciones como https://articulo.mercadolibre.com.ar/MLA-1234567890-titulo-_JM
+ITEM_PATTERN = re.compile(
+	r'https://(?:[a-z]+\.)?(?P<site>mercadolibre(?:\.[a-z]+)+)/(?P<prefix>ML[A-Z])-?(?P<number>\d+)'
+)
+SEPARATORS = re.compile(r'[\s,;"\']+')
+# Páginas de catálogo, https://www.mercadolibre.com.ar/<título>/p/MLA12345; su query elige variante o vendedor
+CATALOG_PATTERN = r'/p/ML[A-Z]\d+'
+
+
+@dataclass
+class ImportPlan:
+	urls: list[str] = field(default_factory=list)
+	invalid: int = 0
+	duplicates: int = 0
+
+
+def is_url_valid(url: str) -> bool:
+	return URL_PATTERN.match(url) is not None
+
+
+def split_urls(text: str) -> Series:
+	"""Split a pasted list, a text file or a CSV into candidate URLs."""
+	return Series([token for token in SEPARATORS.split(text) if token], dtype=object)
+
+
+def canonicalize(urls: Series) -> DataFrame:
+	"""
+	Vectorized over the whole list: drops fragments, and query strings but
+	on catalog pages, and rewrites item pages to `https://articulo.<site>/<ID>`,
+	so every variant of a listing maps to the same URL. Catalog pages keep
+	their query, which selects a variant or a listing of the product.
+	Returns the `url` and whether it is `valid`.
+	"""
+	urls = urls.astype(str).str.strip()
+	catalog = urls.str.contains(CATALOG_PATTERN, regex=True)
+	stripped = (
+		urls.str.replace(r'#.*$', '', regex=True)
+		.where(catalog, urls.str.replace(r'[?#].*$', '', regex=True))
+		.str.rstrip('/')
+	)
+	
+	ids = stripped.str.extract(ITEM_PATTERN)
+	canonical = 'https://articulo.' + ids['site'] + '/' + ids['prefix'] + '-' + ids['number']
+	
+	return DataFrame({
+		'url': canonical.fillna(stripped),
+		'valid': stripped.str.match(URL_PATTERN)
+	})
+
+
+def item_ids(urls: Series) -> Series:
+	"""Item id (e.g. `MLA1234567890`) of each item page URL; NaN for anything else."""
+	ids = urls.astype(str).str.extract(ITEM_PATTERN)
+	return ids['prefix'] + ids['number']
+
+
+def plan_import(urls: Iterable[str], tracked: Series) -> ImportPlan:
+	"""Canonical URLs from `urls` that are valid and not already tracked, in order."""
+	urls = Series(list(urls), dtype=object)
+	if urls.empty:
+		return ImportPlan()
+	
+	candidates = canonicalize(urls)
+	valid = candidates.loc[candidates['valid'], 'url']
+	known = canonicalize(tracked)['url'] if len(tracked) else Series(dtype=object)
+	new = valid[~valid.isin(known)].drop_duplicates()
+	
+	return ImportPlan(
+		urls=new.tolist(),
+		invalid=len(candidates) - len(valid),
+		duplicates=len(valid) - len(new)
+	)
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+What a product page answered the last time its row was written: its ETag
+and Last-Modified, sent back as conditional headers, and the digest of the
+fields read from it. They live in the product row itself, written in the
+same upsert as the data they describe, so whichever process claims the row
+compares against what is stored and never against what it saw itself.
+"""
+from hashlib import blake2b
+from typing import Mapping, MutableMapping, Optional
+
+# Lo que un Fetcher lee de la página y termina en la fila
+DIGEST_FIELDS = ['product', 'available', 'free_ship', 'currency', 'price', 'with_discount']
+
+
+def digest(fields: dict) -> str:
+	"""Hash of the product fields a Fetcher read, ignoring its timings and sizes."""
+	return blake2b(repr([fields[name] for name in DIGEST_FIELDS]).encode(), digest_size=16).hexdigest()
+
+
+def stored(row: Mapping, column: str) -> Optional[str]:
+	"""A validator column of `row`; pandas leaves NaN where there is none."""
+	value = row[column]
+	return value if isinstance(value, str) and value else None
+
+
+def conditional_headers(row: Mapping) -> dict[str, str]:
+	"""Conditional request headers for `row`; none until a page read was stored in it."""
+	headers = {}
+	if stored(row, 'digest') is not None:
+		if stored(row, 'etag') is not None:
+			headers['If-None-Match'] = row['etag']
+		if stored(row, 'last_modified') is not None:
+			headers['If-Modified-Since'] = row['last_modified']
+	return headers
+
+
+def unchanged(row: Mapping, fields: dict) -> bool:
+	"""True when `fields` read the same as what `row` holds, or the server said so with a 304."""
+	if fields['not_modified']:
+		return True
+	return stored(row, 'digest') == digest(fields)
+
+
+def remember(row: MutableMapping, fields: dict):
+	"""Store in `row` the validators of the fields just applied to it."""
+	row['etag'] = fields.get('etag')
+	row['last_modified'] = fields.get('last_modified')
+	row['digest'] = digest(fields)
+
+
+def forget(row: MutableMapping):
+	"""Clear the validators of a row that changed without reading its page."""
+	row['etag'] = row['last_modified'] = row['digest'] = None
\ No newline at end of file
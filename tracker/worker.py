@@ -0,0 +1,138 @@
+"""
+Tracker process that shares the products with other processes through the
+lease-based WorkQueue, so the URL set is split between as many workers as
+there are, on one host or on several hosts sharing the folder.
+"""
+import os
+import socket
+import sys
+from pathlib import Path
+from threading import Lock, Thread
+from time import monotonic, time
+from typing import Optional, TextIO
+
+from tracker.daemon import Daemon
+from tracker.engine import FAILED, READ, UNCHANGED
+from tracker.metrics import metrics
+from tracker.session import SKIPPED
+from tracker.workqueue import LISTING, WorkQueue
+
+# Sin URLs vencidas, cada cuánto se vuelve a mirar la cola
+POLL_SECONDS = 5
+
+
+class QueueWorker(Daemon):
+	"""
+	A Daemon whose URLs come from `<base_path>/queue.db` instead of its own
+	scheduler. With `shared`, every database is opened with a rollback
+	journal, since WAL does not work across hosts.
+	"""
+	
+	def __init__(
+		self,
+		base_path: Path,
+		browser: bool = False,
+		shared: bool = False,
+		out: TextIO = sys.stdout,
+		profile: Optional[Path] = None
+	):
+		journal_mode = 'DELETE' if shared else 'WAL'
+		super().__init__(base_path, browser, out, journal_mode, profile)
+		
+		self.id = f'{socket.gethostname()}:{os.getpid()}'
+		self.queue = WorkQueue(
+			base_path.joinpath('queue.db'),
+			self.setting('queue_lease', 'int'),
+			self.setting('interval', 'int'),
+			self.setting('max_backoff', 'int'),
+			journal_mode=journal_mode,
+			max_attempts=self.setting('queue_max_attempts', 'int')
+		)
+		self.batch_size = self.setting('queue_batch', 'int') or 2 * self.setting('max_paralell_tracking', 'int')
+		
+		self.leased: set[str] = set()
+		self._leased_lock = Lock()
+		self.heart = Thread(target=self.beat, name='queue-heartbeat', daemon=True)
+	
+	def run(self, loop: bool = False) -> int:
+		self.heart.start()
+		return super().run(loop)
+	
+	def close(self):
+		self.queue.release(self.id)
+		self.queue.close()
+		super().close()
+	
+	def beat(self):
+		# Un tercio del lease: hacen falta dos latidos perdidos para perder las URLs
+		while not self.stopped.wait(self.queue.lease / 3):
+			with self._leased_lock:
+				urls = list(self.leased)
+			try:
+				self.queue.heartbeat(self.id, urls)
+			except Exception as e:
+				self.log(f'No se pudo renovar el lease: {e}', 'warning')
+	
+	def run_cycle(self) -> dict[str, int]:
+		"""Claim and process batches until the queue has nothing due, or the worker is stopped."""
+		started = monotonic()
+		self.queue.interval = self.setting('interval', 'int')
+		
+		rows = {row['url']: row for row in self.store.rows()}
+		listings = self.store.listings()
+		# Los productos encontrados en un listado se actualizan con el listado
+		self.queue.sync([url for url, row in rows.items() if not row['source']], listings)
+		stats = self.queue.stats()
+		metrics.gauge('queue_depth', stats['due'])
+		self.emit('cycle_start', worker=self.id, **stats)
+		
+		counts = {READ: 0, UNCHANGED: 0, FAILED: 0, SKIPPED: 0, 'changed': 0, 'reclaimed': 0, 'parked': 0}
+		while not self.stopped.is_set():
+			claimed, reclaimed, parked = self.queue.claim(self.id, self.batch_size)
+			counts['parked'] += len(parked)
+			for url in parked:
+				self.log(f'{url} dejó {self.queue.max_attempts} leases vencidos, se pospone', 'warning')
+			if not claimed:
+				if parked:
+					continue
+				break
+			
+			with self._leased_lock:
+				self.leased.update(url for url, _ in claimed)
+			
+			urls = [url for url, kind in claimed if kind != LISTING]
+			batch_listings = [url for url, kind in claimed if kind == LISTING]
+			if batch_listings:
+				# Un listado puede tocar cualquier producto: hacen falta todas las filas
+				rows = {row['url']: row for row in self.store.rows()}
+			else:
+				rows.update((row['url'], row) for row in self.store.rows(urls))
+			
+			batch = self.process([rows[url] for url in urls if url in rows], batch_listings, rows)
+			for key, value in batch.items():
+				counts[key] += value
+			counts['reclaimed'] += reclaimed
+			
+			# Productos borrados desde el último sync: se liberan para que el próximo los quite
+			for url in urls:
+				if url not in rows:
+					self.reschedule(url, False)
+		
+		metrics.observe('cycle', (monotonic() - started) * 1000)
+		self.emit(
+			'cycle_end',
+			worker=self.id,
+			seconds=round(monotonic() - started, 3),
+			**counts,
+			**self.session.breakers.stats()
+		)
+		return counts
+	
+	def reschedule(self, url: str, observed: bool, changed: bool = False, hot: bool = False):
+		with self._leased_lock:
+			self.leased.discard(url)
+		if not self.queue.complete(self.id, url, observed, changed, hot, time()):
+			self.log(f'Lease vencido, otro worker ya tomó {url}', 'warning')
+	
+	def wait_interval(self) -> float:
+		return POLL_SECONDS
\ No newline at end of file
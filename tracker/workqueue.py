@@ -0,0 +1,229 @@
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Iterable, Optional
+
+PRODUCT = 'product'
+LISTING = 'listing'
+
+
+class WorkQueue:
+	"""
+	Due URLs shared by several tracker processes through one SQLite file.
+	A worker claims a batch under a lease of `lease` seconds, heartbeats it
+	while fetching and completes each URL, which schedules it again like
+	Scheduler does. A lease that expires, because its worker crashed or
+	hung, is simply claimable again by anyone, up to `max_attempts` times
+	in a row; after that the URL is parked for `max_backoff` intervals, so
+	a page that crashes workers does not take one down per lease.
+	"""
+	
+	def __init__(
+		self,
+		path: Path,
+		lease: float = 120,
+		interval: float = 1800,
+		max_backoff: float = 16,
+		growth: float = 2.0,
+		journal_mode: str = 'WAL',
+		max_attempts: int = 3
+	):
+		self.path = path
+		self.lease = lease
+		self.interval = interval
+		self.max_backoff = max_backoff
+		self.growth = growth
+		self.max_attempts = max_attempts
+		self._lock = Lock()
+		
+		self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+		self._conn.execute(f'PRAGMA journal_mode={journal_mode}')
+		self._conn.execute('PRAGMA synchronous=NORMAL')
+		self._conn.executescript(
+			"""
+			CREATE TABLE IF NOT EXISTS jobs (
+				url TEXT PRIMARY KEY,
+				kind TEXT NOT NULL,
+				due REAL NOT NULL,
+				multiplier REAL NOT NULL DEFAULT 1,
+				owner TEXT,
+				lease_until REAL,
+				attempts INTEGER NOT NULL DEFAULT 0
+			);
+			CREATE INDEX IF NOT EXISTS jobs_due ON jobs (due);
+			CREATE TABLE IF NOT EXISTS workers (
+				id TEXT PRIMARY KEY,
+				started REAL NOT NULL,
+				heartbeat REAL NOT NULL,
+				completed INTEGER NOT NULL DEFAULT 0,
+				reclaimed INTEGER NOT NULL DEFAULT 0
+			);
+			"""
+		)
+	
+	def sync(self, products: Iterable[str], listings: Iterable[str], now: Optional[float] = None):
+		"""Queue new URLs as due now and drop the ones no longer tracked."""
+		now = time() if now is None else now
+		jobs = [(url, PRODUCT, now) for url in products] + [(url, LISTING, now) for url in listings]
+		
+		with self._lock:
+			self._conn.execute('BEGIN IMMEDIATE')
+			try:
+				self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS tracked (url TEXT PRIMARY KEY)')
+				self._conn.execute('DELETE FROM tracked')
+				self._conn.executemany('INSERT OR IGNORE INTO tracked (url) VALUES (?)', [job[:1] for job in jobs])
+				self._conn.executemany('INSERT OR IGNORE INTO jobs (url, kind, due) VALUES (?, ?, ?)', jobs)
+				self._conn.execute('DELETE FROM jobs WHERE url NOT IN (SELECT url FROM tracked)')
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._conn.execute('COMMIT')
+	
+	def claim(
+		self,
+		worker: str,
+		limit: int,
+		now: Optional[float] = None
+	) -> tuple[list[tuple[str, str]], int, list[str]]:
+		"""
+		Lease up to `limit` due URLs, oldest due first. Returns their
+		`(url, kind)`, how many were taken over from an expired lease and the
+		URLs parked instead because their lease expired `max_attempts` times.
+		"""
+		now = time() if now is None else now
+		
+		with self._lock:
+			# IMMEDIATE toma el lock de escritura antes de leer: dos workers no eligen la misma fila
+			self._conn.execute('BEGIN IMMEDIATE')
+			try:
+				jobs = self._conn.execute(
+					"""
+					SELECT url, kind, owner, attempts FROM jobs
+					WHERE due <= ? AND (owner IS NULL OR lease_until < ?)
+					ORDER BY due LIMIT ?
+					""",
+					(now, now, limit)
+				).fetchall()
+				# Un lease vencido es un worker que se cayó o se colgó con la URL
+				parked = [
+					url for url, _, owner, attempts in jobs
+					if owner is not None and attempts >= self.max_attempts
+				]
+				jobs = [job for job in jobs if job[0] not in parked]
+				self._conn.executemany(
+					'UPDATE jobs SET owner = NULL, lease_until = NULL, attempts = 0, due = ? WHERE url = ?',
+					[(now + self.interval * self.max_backoff, url) for url in parked]
+				)
+				self._conn.executemany(
+					'UPDATE jobs SET owner = ?, lease_until = ?, attempts = attempts + 1 WHERE url = ?',
+					[(worker, now + self.lease, url) for url, _, _, _ in jobs]
+				)
+				reclaimed = sum(1 for _, _, owner, _ in jobs if owner is not None)
+				self._beat(worker, now, reclaimed=reclaimed)
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._conn.execute('COMMIT')
+		
+		return [(url, kind) for url, kind, _, _ in jobs], reclaimed, parked
+	
+	def heartbeat(self, worker: str, urls: Iterable[str], now: Optional[float] = None):
+		"""Extend the leases `worker` still holds on `urls`."""
+		now = time() if now is None else now
+		
+		with self._lock:
+			self._conn.execute('BEGIN IMMEDIATE')
+			try:
+				self._conn.executemany(
+					'UPDATE jobs SET lease_until = ? WHERE url = ? AND owner = ?',
+					[(now + self.lease, url, worker) for url in urls]
+				)
+				self._beat(worker, now)
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._conn.execute('COMMIT')
+	
+	def complete(
+		self,
+		worker: str,
+		url: str,
+		observed: bool,
+		changed: bool = False,
+		hot: bool = False,
+		now: Optional[float] = None
+	) -> bool:
+		"""
+		Release `url` and schedule its next check. Returns False when the lease
+		had already been taken over, in which case the new owner schedules it.
+		"""
+		now = time() if now is None else now
+		
+		with self._lock:
+			self._conn.execute('BEGIN IMMEDIATE')
+			try:
+				row = self._conn.execute(
+					'SELECT multiplier FROM jobs WHERE url = ? AND owner = ?', (url, worker)
+				).fetchone()
+				if row is not None:
+					multiplier = row[0]
+					if observed:
+						multiplier = 1.0 if changed or hot else min(self.max_backoff, multiplier * self.growth)
+					self._conn.execute(
+						"""
+						UPDATE jobs SET owner = NULL, lease_until = NULL, attempts = 0, multiplier = ?, due = ?
+						WHERE url = ?
+						""",
+						(multiplier, now + self.interval * (multiplier if observed else 1.0), url)
+					)
+					self._conn.execute('UPDATE workers SET completed = completed + 1 WHERE id = ?', (worker,))
+			except Exception:
+				self._conn.execute('ROLLBACK')
+				raise
+			self._conn.execute('COMMIT')
+		
+		return row is not None
+	
+	def release(self, worker: str):
+		"""Give back every lease of `worker` without rescheduling, on a clean shutdown."""
+		with self._lock:
+			self._conn.execute(
+				'UPDATE jobs SET owner = NULL, lease_until = NULL, attempts = max(attempts - 1, 0) WHERE owner = ?',
+				(worker,)
+			)
+			self._conn.execute('DELETE FROM workers WHERE id = ?', (worker,))
+	
+	def stats(self, now: Optional[float] = None) -> dict:
+		now = time() if now is None else now
+		
+		with self._lock:
+			jobs, due, leased, expired = self._conn.execute(
+				"""
+				SELECT
+					count(*),
+					coalesce(sum(due <= ? AND (owner IS NULL OR lease_until < ?)), 0),
+					coalesce(sum(owner IS NOT NULL AND lease_until >= ?), 0),
+					coalesce(sum(owner IS NOT NULL AND lease_until < ?), 0)
+				FROM jobs
+				""",
+				(now, now, now, now)
+			).fetchone()
+			workers = self._conn.execute(
+				'SELECT count(*) FROM workers WHERE heartbeat >= ?', (now - self.lease,)
+			).fetchone()[0]
+		
+		return {'jobs': jobs, 'due': due, 'leased': leased, 'expired': expired, 'workers': workers}
+	
+	def close(self):
+		with self._lock:
+			self._conn.close()
+	
+	def _beat(self, worker: str, now: float, reclaimed: int = 0):
+		self._conn.execute(
+			"""
+			INSERT INTO workers (id, started, heartbeat, reclaimed) VALUES (?, ?, ?, ?)
+			ON CONFLICT(id) DO UPDATE SET heartbeat = excluded.heartbeat, reclaimed = reclaimed + excluded.reclaimed
+			""",
+			(worker, now, now, reclaimed)
+		)
\ No newline at end of file
@@ -1,14 +1,26 @@
+import sys
 import webbrowser
-from datetime import datetime, timedelta
+from datetime import timedelta
+from pathlib import Path
 from typing import Literal
 
 import PyQt6.QtWidgets as q
 from PyQt6.QtCore import QSize, QTimer
-from PyQt6.QtGui import QColor
-from PyQt6.QtWidgets import QSystemTrayIcon, QTableWidgetItem
+from PyQt6.QtWidgets import QSystemTrayIcon
 
+from tracker.metrics import metrics
 from tracker.tracker import TrackerWorker
 from widgets._base import CustomBaseWindow
+from widgets.diagnostics import DiagnosticsWidget
+from widgets.logs import (
+	FILE_LEVELS,
+	LEVEL_COLORS,
+	LogDelegate,
+	LogModel,
+	NotificationCoalescer,
+	file_logger,
+)
+from widgets.posts import ButtonDelegate, PostsModel
 from widgets.settings import SettingsWidget
 from widgets.tray_icon import TrayIcon
 from widgets.url_manager import URLManagerWidget
@@ -27,12 +39,19 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 		self.tray_icon = TrayIcon(self)
 		self.tray_icon.show_clicked.connect(self.show_window)
 		
+		self.notifications = NotificationCoalescer()
+		self.notifications.notify.connect(self.notify)
+		
 		# ---------------------------------------------------
 		
 		self.tracker = TrackerWorker()
 		self.tracker.signals.status.connect(self.set_status)
 		self.tracker.signals.log.connect(self.add_log)
 		self.tracker.signals.updated.connect(self.update_ui)
+		self.tracker.signals.cycle.connect(self.set_cycle_stats)
+		self.tracker.signals.loaded.connect(self.data_ready)
+		# Leída una vez: add_log corre por cada línea y la opción está en settings.ini
+		self.log_to_file = self.tracker.log_to_file
 		
 		# ---------------------------------------------------
 		
@@ -40,6 +59,7 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 		self.url_manager_widget.updated.connect(self.update_ui)
 		
 		self.settings_widget = SettingsWidget(self.tracker)
+		self.settings_widget.log_to_file_changed.connect(self.set_log_to_file)
 		
 		# ---------------------------------------------------
 		
@@ -70,16 +90,42 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 		
 		# ---------------------------------------------------
 		
-		self.tracked_posts = q.QTableWidget()
-		self.tracked_posts.setEditTriggers(q.QTableWidget.EditTrigger.NoEditTriggers)
+		self.posts_model = PostsModel(self.tracker)
+		self.tracker.signals.rows_updated.connect(self.posts_model.update_rows)
+		
+		self.posts_button_delegate = ButtonDelegate()
+		self.posts_button_delegate.clicked.connect(
+			lambda row: webbrowser.open(self.posts_model.url(row))
+		)
+		
+		self.tracked_posts = q.QTableView()
+		self.tracked_posts.setModel(self.posts_model)
+		self.tracked_posts.setItemDelegateForColumn(
+			self.posts_model.keys.index('url'), self.posts_button_delegate
+		)
+		self.tracked_posts.setEditTriggers(q.QTableView.EditTrigger.NoEditTriggers)
 		self.tracked_posts.verticalHeader().setVisible(False)
+		self.tracked_posts.horizontalHeader().setSectionResizeMode(
+			0, self.tracked_posts.horizontalHeader().ResizeMode.Stretch
+		)
 		tabs.addTab(self.tracked_posts, 'Publicaciones')
 		
 		# ---------------------------------------------------
 		
-		self.logs = q.QListWidget()
+		self.logs_model = LogModel()
+		
+		self.logs = q.QListView()
+		self.logs.setModel(self.logs_model)
+		self.logs.setItemDelegate(LogDelegate())
+		self.logs.setUniformItemSizes(True)
 		tabs.addTab(self.logs, 'Logs')
 		
+		self.diagnostics = DiagnosticsWidget(self.tracker)
+		tabs.addTab(self.diagnostics, 'Diagnóstico')
+		
+		base_path = Path(getattr(sys, '_MEIPASS', '.'))
+		self.file_log = file_logger(base_path.joinpath('ml_tracker.log'))
+		
 		# ---------------------------------------------------
 		
 		status_bar = q.QWidget()
@@ -94,6 +140,10 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 		self.status_label = q.QLabel()
 		status_bar_layout.addWidget(self.status_label, 1)
 		
+		self.cycle_label = q.QLabel()
+		self.cycle_label.setStyleSheet('color: gray;')
+		status_bar_layout.addWidget(self.cycle_label)
+		
 		if not self.tracker.track_on_startup:
 			self.set_status('Inactivo.', 'error')
 		
@@ -124,96 +174,36 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 		
 		self.setCentralWidget(main)
 		
+		self.update_ui()
+		# La ventana se muestra enseguida; los productos llegan por `loaded`
+		self.tracker.load_data()
+	
+	def data_ready(self):
+		self.url_manager_widget.refresh_list()
+		
 		if self.tracker.track_on_startup:
 			self.start_timer()
 		
 		self.update_ui()
 	
 	def update_ui(self):
-		running = self.is_running
-		
-		# Buttons
-		self.start_button.setEnabled(not running)
-		self.stop_button.setEnabled(running)
-		self.modify_urls_button.setEnabled(not running)
-		self.settings_button.setEnabled(not running)
-		
-		# Tracked posts
-		posts = self.tracker.data.copy()
-		
-		posts['currency'] = posts['currency'].fillna('$')
-		posts['current_price'] = posts.apply(
-			lambda x: f'{"⬆️" if x["previous_price"] <= x["current_price"] else "⬇️"}'
-			          f' {x["currency"]} {x["current_price"]:,}', axis=1
-		)
-		posts['product'] = posts['product'].fillna('-')
-		posts['free_ship'] = posts['free_ship'].apply(lambda x: 'Sí' if x else 'No')
-		posts['available'] = posts['available'].apply(lambda x: 'Sí' if x else 'No')
-		posts['with_discount'] = posts['with_discount'].apply(lambda x: 'Sí' if x else 'No')
-		
-		posts = posts[[
-			'product',
-			'current_price',
-			'free_ship',
-			'with_discount',
-			'available',
-			'url'
-		]]
-		
-		posts.rename(
-			columns={
-				'url': "",
-				'current_price': "Precio",
-				"product": "Producto",
-				"free_ship": "Envío gratis",
-				"available": "Disponible",
-				"with_discount": "En descuento"
-			},
-			inplace=True
-		)
-		
-		self.tracked_posts.setRowCount(posts.shape[0])
-		self.tracked_posts.setColumnCount(posts.shape[1])
-		self.tracked_posts.setHorizontalHeaderLabels(posts.columns)
-		self.tracked_posts.horizontalHeader().setSectionResizeMode(
-			0, self.tracked_posts.horizontalHeader().ResizeMode.Stretch
-		)
-		
-		for row in range(posts.shape[0]):
-			for col in range(posts.shape[1]):
-				column_name = posts.columns[col]
-				if column_name == '':  # Verificamos si la columna es 'url'
-					# Creamos un botón con el texto de la URL
-					button = q.QPushButton("Ver")
-					button.clicked.connect(lambda checked, url=posts.iloc[row, col]: webbrowser.open(url))
-					# Establecemos el botón en la celda correspondiente
-					self.tracked_posts.setCellWidget(row, col, button)
-				elif column_name != 'previous_price':
-					# Para las demás celdas, agregamos los datos como texto
-					value = str(posts.iloc[row, col])
-					item = QTableWidgetItem(value)
-					
-					previous_price = self.tracker.data.loc[row, 'previous_price']
-					
-					if value == 'Sí' or (
-						column_name == 'Precio' and
-						previous_price > 0 and
-						previous_price > self.tracker.data.loc[row, 'current_price']
-					):
-						item.setForeground(QColor('lime'))
-					
-					elif value == 'No' or (
-						column_name == 'Precio' and
-						0 < previous_price < self.tracker.data.loc[row, 'current_price']
-					):
-						item.setForeground(QColor('crimson'))
-					
-					self.tracked_posts.setItem(row, col, item)
+		with metrics.timer('update_ui'):
+			running = self.is_running
+			loaded = self.tracker.loaded
+			
+			# Buttons
+			self.start_button.setEnabled(loaded and not running)
+			self.stop_button.setEnabled(running)
+			self.modify_urls_button.setEnabled(loaded and not running)
+			self.settings_button.setEnabled(not running)
+			
+			# Tracked posts
+			self.posts_model.refresh()
 	
 	def start_timer(self):
 		self.tracker.start()
-		if self.tracker.threadpool.activeThreadCount() > 0:
-			self.tracking_timer.start(self.tracker.interval * 1000)
+		# Aunque ningún producto esté vencido todavía, el timer sigue los próximos ciclos
+		self.tracking_timer.start(self.tracker.interval * 1000)
 		self.update_ui()
 	
 	def stop_timer(self):
@@ -247,14 +237,7 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 		self.timer_display.setText(formatted_time)
 	
 	def _get_level_color(self, level: str):
-		colors = {
-			"error": "crimson",
-			"success": "lime",
-			"info": "DeepSkyBlue",
-			"debug": "gray",
-			"warning": "gold"
-		}
-		return colors[level]
+		return LEVEL_COLORS[level]
 	
 	def set_status(self, status: str, level: str = None):
 		self.status_label.setText(status)
@@ -262,43 +245,30 @@ class MainWindow(q.QMainWindow, CustomBaseWindow):
 			color = self._get_level_color(level)
 			self.status_label.setStyleSheet(f'color: {color};')
 	
+	def set_cycle_stats(self, stats: dict):
+		self.cycle_label.setText(
+			f'Ciclo: {stats["duration"]:.0f}s · Cola: {stats["queue_depth"]} · '
+			f'Cambios: {stats["changed"]}/{stats["changed"] + stats["unchanged"]} · '
+			f'Solapados: {stats["overruns"]} · Pospuestos: {stats["deferred"]} · '
+			f'Circuito: {stats["breaker"]} ({stats["trips"]} cortes)'
+		)
+	
 	def add_log(
 		self,
 		content: str,
 		level: Literal["error", "success", "info", "debug", "warning"],
 		notify: bool = False
 	):
-		color = self._get_level_color(level)
-		
-		# Crear un nuevo elemento para la lista
-		log_item = q.QListWidgetItem()
-		
-		# Crear el widget que contendrá el log
-		item_widget = q.QWidget()
-		log_item_layout = q.QHBoxLayout()
-		item_widget.setLayout(log_item_layout)
+		self.logs_model.append(content, level)
 		
-		# Formato de la hora y etiqueta
-		time_str = datetime.now().strftime("%H:%M:%S")
-		time_label = q.QLabel()
-		time_label.setText(time_str)
-		time_label.setStyleSheet('font-weight: bold;')
-		log_item_layout.addWidget(time_label)
-		
-		# Crear la etiqueta de contenido y aplicar color
-		content_label = q.QLabel()
-		content_label.setText(content)
-		content_label.setStyleSheet(f'color: {color}; font-weight: bold;')
-		log_item_layout.addWidget(content_label, 1)
-		
-		# Añadir el item a la lista
-		log_item.setSizeHint(item_widget.sizeHint())
-		
-		self.logs.addItem(log_item)
-		self.logs.setItemWidget(log_item, item_widget)
+		if self.log_to_file:
+			self.file_log.log(FILE_LEVELS[level], content)
 		
 		if notify:
-			self.notify(content)
+			self.notifications.push(content)
+	
+	def set_log_to_file(self, enabled: bool):
+		self.log_to_file = enabled
 	
 	def notify(self, content: str):
 		self.tray_icon.showMessage(
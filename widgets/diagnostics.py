@@ -0,0 +1,113 @@
+import PyQt6.QtWidgets as q
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+
+from tracker.metrics import metrics
+from tracker.tracker import TrackerWorker
+
+
+class MetricsModel(QAbstractTableModel):
+	"""One row per metric of the last `metrics.snapshot()`: timers first, then counters and gauges."""
+	
+	HEADERS = ["Métrica", "Cantidad", "p50 ms", "p95 ms", "Máx ms", "Total s"]
+	
+	def __init__(self):
+		super().__init__()
+		self.rows: list[tuple] = []
+	
+	def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+		return 0 if parent.isValid() else len(self.rows)
+	
+	def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+		return 0 if parent.isValid() else len(self.HEADERS)
+	
+	def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+		if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+			return self.HEADERS[section]
+		return None
+	
+	def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+		if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+			return None
+		return self.rows[index.row()][index.column()]
+	
+	def refresh(self):
+		snapshot = metrics.snapshot()
+		rows = [
+			(
+				name,
+				str(timer['count']),
+				f"{timer['p50_ms']:.0f}",
+				f"{timer['p95_ms']:.0f}",
+				f"{timer['max_ms']:.0f}",
+				f"{timer['total_ms'] / 1000:.1f}"
+			)
+			for name, timer in sorted(snapshot['timers'].items())
+		]
+		rows += [(name, str(value), '', '', '', '') for name, value in sorted(snapshot['counters'].items())]
+		rows += [(name, f'{value:g}', '', '', '', '') for name, value in sorted(snapshot['gauges'].items())]
+		
+		self.beginResetModel()
+		self.rows = rows
+		self.endResetModel()
+
+
+class DiagnosticsWidget(q.QWidget):
+	"""Live view of the tracker metrics, refreshed while the tab is visible."""
+	
+	def __init__(self, tracker: TrackerWorker):
+		super().__init__()
+		
+		self.tracker = tracker
+		
+		layout = q.QVBoxLayout()
+		self.setLayout(layout)
+		
+		self.model = MetricsModel()
+		
+		self.table = q.QTableView()
+		self.table.setModel(self.model)
+		self.table.setEditTriggers(q.QTableView.EditTrigger.NoEditTriggers)
+		self.table.verticalHeader().setVisible(False)
+		self.table.horizontalHeader().setSectionResizeMode(
+			0, self.table.horizontalHeader().ResizeMode.Stretch
+		)
+		layout.addWidget(self.table)
+		
+		# ---------------------------------------------------
+		
+		buttons = q.QWidget()
+		buttons_layout = q.QHBoxLayout()
+		buttons.setLayout(buttons_layout)
+		layout.addWidget(buttons)
+		
+		self.endpoint_label = q.QLabel()
+		self.endpoint_label.setStyleSheet('color: gray;')
+		if self.tracker.metrics_server is not None:
+			self.endpoint_label.setText(f'http://127.0.0.1:{self.tracker.metrics_port}/metrics')
+		buttons_layout.addWidget(self.endpoint_label, 1)
+		
+		self.profile_button = q.QPushButton('⏱️ Perfilar próximo ciclo')
+		self.profile_button.clicked.connect(self.tracker.profile_next_cycle)
+		buttons_layout.addWidget(self.profile_button)
+		
+		self.reset_button = q.QPushButton('🧹 Reiniciar')
+		self.reset_button.clicked.connect(self.reset)
+		buttons_layout.addWidget(self.reset_button)
+		
+		# ---------------------------------------------------
+		
+		self.timer = QTimer(self)
+		self.timer.timeout.connect(self.model.refresh)
+	
+	def showEvent(self, event):
+		self.model.refresh()
+		self.timer.start(2000)
+		super().showEvent(event)
+	
+	def hideEvent(self, event):
+		self.timer.stop()
+		super().hideEvent(event)
+	
+	def reset(self):
+		metrics.reset()
+		self.model.refresh()
\ No newline at end of file
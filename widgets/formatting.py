@@ -0,0 +1,100 @@
+import numpy as np
+from pandas import DataFrame
+
+from tracker.tracker import TrackerWorker
+
+UP, DOWN, UNCHANGED = 1, -1, 0
+
+# Indexado por dirección + 1
+ARROWS = np.array(["⬇️", "➖", "⬆️"], dtype=object)
+
+BOOL_COLUMNS = ['free_ship', 'with_discount', 'available']
+
+
+def price_direction(data: DataFrame) -> np.ndarray:
+	"""UP, DOWN or UNCHANGED per row; rows without a previous price count as unchanged."""
+	previous_price = data['previous_price'].to_numpy(dtype=float, na_value=0)
+	current_price = data['current_price'].to_numpy(dtype=float, na_value=0)
+	
+	direction = np.sign(current_price - previous_price).astype(int)
+	direction[previous_price <= 0] = UNCHANGED
+	return direction
+
+
+def format_posts(data: DataFrame, columns: list[str]) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	Display strings and colour names for every cell of `columns`, computed
+	column-wise in one pass. Both arrays are indexed by row position.
+	"""
+	rows = len(data)
+	display = np.empty((rows, len(columns)), dtype=object)
+	colors = np.full((rows, len(columns)), None, dtype=object)
+	
+	direction = price_direction(data)
+	
+	for col, key in enumerate(columns):
+		if key == 'url':
+			display[:, col] = "Ver"
+		
+		elif key == 'product':
+			display[:, col] = data['product'].fillna('-').astype(str).to_numpy()
+		
+		elif key == 'current_price':
+			arrows = ARROWS[direction + 1]
+			currency = data['currency'].fillna('$').astype(str).to_numpy(dtype=object)
+			prices = data['current_price'].fillna(0).map('{:,}'.format).to_numpy(dtype=object)
+			display[:, col] = arrows + ' ' + currency + ' ' + prices
+			
+			colors[direction == DOWN, col] = 'lime'
+			colors[direction == UP, col] = 'crimson'
+		
+		elif key in BOOL_COLUMNS:
+			values = data[key].fillna(False).astype(bool).to_numpy()
+			display[:, col] = np.where(values, 'Sí', 'No')
+			colors[:, col] = np.where(values, 'lime', 'crimson')
+		
+		else:
+			display[:, col] = data[key].astype(str).to_numpy()
+	
+	return display, colors
+
+
+class PostsFormatter:
+	"""
+	Caches `format_posts` for the tracker's current data version. Rows
+	updated in place are re-formatted alone with `update_rows`; any other
+	change formats the whole table again.
+	"""
+	
+	def __init__(self, tracker: TrackerWorker, columns: list[str]):
+		self.tracker = tracker
+		self.columns = columns
+		
+		self._version = None
+		self._display = np.empty((0, len(columns)), dtype=object)
+		self._colors = np.empty((0, len(columns)), dtype=object)
+	
+	def display(self, row: int, col: int) -> str:
+		self._update()
+		return self._display[row, col]
+	
+	def color(self, row: int, col: int) -> str | None:
+		self._update()
+		return self._colors[row, col]
+	
+	def update_rows(self, rows: np.ndarray):
+		"""Re-format the rows at positions `rows`, the only ones changed by the last version bump."""
+		# rows_updated sigue inmediatamente a la suba de versión: con el caché una versión
+		# atrás, estas filas son lo único que cambió
+		if self._version != self.tracker.version - 1:
+			return
+		
+		display, colors = format_posts(self.tracker.data.iloc[rows], self.columns)
+		self._display[rows] = display
+		self._colors[rows] = colors
+		self._version = self.tracker.version
+	
+	def _update(self):
+		if self._version != self.tracker.version:
+			self._display, self._colors = format_posts(self.tracker.data, self.columns)
+			self._version = self.tracker.version
\ No newline at end of file
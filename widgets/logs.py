@@ -0,0 +1,136 @@
+import logging
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, QSize, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtWidgets import QStyledItemDelegate
+
+LEVEL_COLORS = {
+	"error": "crimson",
+	"success": "lime",
+	"info": "DeepSkyBlue",
+	"debug": "gray",
+	"warning": "gold"
+}
+
+FILE_LEVELS = {
+	"error": logging.ERROR,
+	"success": logging.INFO,
+	"info": logging.INFO,
+	"debug": logging.DEBUG,
+	"warning": logging.WARNING
+}
+
+TIME_ROLE = Qt.ItemDataRole.UserRole + 1
+LEVEL_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class LogModel(QAbstractListModel):
+	"""Fixed-capacity ring buffer of log lines; the oldest line is dropped when full."""
+	
+	def __init__(self, capacity: int = 1000):
+		super().__init__()
+		self.capacity = capacity
+		self.entries: deque[tuple[str, str, str]] = deque()
+	
+	def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+		return 0 if parent.isValid() else len(self.entries)
+	
+	def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+		if not index.isValid():
+			return None
+		
+		time_str, content, level = self.entries[index.row()]
+		
+		if role == Qt.ItemDataRole.DisplayRole:
+			return content
+		if role == TIME_ROLE:
+			return time_str
+		if role == LEVEL_ROLE:
+			return level
+		return None
+	
+	def append(self, content: str, level: str):
+		if len(self.entries) >= self.capacity:
+			self.beginRemoveRows(QModelIndex(), 0, 0)
+			self.entries.popleft()
+			self.endRemoveRows()
+		
+		row = len(self.entries)
+		self.beginInsertRows(QModelIndex(), row, row)
+		self.entries.append((datetime.now().strftime("%H:%M:%S"), content, level))
+		self.endInsertRows()
+
+
+class LogDelegate(QStyledItemDelegate):
+	"""Paints the bold time and the coloured message of a log line."""
+	
+	def paint(self, painter, option, index):
+		painter.save()
+		
+		font = QFont(option.font)
+		font.setBold(True)
+		painter.setFont(font)
+		
+		rect = option.rect.adjusted(8, 0, -8, 0)
+		align = Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft
+		
+		time_str = index.data(TIME_ROLE)
+		painter.setPen(option.palette.text().color())
+		painter.drawText(rect, align, time_str)
+		
+		offset = painter.fontMetrics().horizontalAdvance(time_str) + 12
+		painter.setPen(QColor(LEVEL_COLORS[index.data(LEVEL_ROLE)]))
+		painter.drawText(rect.adjusted(offset, 0, 0, 0), align, index.data())
+		
+		painter.restore()
+	
+	def sizeHint(self, option, index):
+		return QSize(option.rect.width(), option.fontMetrics.height() + 12)
+
+
+class NotificationCoalescer(QObject):
+	"""
+	Sends the first occurrence of a message right away and merges repeats
+	arriving within `window` milliseconds into one summary at its end.
+	"""
+	
+	notify: pyqtSignal = pyqtSignal(str)
+	
+	def __init__(self, window: int = 10000):
+		super().__init__()
+		self.window = window
+		self.repeats: dict[str, int] = {}
+	
+	def push(self, content: str):
+		if content in self.repeats:
+			self.repeats[content] += 1
+			return
+		
+		self.repeats[content] = 0
+		self.notify.emit(content)
+		QTimer.singleShot(self.window, lambda: self._flush(content))
+	
+	def _flush(self, content: str):
+		repeats = self.repeats.pop(content, 0)
+		if repeats:
+			self.notify.emit(f'{content} (se repitió {repeats} {"vez" if repeats == 1 else "veces"})')
+
+
+def file_logger(path: Path, max_bytes: int = 1_000_000, backups: int = 3) -> logging.Logger:
+	"""Logger writing to a rotating file next to the app data."""
+	logger = logging.getLogger('ml_tracker')
+	logger.setLevel(logging.DEBUG)
+	logger.propagate = False
+	
+	if not logger.handlers:
+		handler = RotatingFileHandler(
+			path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True
+		)
+		handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+		logger.addHandler(handler)
+	
+	return logger
\ No newline at end of file
@@ -0,0 +1,97 @@
+from PyQt6.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication, QStyle, QStyleOptionButton, QStyledItemDelegate
+
+from tracker.tracker import TrackerWorker
+from widgets.formatting import PostsFormatter
+
+
+class PostsModel(QAbstractTableModel):
+	"""
+	Table model over `TrackerWorker.data`. Cells are read on demand in
+	`data()` from a formatted snapshot of the current data version, so a
+	batch of finished products only re-formats and repaints the rows it spans.
+	"""
+	
+	COLUMNS = {
+		'product': "Producto",
+		'current_price': "Precio",
+		'free_ship': "Envío gratis",
+		'with_discount': "En descuento",
+		'available': "Disponible",
+		'url': ""
+	}
+	
+	def __init__(self, tracker: TrackerWorker):
+		super().__init__()
+		self.tracker = tracker
+		self.keys = list(self.COLUMNS)
+		self.formatter = PostsFormatter(tracker, self.keys)
+	
+	def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+		return 0 if parent.isValid() else len(self.tracker.data)
+	
+	def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+		return 0 if parent.isValid() else len(self.keys)
+	
+	def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+		if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+			return self.COLUMNS[self.keys[section]]
+		return None
+	
+	def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+		if not index.isValid():
+			return None
+		
+		row, col = index.row(), index.column()
+		
+		if role == Qt.ItemDataRole.DisplayRole:
+			return self.formatter.display(row, col)
+		
+		if role == Qt.ItemDataRole.ForegroundRole:
+			color = self.formatter.color(row, col)
+			return QColor(color) if color else None
+		
+		return None
+	
+	def url(self, row: int) -> str:
+		return self.tracker.data['url'].iat[row]
+	
+	def refresh(self):
+		"""Rows were added, removed or reloaded."""
+		self.beginResetModel()
+		self.endResetModel()
+	
+	def update_rows(self, labels: list[int]):
+		"""The products stored under `labels` in the tracker's data changed."""
+		rows = self.tracker.data.index.get_indexer(labels)
+		rows = rows[rows >= 0]
+		self.formatter.update_rows(rows)
+		if len(rows):
+			# Una sola señal para todo el lote, del primer al último renglón tocado
+			self.dataChanged.emit(
+				self.index(int(rows.min()), 0), self.index(int(rows.max()), len(self.keys) - 1)
+			)
+
+
+class ButtonDelegate(QStyledItemDelegate):
+	"""Paints a "Ver" button in the cell instead of creating a widget per row."""
+	
+	clicked: pyqtSignal = pyqtSignal(int)
+	
+	def paint(self, painter, option, index):
+		button = QStyleOptionButton()
+		button.rect = option.rect
+		button.text = index.data()
+		button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+		QApplication.style().drawControl(QStyle.ControlElement.CE_PushButton, button, painter)
+	
+	def editorEvent(self, event, model, option, index):
+		if (
+			event.type() == QEvent.Type.MouseButtonRelease and
+			event.button() == Qt.MouseButton.LeftButton and
+			option.rect.contains(event.position().toPoint())
+		):
+			self.clicked.emit(index.row())
+			return True
+		return False
\ No newline at end of file
@@ -1,5 +1,5 @@
 import PyQt6.QtWidgets as q
-from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtCore import QSize, Qt, pyqtSignal
 
 from tracker.tracker import TrackerWorker
 from widgets._base import CustomBaseWindow
@@ -7,13 +7,15 @@ from widgets._base import CustomBaseWindow
 
 class SettingsWidget(CustomBaseWindow):
 	
+	log_to_file_changed: pyqtSignal = pyqtSignal(bool)
+	
 	def __init__(self, tracker: TrackerWorker):
 		super().__init__()
 		
 		self.tracker = tracker
 		
 		self.setWindowTitle("Opciones")
-		self.setFixedSize(QSize(300, 200))
+		self.setFixedSize(QSize(300, 230))
 		
 		main_layout = q.QVBoxLayout()
 		self.setLayout(main_layout)
@@ -31,6 +33,11 @@ class SettingsWidget(CustomBaseWindow):
 		self.track_on_startup_checkbox.stateChanged.connect(self.set_track_on_startup)
 		general_layout.addWidget(self.track_on_startup_checkbox)
 		
+		self.log_to_file_checkbox = q.QCheckBox('Guardar logs en archivo')
+		self.log_to_file_checkbox.setChecked(self.tracker.log_to_file)
+		self.log_to_file_checkbox.stateChanged.connect(self.set_log_to_file)
+		general_layout.addWidget(self.log_to_file_checkbox)
+		
 		# Interval box
 		interval_box = q.QGroupBox("🕛 Intervalo")
 		main_layout.addWidget(interval_box)
@@ -64,5 +71,9 @@ class SettingsWidget(CustomBaseWindow):
 	def set_track_on_startup(self):
 		self.tracker.track_on_startup = self.track_on_startup_checkbox.isChecked()
 	
+	def set_log_to_file(self):
+		self.tracker.log_to_file = self.log_to_file_checkbox.isChecked()
+		self.log_to_file_changed.emit(self.log_to_file_checkbox.isChecked())
+	
 	def set_log_level(self, level: str, state: Qt.CheckState):
 		self.tracker.settings.set('LOGS', level, state == Qt.CheckState.Checked)
\ No newline at end of file
@@ -1,21 +1,28 @@
-import re
+from pathlib import Path
 
 from PyQt6.QtCore import QSize, Qt, pyqtSignal
 from PyQt6.QtWidgets import (
+	QApplication,
+	QFileDialog,
+	QHBoxLayout,
+	QInputDialog,
 	QLineEdit,
 	QListWidget,
 	QMessageBox,
+	QProgressDialog,
 	QPushButton,
 	QVBoxLayout,
 )
-from pandas import DataFrame, concat
 
 from tracker.tracker import TrackerWorker
+from tracker.urls import ImportPlan, is_url_valid, split_urls
 from widgets._base import CustomBaseWindow
 
 
 class URLManagerWidget(CustomBaseWindow):
 	
+	LISTING_PREFIX = 'Listado: '
+	
 	updated: pyqtSignal = pyqtSignal()
 	
 	def __init__(self, tracker: TrackerWorker):
@@ -25,35 +32,68 @@ class URLManagerWidget(CustomBaseWindow):
 		self.tracker = tracker
 		
 		self.setWindowTitle("Modificar URLs")
-		self.setFixedSize(QSize(500, 300))
+		self.setFixedSize(QSize(500, 380))
 		
 		self.layout = QVBoxLayout()
 		
 		self.listbox = QListWidget(self)
 		self.layout.addWidget(self.listbox)
 		
-		for url in self.tracker.data['url']:
-			self.listbox.addItem(url)
+		self.refresh_list()
 		
 		self.entry = QLineEdit(self)
 		self.layout.addWidget(self.entry)
 		
+		add_layout = QHBoxLayout()
+		self.layout.addLayout(add_layout)
+		
 		self.btn_add = QPushButton("Agregar URL", self)
 		self.btn_add.clicked.connect(self.add_url)
-		self.layout.addWidget(self.btn_add)
+		add_layout.addWidget(self.btn_add)
+		
+		self.btn_add_listing = QPushButton("Agregar listado", self)
+		self.btn_add_listing.clicked.connect(self.add_listing)
+		add_layout.addWidget(self.btn_add_listing)
 		
 		self.btn_remove = QPushButton("Eliminar", self)
 		self.btn_remove.clicked.connect(self.remove_url)
 		self.layout.addWidget(self.btn_remove)
 		
+		bulk_layout = QHBoxLayout()
+		self.layout.addLayout(bulk_layout)
+		
+		self.btn_paste = QPushButton("Pegar lista", self)
+		self.btn_paste.clicked.connect(self.import_pasted)
+		bulk_layout.addWidget(self.btn_paste)
+		
+		self.btn_import_file = QPushButton("Importar CSV/TXT", self)
+		self.btn_import_file.clicked.connect(self.import_file)
+		bulk_layout.addWidget(self.btn_import_file)
+		
+		excel_layout = QHBoxLayout()
+		self.layout.addLayout(excel_layout)
+		
+		self.btn_import = QPushButton("Importar Excel", self)
+		self.btn_import.clicked.connect(self.import_excel)
+		excel_layout.addWidget(self.btn_import)
+		
+		self.btn_export = QPushButton("Exportar Excel", self)
+		self.btn_export.clicked.connect(self.export_excel)
+		excel_layout.addWidget(self.btn_export)
+		
 		self.setLayout(self.layout)
 		
 		self.setWindowModality(Qt.WindowModality.ApplicationModal)
 	
+	def refresh_list(self) -> None:
+		self.listbox.clear()
+		for url in self.tracker.listings:
+			self.listbox.addItem(self.LISTING_PREFIX + url)
+		for url in self.tracker.data['url']:
+			self.listbox.addItem(url)
+	
 	def is_url_valid(self, url: str):
-		pattern = re.compile('https://([a-z]+\\.)?mercadolibre(\\.[a-z]+)+(/.+)?')
-		
-		match = pattern.match(url) is not None
+		match = is_url_valid(url)
 		
 		if url and not match:
 			self.entry.setStyleSheet('background: red;')
@@ -66,23 +106,20 @@ class URLManagerWidget(CustomBaseWindow):
 		"""Add a new URL to the DataFrame and listbox."""
 		url = self.entry.text().strip()
 		if url and self.is_url_valid(url):
-			# Add URL to DataFrame
-			new_data = {
-				"url": url,
-				"available": True,
-				"currency": None,
-				"previous_price": 0.0,
-				"current_price": 0.0,
-				"product": None,
-				"free_ship": False,
-				"with_discount": False
-			}
-			self.tracker.data = concat(
-				[self.tracker.data, DataFrame([new_data])], ignore_index=True
-			)
-			# Save updated DataFrame to CSV
-			self.tracker.save_data()
-			self.listbox.addItem(url)
+			plan = self.tracker.add_urls([url])
+			if plan.urls:
+				self.listbox.addItems(plan.urls)
+				self.updated.emit()
+			else:
+				QMessageBox.information(self, "URL repetida", "Esa publicación ya se está trackeando.")
+			self.entry.clear()
+	
+	def add_listing(self) -> None:
+		"""Track a search or listing page; its products are added as they are found."""
+		url = self.entry.text().strip()
+		if url and self.is_url_valid(url):
+			self.tracker.add_listing(url)
+			self.refresh_list()
 			self.entry.clear()
 			self.updated.emit()
 	
@@ -91,12 +128,87 @@ class URLManagerWidget(CustomBaseWindow):
 		selected_item = self.listbox.currentItem()
 		if selected_item:
 			url = selected_item.text()
+			
+			if url.startswith(self.LISTING_PREFIX):
+				self.tracker.remove_listing(url.removeprefix(self.LISTING_PREFIX))
+				self.refresh_list()
+				self.updated.emit()
+				return
+			
 			self.listbox.takeItem(self.listbox.row(selected_item))
 			
-			# Remove URL from DataFrame
-			self.tracker.data = self.tracker.data[self.tracker.data["url"] != url]
-			# Save updated DataFrame to CSV
-			self.tracker.save_data()
+			# Solo se borra esa fila, no se reescribe toda la tabla
+			self.tracker.remove_urls([url])
 			self.updated.emit()
 		else:
-			QMessageBox.warning(self, "Warning", "Please select a URL to remove.")
\ No newline at end of file
+			QMessageBox.warning(self, "Warning", "Please select a URL to remove.")
+	
+	def import_pasted(self) -> None:
+		"""Add every URL of a pasted list, one per line or separated by commas."""
+		text, ok = QInputDialog.getMultiLineText(self, "Pegar lista", "URLs:")
+		if ok and text.strip():
+			self.bulk_import(text)
+	
+	def import_file(self) -> None:
+		"""Add every URL found in a CSV or text file."""
+		path, _ = QFileDialog.getOpenFileName(
+			self, "Importar URLs", "", "Listas de URLs (*.csv *.txt);;Todos los archivos (*)"
+		)
+		if path:
+			self.bulk_import(Path(path).read_text(encoding='utf-8', errors='replace'))
+	
+	def bulk_import(self, text: str) -> None:
+		urls = split_urls(text)
+		# La barra de progreso procesa eventos: que no arranque otra importación en el medio
+		buttons = [
+			self.btn_add,
+			self.btn_add_listing,
+			self.btn_remove,
+			self.btn_paste,
+			self.btn_import_file,
+			self.btn_import
+		]
+		for button in buttons:
+			button.setEnabled(False)
+		
+		progress = QProgressDialog("Guardando productos...", None, 0, len(urls), self)
+		progress.setWindowModality(Qt.WindowModality.WindowModal)
+		# Solo aparece si la importación tarda
+		progress.setMinimumDuration(500)
+		
+		def report(done: int, total: int):
+			progress.setMaximum(total)
+			progress.setValue(done)
+			QApplication.processEvents()
+		
+		try:
+			plan = self.tracker.add_urls(urls, report)
+		finally:
+			progress.close()
+			for button in buttons:
+				button.setEnabled(True)
+		
+		self.listbox.addItems(plan.urls)
+		self.updated.emit()
+		self.show_summary(plan)
+	
+	def show_summary(self, plan: ImportPlan) -> None:
+		QMessageBox.information(
+			self,
+			"Importación terminada",
+			f"Agregadas: {len(plan.urls)}\nRepetidas: {plan.duplicates}\nInválidas: {plan.invalid}"
+		)
+	
+	def import_excel(self) -> None:
+		"""Merge the products of an Excel file into the tracked ones."""
+		path, _ = QFileDialog.getOpenFileName(self, "Importar Excel", "", "Excel (*.xlsx)")
+		if path:
+			self.tracker.import_excel(Path(path))
+			self.refresh_list()
+			self.updated.emit()
+	
+	def export_excel(self) -> None:
+		"""Write the tracked products to an Excel file."""
+		path, _ = QFileDialog.getSaveFileName(self, "Exportar Excel", "products.xlsx", "Excel (*.xlsx)")
+		if path:
+			self.tracker.export_excel(Path(path))
\ No newline at end of file